@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+
+AdminApi 及 library Api 单次请求参数构造耗时
+
+python benchmarks/bench_request_building.py
+"""
+import timeit
+
+from addict import Dict
+
+from guolei_py3_wisharetec.library.scaasp.admin.api import Api
+from guolei_py3_wisharetec.scaasp import AdminApi
+
+
+def inline_dict(admin_api: AdminApi = None, requests_request_kwargs_params: dict = {},
+                requests_request_kwargs: dict = {}):
+    """
+    接口表之前 query_business_orders 的构造方式
+    """
+    requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+    requests_request_kwargs = Dict(requests_request_kwargs)
+    requests_request_kwargs = Dict(
+        {
+            "url": f"{admin_api.base_url}/manage/businessOrderShu/list",
+            "method": "GET",
+            "headers": {
+                "Token": Dict(admin_api.token_data).token if isinstance(Dict(admin_api.token_data).token, str) else "",
+                "Companycode": Dict(admin_api.token_data).companyCode if isinstance(
+                    Dict(admin_api.token_data).companyCode, str) else "",
+                **requests_request_kwargs.headers,
+            },
+            "params": {
+                "pageSize": 20,
+                **requests_request_kwargs_params,
+                **requests_request_kwargs.params,
+            },
+            **requests_request_kwargs,
+        }
+    )
+    return Dict(requests_request_kwargs).to_dict()
+
+
+def library_inline_dict(api: Api = None, path: str = None, **kwargs):
+    """
+    缓存请求头之前 library Api.get 的构造方式
+    """
+    kwargs = Dict(kwargs)
+    kwargs.setdefault("url", f"{api.base_url}{path}")
+    kwargs.headers = Dict({
+        **{
+            "Token": api.token_data.get("token", ""),
+            "Companycode": api.token_data.get("companyCode", "")
+        }
+    })
+    return kwargs.to_dict()
+
+
+def main(number: int = 20000):
+    admin_api = AdminApi(base_url="https://sq.wisharetec.com")
+    admin_api._token_data = Dict({"token": "token", "companyCode": "companyCode"})
+    library_api = Api(base_url="https://sq.wisharetec.com")
+    library_api.token_data = {"token": "token", "companyCode": "companyCode"}
+    params = {"curPage": 3, "orderStatus": 2}
+    cases = {
+        "inline addict Dict": lambda: inline_dict(admin_api, params),
+        "endpoint table": lambda: admin_api.build_requests_request_kwargs(
+            endpoint="query_business_orders",
+            params=params,
+        ),
+        "library inline addict Dict": lambda: library_inline_dict(
+            library_api,
+            path="/manage/businessOrderShu/list",
+            params=params,
+        ),
+        "library cached headers": lambda: library_api.build_request_kwargs(
+            path="/manage/businessOrderShu/list",
+            kwargs={"params": params},
+        ),
+    }
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<32}{seconds / number * 1e6:>10.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
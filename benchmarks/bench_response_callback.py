@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+
+library ResponseCallback 单次响应校验耗时
+
+python benchmarks/bench_response_callback.py
+"""
+import json
+import timeit
+
+from jsonschema.validators import Draft202012Validator
+from requests import Response
+
+from guolei_py3_wisharetec.library.scaasp.admin.api import (
+    ResponseCallback,
+    STATUS_100_DATA_RESULTLIST_SCHEMA,
+)
+
+
+def make_response(rows: int = 20) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = json.dumps({
+        "status": 100,
+        "data": {
+            "resultList": [{"id": i, "name": f"name_{i}"} for i in range(rows)],
+            "total": rows,
+        },
+    }).encode("utf-8")
+    return response
+
+
+def per_call_validator(response: Response = None):
+    json_addict = ResponseCallback.json_addict(response=response)
+    if Draft202012Validator(STATUS_100_DATA_RESULTLIST_SCHEMA).is_valid(json_addict):
+        return json_addict.data.resultList
+    return None
+
+
+def main(number: int = 2000):
+    response = make_response()
+    cases = {
+        "per-call Draft202012Validator": lambda: per_call_validator(response),
+        "precompiled validator": lambda: ResponseCallback.json_status_100_data_resultlist(response),
+        "structural check": lambda: ResponseCallback.json_status_100_data_resultlist(response, validate_schema=False),
+    }
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<32}{seconds / number * 1e6:>10.1f} us/response")
+
+
+if __name__ == "__main__":
+    main()
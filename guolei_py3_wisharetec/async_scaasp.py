@@ -0,0 +1,1188 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import hashlib
+import inspect
+import itertools
+import pathlib
+import time
+from collections import deque
+from datetime import timedelta, datetime
+from typing import Union, Iterable, Callable
+
+import httpx
+import redis
+from addict import Dict
+from diskcache import Cache
+
+from guolei_py3_wisharetec.circuitbreaker import CircuitBreaker
+from guolei_py3_wisharetec.concurrency import AimdConcurrencyLimit
+from guolei_py3_wisharetec.download import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_MIN_RANGE_SIZE,
+    async_download,
+    async_parallel_download,
+)
+from guolei_py3_wisharetec.ratelimit import RateLimiter, request_url
+from guolei_py3_wisharetec.records import RecordFactory
+from guolei_py3_wisharetec.refresher import AsyncTokenRefresher
+from guolei_py3_wisharetec.response_cache import ResponseCache, response_cache_enabled
+from guolei_py3_wisharetec.scaasp import (
+    AdminApi,
+    RequestsResponseCallable,
+    honoured_page_size,
+    is_token_data,
+    page_result_list,
+    page_result_total,
+    page_size_divisor,
+)
+from guolei_py3_wisharetec.token_store import TokenStore
+
+
+def httpx_request_kwargs(requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> dict:
+    """
+    将 requests.request 参数转换为 httpx.AsyncClient.request 参数
+    :param requests_request_args: requests.request(*requests_request_args,**requests_request_kwargs)
+    :param requests_request_kwargs: requests.request(*requests_request_args,**requests_request_kwargs)
+    :return:
+    """
+    if isinstance(requests_request_kwargs, Dict):
+        kwargs = requests_request_kwargs.to_dict()
+    else:
+        kwargs = dict(requests_request_kwargs or {})
+    for key, value in zip(["method", "url"], requests_request_args):
+        kwargs.setdefault(key, value)
+    if "allow_redirects" in kwargs:
+        kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+    if isinstance(kwargs.get("params", None), dict):
+        kwargs["params"] = {k: v for k, v in kwargs["params"].items() if v is not None}
+    for key in ["stream", "verify", "cert", "proxies", "hooks"]:
+        kwargs.pop(key, None)
+    return {k: v for k, v in kwargs.items() if v is not None or k in ["method", "url"]}
+
+
+class AsyncAdminApi(AdminApi):
+    """
+    慧享(绿城)科技 智慧社区全域服务平台 Admin API asyncio Class
+
+    接口与 AdminApi 一致,所有接口方法均为 coroutine
+    """
+
+    # 分页请求出现以下异常时缩小 pageSize 重试
+    page_size_shrink_exceptions = (httpx.TimeoutException,)
+
+    # 以下异常视为服务端过载 自适应并发数收缩 熔断计为失败
+    overload_exceptions = (httpx.TimeoutException, httpx.NetworkError)
+
+    def __init__(
+            self,
+            base_url: str = "",
+            uid: str = "",
+            pwd: str = "",
+            diskcache: Cache = None,
+            strict_redis: redis.StrictRedis = None,
+            pool_maxsize: int = 100,
+            keep_alive_timeout: float = 60.0,
+            max_concurrency: int = 100,
+            adaptive_page_size: bool = True,
+            max_page_size: int = 1000,
+            token_trust_seconds: float = 300.0,
+            token_store: TokenStore = None,
+            auto_relogin: bool = True,
+            rate_limiter: RateLimiter = None,
+            concurrency_limit: AimdConcurrencyLimit = None,
+            circuit_breaker: CircuitBreaker = None,
+            response_cache: ResponseCache = None,
+            coalesce_requests: bool = False,
+    ):
+        """
+        慧享(绿城)科技 智慧社区全域服务平台 asyncio Class 构造函数
+        :param base_url: base url
+        :param uid: 用户名
+        :param pwd: 密码
+        :param diskcache: diskcache.core.Cache
+        :param strict_redis: redis.StrictRedis
+        :param pool_maxsize: 连接池 最大连接数
+        :param keep_alive_timeout: 空闲连接保持秒数
+        :param max_concurrency: 最大并发请求数
+        :param adaptive_page_size: 自动分页时是否探测并使用接口最大 pageSize
+        :param max_page_size: 探测起始 pageSize
+        :param token_trust_seconds: token 校验通过后多少秒内不再请求 checkSession None or <=0 每次都校验
+        :param token_store: token 存储 if None 按 diskcache or strict_redis 生成 TwoTierTokenStore
+        :param auto_relogin: token 失效时是否自动重新登录并重放幂等请求
+        :param rate_limiter: 令牌桶限流 guolei_py3_wisharetec.ratelimit.rate_limiter() None 不限流
+        :param concurrency_limit: 批量操作自适应并发数 None 使用固定 max_workers
+        :param circuit_breaker: 按接口熔断 None 不熔断
+        :param response_cache: 响应缓存 None 不缓存
+        :param coalesce_requests: 是否合并同一时刻相同的 GET 请求 合并后调用方共享同一结果对象
+        """
+        super().__init__(
+            base_url=base_url,
+            uid=uid,
+            pwd=pwd,
+            diskcache=diskcache,
+            strict_redis=strict_redis,
+            pool_maxsize=pool_maxsize,
+            keep_alive_timeout=keep_alive_timeout,
+            adaptive_page_size=adaptive_page_size,
+            max_page_size=max_page_size,
+            token_trust_seconds=token_trust_seconds,
+            token_store=token_store,
+            auto_relogin=auto_relogin,
+            rate_limiter=rate_limiter,
+            concurrency_limit=concurrency_limit,
+            circuit_breaker=circuit_breaker,
+            response_cache=response_cache,
+            coalesce_requests=coalesce_requests,
+        )
+        self._max_concurrency = max_concurrency
+        self._async_client = None
+        self._semaphore = None
+        self._revalidate_tasks = set()
+
+    @property
+    def max_concurrency(self) -> int:
+        """
+        最大并发请求数
+        :return:
+        """
+        return self._max_concurrency
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        httpx.AsyncClient 连接池 所有接口共享
+        :return:
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self._pool_maxsize,
+                    max_keepalive_connections=self._pool_maxsize,
+                    keepalive_expiry=self._keep_alive_timeout,
+                ),
+                timeout=httpx.Timeout(None),
+            )
+        return self._async_client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        并发请求信号量
+        :return:
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def aclose(self):
+        """
+        关闭连接池
+        :return:
+        """
+        await self.stop_token_refresher()
+        self._token_refresher = None
+        for task in list(self._revalidate_tasks):
+            task.cancel()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def requests_request(
+            self,
+            requests_response_callable: Callable = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            relogin: bool = True,
+    ):
+        """
+        使用 httpx.AsyncClient 执行请求
+
+        coalesce_requests 时同一时刻相同的 GET 请求只发送一次 调用方共享解析结果
+        :param requests_response_callable: requests_response_callable(response)
+        :param requests_request_args: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param relogin: token 失效时是否重新登录
+        :return: requests_response_callable(response) or response
+        """
+        if isinstance(requests_request_kwargs, Dict):
+            requests_request_kwargs = requests_request_kwargs.to_dict()
+        key = self.coalesce_key(requests_response_callable, requests_request_args, requests_request_kwargs, relogin)
+        if key is None:
+            return await self.requests_request_without_coalescing(
+                requests_response_callable, requests_request_args, requests_request_kwargs, relogin
+            )
+        return await self.single_flight.async_do(
+            key,
+            lambda: self.requests_request_without_coalescing(
+                requests_response_callable, requests_request_args, requests_request_kwargs, relogin
+            ),
+        )
+
+    async def requests_request_without_coalescing(
+            self,
+            requests_response_callable: Callable = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            relogin: bool = True,
+    ):
+        """
+        使用 httpx.AsyncClient 执行请求
+
+        auto_relogin 时 token 失效后通过缓存登录一次 并重放幂等请求
+        :param requests_response_callable: requests_response_callable(response)
+        :param requests_request_args: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param relogin: token 失效时是否重新登录
+        :return: requests_response_callable(response) or response
+        """
+        response = await self.send_request(requests_request_args, requests_request_kwargs)
+        result = requests_response_callable(response) if isinstance(requests_response_callable, Callable) else response
+        if getattr(response, "from_cache", False):
+            return result
+        self.cache_not_found(requests_request_args, requests_request_kwargs, response)
+        if not relogin or not self.auto_relogin or not self.is_authenticated_request(requests_request_kwargs):
+            if response.status_code in self.auth_failure_status_codes:
+                self.distrust_token()
+            return result
+        stale_token = requests_request_kwargs["headers"]["Token"]
+        auth_failure = self.auth_failure(response=response, result=result)
+        if auth_failure is None and stale_token != Dict(self.token_data).token:
+            # 请求期间 token 已被其他调用方更新 使用新 token 重放
+            auth_failure = True
+        if auth_failure is None and self.token_trusted:
+            # 信任期内的 token 非 100 响应为业务结果 不请求 checkSession
+            auth_failure = False
+        elif auth_failure is None:
+            # check_login 确认失效后才删除共享的校验时间戳
+            auth_failure = not await self.check_login()
+        if not auth_failure:
+            return result
+        if not await self.relogin(stale_token=stale_token):
+            return result
+        if not self.is_replayable(requests_request_args, requests_request_kwargs):
+            return result
+        response = await self.send_request(requests_request_args, self.replay_kwargs(requests_request_kwargs))
+        if isinstance(requests_response_callable, Callable):
+            return requests_response_callable(response)
+        return response
+
+    async def send_request(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}):
+        """
+        发送请求 命中响应缓存时直接返回 过期的 stale-while-revalidate 缓存同样直接返回并在后台刷新
+        :param requests_request_args: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: requests.request(*requests_request_args,**requests_request_kwargs)
+        :return: httpx.Response
+        """
+        endpoint_name, cache_key = self.response_cache_key(requests_request_args, requests_request_kwargs)
+        if cache_key is not None:
+            entry, revalidate = self.response_cache.lookup(endpoint_name, cache_key)
+            if revalidate:
+                self.revalidate_response(endpoint_name, cache_key, requests_request_args, requests_request_kwargs)
+            if entry is not None:
+                return self.response_from_cache(entry, requests_request_kwargs)
+        return await self.send_request_without_cache(
+            requests_request_args,
+            requests_request_kwargs,
+            endpoint_name=endpoint_name,
+            cache_key=cache_key,
+        )
+
+    async def send_request_without_cache(
+            self,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            endpoint_name: str = None,
+            cache_key: str = None,
+    ):
+        """
+        熔断检查及限流后发送请求 并将耗时及结果记录到 concurrency_limit 及 circuit_breaker 及响应缓存
+
+        接口熔断中时抛出 CircuitOpenError 不发送请求
+        :param requests_request_args: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: requests.request(*requests_request_args,**requests_request_kwargs)
+        :param endpoint_name: ENDPOINTS key
+        :param cache_key: self.response_cache_key()[1]
+        :return: httpx.Response
+        """
+        url = request_url(requests_request_args, requests_request_kwargs)
+        if isinstance(self.circuit_breaker, CircuitBreaker):
+            self.circuit_breaker.before_request(url)
+        await self.wait_rate_limit(requests_request_args, requests_request_kwargs)
+        async with self.semaphore:
+            started_at = time.monotonic()
+            try:
+                response = await self.async_client.request(
+                    **httpx_request_kwargs(requests_request_args, requests_request_kwargs)
+                )
+            except BaseException as error:
+                self.observe_response(response=None, latency=time.monotonic() - started_at, url=url, error=error)
+                raise
+        self.observe_response(response=response, latency=time.monotonic() - started_at, url=url)
+        self.cache_response(endpoint_name, cache_key, response)
+        return response
+
+    def revalidate_response(
+            self,
+            endpoint_name: str = None,
+            cache_key: str = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+    ):
+        """
+        在当前事件循环中使用当前 token 刷新过期的响应缓存 失败时保留旧缓存
+        :param endpoint_name: ENDPOINTS key
+        :param cache_key: self.response_cache_key()[1]
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :return:
+        """
+
+        async def _revalidate():
+            try:
+                await self.send_request_without_cache(
+                    requests_request_args,
+                    self.replay_kwargs(requests_request_kwargs),
+                    endpoint_name=endpoint_name,
+                    cache_key=cache_key,
+                )
+            except Exception:
+                pass
+            finally:
+                self.response_cache.end_revalidate(cache_key)
+
+        task = asyncio.ensure_future(_revalidate())
+        self._revalidate_tasks.add(task)
+        task.add_done_callback(self._revalidate_tasks.discard)
+
+    def response_from_cache(self, entry: tuple = None, requests_request_kwargs: dict = {}) -> httpx.Response:
+        """
+        由缓存生成 httpx.Response response.from_cache 为 True
+        :param entry: (status_code, content_type, content)
+        :param requests_request_kwargs:
+        :return:
+        """
+        status_code, content_type, content = entry
+        response = httpx.Response(
+            status_code=status_code,
+            headers={"Content-Type": content_type},
+            content=content,
+            request=httpx.Request(
+                method=requests_request_kwargs.get("method", "GET"),
+                url=requests_request_kwargs.get("url", ""),
+            ),
+        )
+        response.from_cache = True
+        return response
+
+    async def wait_rate_limit(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> float:
+        """
+        按 base_url 及接口限流 等待直到允许请求
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :return: 等待秒数
+        """
+        if not isinstance(self.rate_limiter, RateLimiter):
+            return 0.0
+        return await self.rate_limiter.async_wait(request_url(requests_request_args, requests_request_kwargs))
+
+    async def relogin(self, stale_token: str = None) -> bool:
+        """
+        token 失效后通过缓存登录 同时失效的调用方只有一个请求登录
+        :param stale_token: 失效请求使用的 token if None usage self.token_data.token
+        :return: 是否取得新 token
+        """
+        if stale_token is None:
+            stale_token = Dict(self.token_data).token
+        token = Dict(self.token_data).token
+        if isinstance(token, str) and len(token) and token != stale_token:
+            # 其他调用方已重新登录
+            return True
+        self.distrust_token()
+        await self.login_with_token_store()
+        token = Dict(self.token_data).token
+        return isinstance(token, str) and len(token) > 0 and token != stale_token
+
+    async def check_login(
+            self,
+            requests_response_callable: Callable = RequestsResponseCallable.status_code_200_text_is_str_null,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            skip_if_trusted: bool = True,
+    ) -> bool:
+        """
+        检测登录
+        :param requests_response_callable: RequestsResponseCallable.status_code_200_text_is_str_null
+        :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param skip_if_trusted: 信任期内是否直接返回 True False 时总是请求 checkSession 校验期间其他调用方仍信任 token
+        :return:
+        """
+        result = super().check_login(
+            requests_response_callable=requests_response_callable,
+            requests_request_args=requests_request_args,
+            requests_request_kwargs=requests_request_kwargs,
+            skip_if_trusted=skip_if_trusted,
+        )
+        if inspect.isawaitable(result):
+            result = await result
+            if isinstance(result, bool):
+                self.trust_token() if result else self.distrust_token()
+        return result
+
+    async def login(
+            self,
+            requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {}
+    ) -> bool:
+        """
+        登录
+        :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data
+        :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :return:
+        """
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="login",
+            data={
+                "username": self.uid,
+                "password": hashlib.md5(self.pwd.encode("utf-8")).hexdigest(),
+                "mode": "PASSWORD",
+            },
+            requests_request_kwargs=requests_request_kwargs,
+        )
+        token_data = await self.requests_request(
+            requests_response_callable=requests_response_callable,
+            requests_request_args=requests_request_args,
+            requests_request_kwargs=requests_request_kwargs,
+            relogin=False,
+        )
+        if not is_token_data(token_data):
+            # 登录失败时保留原 token 原 token 是否有效由 check_login 判断
+            return False
+        self._token_data = token_data
+        self.trust_token()
+        return True
+
+    async def refresh_token(self, force_login: bool = False) -> bool:
+        """
+        重新校验 token 失效或 force_login 时登录 结果写入 token 存储
+
+        校验期间不取消 token 信任 请求继续使用当前 token 登录失败时保留当前 token 及 token 存储
+        :param force_login: 是否直接重新登录
+        :return: 是否持有有效 token
+        """
+        token_store = self.token_store
+        self.load_token_from_store(token_store=token_store, refresh=True, keep_token=True)
+        if not force_login and await self.check_login(skip_if_trusted=False):
+            self.save_token_to_store(token_store=token_store)
+            return True
+        stale_token = Dict(self.token_data).token
+        async with token_store.lock(key=self.token_store_key):
+            # 等待期间 包括等待超时 其他调用方可能已登录 先读取 token 存储
+            self.load_token_from_store(token_store=token_store, refresh=True, keep_token=True)
+            if Dict(self.token_data).token != stale_token and (self.token_trusted or await self.check_login()):
+                self.save_token_to_store(token_store=token_store)
+                return True
+            if not await self.login():
+                return False
+            self.save_token_to_store(token_store=token_store)
+        return True
+
+    def start_token_refresher(
+            self,
+            interval: float = None,
+            renew_interval: float = None,
+            restart_after_fork: bool = False,
+    ) -> AsyncTokenRefresher:
+        """
+        在当前事件循环中启动后台 token 刷新 task
+        :param interval: 校验间隔秒数 if None usage token_trust_seconds / 2
+        :param renew_interval: 重新登录间隔秒数 None 只在 token 失效时登录
+        :param restart_after_fork: 不支持 事件循环不跨进程
+        :return:
+        """
+        if self._token_refresher is None:
+            self._token_refresher = AsyncTokenRefresher(
+                refresh=self.refresh_token,
+                interval=self.token_refresher_interval(interval),
+                renew_interval=renew_interval,
+            )
+        return self._token_refresher.start()
+
+    async def stop_token_refresher(self, timeout: float = None):
+        """
+        停止后台 token 刷新 task
+        :param timeout: 最长等待秒数
+        :return:
+        """
+        if self._token_refresher is not None:
+            await self._token_refresher.stop(timeout=timeout)
+        return self
+
+    async def login_with_token_store(self, token_store: TokenStore = None):
+        """
+        使用 token 存储登录 token 失效时在 token_store.lock 内登录
+        :param token_store: TokenStore if None usage self.token_store
+        :return:
+        """
+        if not isinstance(token_store, TokenStore):
+            token_store = self.token_store
+        self.load_token_from_store(token_store=token_store)
+        if self.token_trusted:
+            return self
+        if await self.check_login():
+            return self.save_token_to_store(token_store=token_store)
+        stale_token = Dict(self.token_data).token
+        async with token_store.lock(key=self.token_store_key):
+            # 等待期间其他调用方可能已登录
+            self.load_token_from_store(token_store=token_store, refresh=True)
+            if self.token_trusted:
+                return self
+            if Dict(self.token_data).token == stale_token or not await self.check_login():
+                await self.login()
+            return self.save_token_to_store(token_store=token_store)
+
+    async def login_with_cache(self, cache_type: str = "diskcache", cache: Union[Cache, redis.StrictRedis] = None):
+        """
+        使用缓存登录
+        :param cache_type: diskcache=login_with_diskcache(cache) strict_redis=login_with_strict_redis(cache)
+        :param cache: diskcache.core.Cache if None usage self.diskcache or redis.StrictRedis if None usage self.strict_redis
+        :return:
+        """
+        if isinstance(cache_type, str) and cache_type.lower() in [
+            "disk_cache".lower(),
+            "diskcache".lower(),
+            "disk".lower(),
+        ]:
+            return await self.login_with_diskcache(diskcache=cache)
+        if isinstance(cache_type, str) and cache_type.lower() in [
+            "strict_redis".lower(),
+            "strictredis".lower(),
+            "redis".lower(),
+        ]:
+            return await self.login_with_strict_redis(strict_redis=cache)
+        await self.login()
+        return self
+
+    async def discover_page_size(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            max_page_size: int = None,
+            min_page_size: int = 20,
+            method_kwargs: dict = {},
+    ) -> int:
+        """
+        探测接口实际支持的最大 pageSize 并缓存
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param max_page_size: 探测起始 pageSize None 使用 self.max_page_size
+        :param min_page_size: 最小 pageSize
+        :param method_kwargs: method(**method_kwargs)
+        :return:
+        """
+        page_size, _ = await self.probe_page_size(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            max_page_size=max_page_size,
+            min_page_size=min_page_size,
+            method_kwargs=method_kwargs,
+        )
+        return page_size
+
+    async def probe_page_size(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            max_page_size: int = None,
+            min_page_size: int = 20,
+            method_kwargs: dict = {},
+    ):
+        """
+        探测接口实际支持的最大 pageSize 并缓存 探测到的首页供分页复用
+
+        以 max_page_size 查询首页 超时减半重试 返回行数小于请求数且小于总数时 以返回行数为准
+        无法判断时缓存实际请求的 pageSize 避免每次分页重复探测
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param max_page_size: 探测起始 pageSize None 使用 self.max_page_size
+        :param min_page_size: 最小 pageSize
+        :param method_kwargs: method(**method_kwargs)
+        :return: (pageSize, 首页 (resultList, 总数 or None, pageSize) 已缓存 pageSize 时为 None)
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        page_size = self.get_page_size(method)
+        if page_size:
+            return page_size, None
+        page_size = max_page_size or self.max_page_size
+        while True:
+            try:
+                result = await method(
+                    requests_request_kwargs_params={**Dict(requests_request_kwargs_params), "pageSize": page_size,
+                                                    "curPage": 1},
+                    **method_kwargs
+                )
+                break
+            except self.page_size_shrink_exceptions:
+                if page_size // 2 < min_page_size:
+                    raise
+                page_size //= 2
+        page_size = honoured_page_size(page_size=page_size, result=result) or page_size
+        return self.put_page_size(method, page_size), (page_result_list(result), page_result_total(result), page_size)
+
+    async def resolve_page_size(
+            self,
+            method: Callable = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            method_kwargs: dict = {},
+    ) -> int:
+        """
+        确定分页 pageSize
+
+        requests_request_kwargs_params.pageSize > page_size > 已发现的最大 pageSize > 20
+        :param method: 分页查询方法
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量
+        :param method_kwargs: method(**method_kwargs)
+        :return:
+        """
+        page_size, _ = await self.resolve_first_page(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            method_kwargs=method_kwargs,
+        )
+        return page_size
+
+    async def resolve_first_page(
+            self,
+            method: Callable = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            cur_page: int = 1,
+            method_kwargs: dict = {},
+    ):
+        """
+        确定分页 pageSize 起始页为首页时复用探测 pageSize 时查询到的首页
+        :param method: 分页查询方法
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量
+        :param cur_page: 起始页码
+        :param method_kwargs: method(**method_kwargs)
+        :return: (pageSize, 首页 (resultList, 总数 or None, pageSize) or None)
+        """
+        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+        if str(requests_request_kwargs_params.pageSize).isdigit() and int(requests_request_kwargs_params.pageSize):
+            return int(requests_request_kwargs_params.pageSize), None
+        if isinstance(page_size, int) and page_size > 0:
+            return page_size, None
+        if not self.adaptive_page_size:
+            return 20, None
+        page_size, first_page = await self.probe_page_size(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            method_kwargs=method_kwargs,
+        )
+        return page_size, first_page if cur_page == 1 else None
+
+    async def fetch_page(
+            self,
+            method: Callable = None,
+            requests_request_kwargs_params: dict = {},
+            cur_page: int = 1,
+            page_size: int = 20,
+            method_kwargs: dict = {},
+    ):
+        """
+        查询单页 超时时按更小 pageSize 拆分查询同一区间 并记录更小的 pageSize
+        :param method: 分页查询方法
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param cur_page: 页码
+        :param page_size: 每页数量
+        :param method_kwargs: method(**method_kwargs)
+        :return: (resultList, 总数 or None, 后续使用的 pageSize)
+        """
+        try:
+            result = await method(
+                requests_request_kwargs_params={**requests_request_kwargs_params, "pageSize": page_size,
+                                                "curPage": cur_page},
+                **method_kwargs
+            )
+            return page_result_list(result), page_result_total(result), page_size
+        except self.page_size_shrink_exceptions:
+            smaller = page_size_divisor(page_size)
+            if smaller >= page_size:
+                raise
+            if self.adaptive_page_size:
+                self.put_page_size(method, smaller)
+        rows, total, size = [], None, smaller
+        offset, end = (cur_page - 1) * page_size, cur_page * page_size
+        while offset < end:
+            span = size
+            sub_rows, sub_total, size = await self.fetch_page(
+                method=method,
+                requests_request_kwargs_params=requests_request_kwargs_params,
+                cur_page=offset // span + 1,
+                page_size=span,
+                method_kwargs=method_kwargs,
+            )
+            rows.extend(sub_rows)
+            total = sub_total if sub_total is not None else total
+            if not len(sub_rows):
+                break
+            offset += span
+        return rows, total, size
+
+    async def paginate(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            cur_page: int = 1,
+            prefetch: bool = False,
+            as_records: bool = False,
+            method_kwargs: dict = {},
+    ):
+        """
+        自动分页 逐行返回 resultList 直到返回空 resultList
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量 None 使用 resolve_page_size
+        :param cur_page: 起始页码
+        :param prefetch: 是否在后台预取下一页
+        :param as_records: True 时以 plain dict 解析并逐行转换为 __slots__ Record
+        :param method_kwargs: method(**method_kwargs)
+        :return: async generator
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        if as_records:
+            to_record = RecordFactory(name=method.__name__)
+            async for row in self.paginate(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    page_size=page_size,
+                    cur_page=cur_page,
+                    prefetch=prefetch,
+                    method_kwargs={
+                        "requests_response_callable": RequestsResponseCallable.status_code_200_json_status_100_data,
+                        **method_kwargs,
+                    },
+            ):
+                yield to_record(row)
+            return
+        page_size, first_page = await self.resolve_first_page(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            cur_page=cur_page,
+            method_kwargs=method_kwargs,
+        )
+        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+        requests_request_kwargs_params.pop("pageSize", None)
+
+        def _fetch(page: int = 1, size: int = 20):
+            return self.fetch_page(
+                method=method,
+                requests_request_kwargs_params=requests_request_kwargs_params,
+                cur_page=page,
+                page_size=size,
+                method_kwargs=method_kwargs,
+            )
+
+        if not prefetch:
+            while True:
+                rows, _, size = first_page or await _fetch(cur_page, page_size)
+                first_page = None
+                if not len(rows):
+                    return
+                for row in rows:
+                    yield row
+                cur_page, page_size = cur_page * page_size // size + 1, size
+        task = asyncio.get_running_loop().create_future()
+        if first_page:
+            task.set_result(first_page)
+        else:
+            task = asyncio.ensure_future(_fetch(cur_page, page_size))
+        try:
+            while True:
+                rows, _, size = await task
+                if not len(rows):
+                    return
+                cur_page, page_size = cur_page * page_size // size + 1, size
+                task = asyncio.ensure_future(_fetch(cur_page, page_size))
+                for row in rows:
+                    yield row
+        finally:
+            task.cancel()
+
+    async def paginate_parallel(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            cur_page: int = 1,
+            max_workers: int = 4,
+            ordered: bool = True,
+            as_records: bool = False,
+            method_kwargs: dict = {},
+    ):
+        """
+        并发分页 首页返回总数后 其余页并发查询 逐行返回 resultList
+
+        首页没有总数时退化为 paginate
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量 None 使用 resolve_page_size
+        :param cur_page: 起始页码
+        :param max_workers: 最大并发数 设置 concurrency_limit 时由 concurrency_limit 自适应调整
+        :param ordered: True 按页码顺序返回 False 按完成顺序返回
+        :param as_records: True 时以 plain dict 解析并逐行转换为 __slots__ Record
+        :param method_kwargs: method(**method_kwargs)
+        :return: async generator
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        if as_records:
+            to_record = RecordFactory(name=method.__name__)
+            async for row in self.paginate_parallel(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    page_size=page_size,
+                    cur_page=cur_page,
+                    max_workers=max_workers,
+                    ordered=ordered,
+                    method_kwargs={
+                        "requests_response_callable": RequestsResponseCallable.status_code_200_json_status_100_data,
+                        **method_kwargs,
+                    },
+            ):
+                yield to_record(row)
+            return
+        page_size, first_page = await self.resolve_first_page(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            cur_page=cur_page,
+            method_kwargs=method_kwargs,
+        )
+        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+        requests_request_kwargs_params.pop("pageSize", None)
+
+        async def _fetch(page: int = 1, size: int = 20):
+            async with self.concurrency_slot():
+                return await self.fetch_page(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    cur_page=page,
+                    page_size=size,
+                    method_kwargs=method_kwargs,
+                )
+
+        rows, total, size = first_page or await _fetch(cur_page, page_size)
+        for row in rows:
+            yield row
+        if not len(rows):
+            return
+        next_page = cur_page * page_size // size + 1
+        if total is None:
+            async for row in self.paginate(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    page_size=size,
+                    cur_page=next_page,
+                    method_kwargs=method_kwargs,
+            ):
+                yield row
+            return
+        if size == page_size and len(rows) < min(page_size, total - (cur_page - 1) * page_size):
+            # 行数少于该页应有行数 服务端限制了 pageSize 以实际行数为准 最后一页行数不足不视为限制
+            size, next_page = len(rows), cur_page + 1
+            if self.adaptive_page_size:
+                self.put_page_size(method, size)
+        pages = iter(range(next_page, -(-total // size) + 1))
+        tasks = deque()
+        try:
+            for page in itertools.islice(pages, self.bulk_workers(max_workers)):
+                tasks.append(asyncio.ensure_future(_fetch(page, size)))
+            while len(tasks):
+                if ordered:
+                    task = tasks.popleft()
+                    await task
+                else:
+                    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    task = done.pop()
+                    tasks.remove(task)
+                for page in itertools.islice(pages, 1):
+                    tasks.append(asyncio.ensure_future(_fetch(page, size)))
+                for row in task.result()[0]:
+                    yield row
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def bulk_call(
+            self,
+            method: Union[Callable, str] = None,
+            method_kwargs_list: Iterable = (),
+            max_workers: int = 4,
+            return_exceptions: bool = False,
+    ) -> list:
+        """
+        批量调用接口方法 用于批量查询及批量更新
+
+        设置 concurrency_limit 时并发数按延迟及过载响应自适应调整
+        :param method: 接口方法 self.update_store_goods or "update_store_goods"
+        :param method_kwargs_list: [method(**method_kwargs)]
+        :param max_workers: 最大并发数 设置 concurrency_limit 时由 concurrency_limit 自适应调整
+        :param return_exceptions: True 时异常作为结果返回 False 时抛出第一个异常
+        :return: 与 method_kwargs_list 顺序一致的结果列表
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+
+        async def _call(method_kwargs: dict = {}):
+            async with self.concurrency_slot():
+                return await method(**method_kwargs)
+
+        method_kwargs_list = iter(method_kwargs_list)
+        results = []
+        tasks = deque()
+        try:
+            for method_kwargs in itertools.islice(method_kwargs_list, self.bulk_workers(max_workers)):
+                tasks.append(asyncio.ensure_future(_call(method_kwargs)))
+            while len(tasks):
+                task = tasks.popleft()
+                try:
+                    results.append(await task)
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    results.append(error)
+                for method_kwargs in itertools.islice(method_kwargs_list, 1):
+                    tasks.append(asyncio.ensure_future(_call(method_kwargs)))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+
+    async def bulk_query(
+            self,
+            method: Union[Callable, str] = None,
+            ids: Iterable = (),
+            max_workers: int = 4,
+            cache: bool = True,
+            method_kwargs: dict = {},
+    ) -> list:
+        """
+        按 id 批量查询详情 如 await self.bulk_query("query_house", ids)
+
+        每个 id 的结果及异常单独返回 某个 id 失败不影响其他 id
+        :param method: 详情接口方法 self.query_house or "query_house"
+        :param ids: id 列表
+        :param max_workers: 最大并发数 设置 concurrency_limit 时由 concurrency_limit 自适应调整
+        :param cache: 是否读写响应缓存 False 时每个 id 都请求接口且结果不写入缓存
+        :param method_kwargs: method(id=id,**method_kwargs) 的其他参数
+        :return: 与 ids 顺序一致的 [Dict(id=,data=,error=)] 请求异常时 error 为异常
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+
+        async def _query(**kwargs):
+            # 每个任务有独立的 context 不影响其他任务
+            response_cache_enabled.set(cache)
+            return await method(**kwargs)
+
+        ids = list(ids)
+        results = await self.bulk_call(
+            method=_query,
+            method_kwargs_list=({**method_kwargs, "id": id} for id in ids),
+            max_workers=max_workers,
+            return_exceptions=True,
+        )
+        return [
+            Dict({"id": id, "data": None, "error": result}) if isinstance(result, Exception) else Dict(
+                {"id": id, "data": result, "error": None})
+            for id, result in zip(ids, results)
+        ]
+
+    async def retry_export(
+            self,
+            export_name: str = "",
+            requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            retry_args: Iterable = (),
+            retry_kwargs: dict = {},
+    ):
+        """
+        重试执行数据导出 直到返回导出id
+        :param export_name: 导出方法名称
+        :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data
+        :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param retry_args: 不使用 保持与 AdminApi 一致
+        :param retry_kwargs: 支持 stop_max_attempt_number wait_fixed(毫秒)
+        :return:
+        """
+        retry_kwargs = Dict(
+            {
+                "stop_max_attempt_number": timedelta(minutes=6).seconds,
+                "wait_fixed": timedelta(seconds=10).seconds * 1000,
+                **retry_kwargs,
+            }
+        )
+        for attempt in range(1, retry_kwargs.stop_max_attempt_number + 1):
+            result = await self.requests_request(
+                requests_response_callable=requests_response_callable,
+                requests_request_args=requests_request_args,
+                requests_request_kwargs=requests_request_kwargs
+            )
+            if isinstance(result, int):
+                return result
+            if attempt < retry_kwargs.stop_max_attempt_number:
+                await asyncio.sleep(retry_kwargs.wait_fixed / 1000)
+        raise Exception(
+            f"{datetime.now()} exec {export_name}({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
+
+    async def download_file(
+            self,
+            url: str = "",
+            fp: str = "",
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress_callback: Callable = None,
+            progress_interval: float = 1.0,
+            resume: bool = True,
+            retries: int = 3,
+            expected_sha256: str = None,
+            connections: int = 1,
+            min_range_size: int = DOWNLOAD_MIN_RANGE_SIZE,
+    ) -> Dict:
+        """
+        使用 async_client 流式下载文件 先写入 f"{fp}.part" 完成后原子重命名为 fp
+        :param url: 下载地址
+        :param fp: 文件路径
+        :param chunk_size: 每次读取字节数
+        :param progress_callback: progress_callback(progress) 参考 DownloadWriter
+        :param progress_interval: 进度回调间隔秒数
+        :param resume: 是否从已有的 f"{fp}.part" 断点续传 服务端不支持 Range 时从头下载
+        :param retries: 传输中断后的续传次数
+        :param expected_sha256: 期望的 sha256 None 不校验
+        :param connections: 大于 1 时按 Range 多连接分段下载 不支持 Range 时单连接下载 应不大于async_client 连接池
+        :param min_range_size: 多连接下载时每段最小字节数
+        :return: Dict(fp,bytes,total,offset,elapsed,bytes_per_second,done,sha256)
+        """
+        async with self.semaphore:
+            if connections > 1:
+                return await async_parallel_download(
+                    async_client=self.async_client,
+                    url=url,
+                    fp=fp,
+                    connections=connections,
+                    min_range_size=min_range_size,
+                    chunk_size=chunk_size,
+                    progress_callback=progress_callback,
+                    progress_interval=progress_interval,
+                    resume=resume,
+                    retries=retries,
+                    expected_sha256=expected_sha256,
+                )
+            return await async_download(
+                async_client=self.async_client,
+                url=url,
+                fp=fp,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                progress_interval=progress_interval,
+                resume=resume,
+                retries=retries,
+                expected_sha256=expected_sha256,
+            )
+
+    async def download_export(
+            self,
+            export_id: int = 0,
+            export_fp: str = "",
+            requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data_result_list,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            retry_args: Iterable = (),
+            retry_kwargs: dict = {},
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress_callback: Callable = None,
+            resume: bool = True,
+            connections: int = 1,
+    ):
+        """
+        下载数据导出文件 流式写入临时文件 完成后重命名为 export_fp 中断后重试时断点续传
+        :param export_id:
+        :param export_fp:
+        :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data_result_list
+        :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param retry_args: 不使用 保持与 AdminApi 一致
+        :param retry_kwargs: 支持 stop_max_attempt_number wait_fixed(毫秒)
+        :param chunk_size: 每次读取字节数
+        :param progress_callback: progress_callback(progress) 完成时 progress.sha256 为文件 sha256
+        :param resume: 下载中断后是否从已下载的部分续传
+        :param connections: 大于 1 时按 Range 多连接分段下载 不支持 Range 时单连接下载
+        :return:
+        """
+        requests_request_kwargs = Dict(requests_request_kwargs)
+        retry_kwargs = Dict(
+            {
+                "stop_max_attempt_number": timedelta(minutes=60).seconds,
+                "wait_fixed": timedelta(seconds=10).seconds * 1000,
+                **retry_kwargs,
+            }
+        )
+        export = Dict({})
+        for attempt in range(1, retry_kwargs.stop_max_attempt_number + 1):
+            await self.login_with_cache()
+            exports = await self.query_exports(
+                requests_response_callable=requests_response_callable,
+                requests_request_args=requests_request_args,
+                requests_request_kwargs=requests_request_kwargs
+            )
+            if isinstance(exports, list):
+                for i in exports:
+                    if isinstance(i.id, int) and i.id == export_id:
+                        if isinstance(i.status, int) and i.status == 2:
+                            export = i
+                            break
+                if isinstance(export.filePath, str) and len(export.filePath):
+                    if "".join(pathlib.Path(export.filePath).suffixes).lower() not in "".join(
+                            pathlib.Path(export_fp).suffixes).lower():
+                        export_fp = f"{export_fp}{''.join(pathlib.Path(export.filePath).suffixes)}"
+                    await self.download_file(
+                        url=export.filePath,
+                        fp=export_fp,
+                        chunk_size=chunk_size,
+                        progress_callback=progress_callback,
+                        resume=resume,
+                        connections=connections,
+                    )
+                    return export_fp
+            if attempt < retry_kwargs.stop_max_attempt_number:
+                await asyncio.sleep(retry_kwargs.wait_fixed / 1000)
+        raise Exception(
+            f"{datetime.now()} retry exec download_export({export_id},{export_fp},{requests_response_callable},{requests_request_args},{requests_request_kwargs}) {export}")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import threading
+import time
+
+from guolei_py3_wisharetec.ratelimit import rate_limit_keys
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    接口熔断中 请求未发送
+    """
+
+    def __init__(self, endpoint: str = "", retry_after: float = 0.0):
+        """
+        构造函数
+        :param endpoint: base_url + path
+        :param retry_after: 多少秒后进入半开状态
+        """
+        super().__init__(f"circuit open for {endpoint} retry after {retry_after:.2f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker(object):
+    """
+    按接口熔断 每个 base_url + path 独立计数
+
+    连续失败 failure_threshold 次后打开 打开期间直接抛出 CircuitOpenError recovery_timeout 秒后半开
+
+    半开状态只放行 half_open_max_calls 个探测请求 探测成功后关闭 失败后重新打开
+    """
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+            half_open_max_calls: int = 1,
+    ):
+        """
+        构造函数
+        :param failure_threshold: 连续失败多少次后打开
+        :param recovery_timeout: 打开多少秒后半开
+        :param half_open_max_calls: 半开状态同时放行的探测请求数
+        """
+        self._failure_threshold = max(1, failure_threshold)
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = max(1, half_open_max_calls)
+        self._lock = threading.Lock()
+        # {endpoint: {"state":, "failures":, "opened_at":, "probes":}}
+        self._circuits = {}
+
+    @property
+    def failure_threshold(self) -> int:
+        return self._failure_threshold
+
+    @property
+    def recovery_timeout(self) -> float:
+        return self._recovery_timeout
+
+    def _circuit(self, endpoint: str = "") -> dict:
+        circuit = self._circuits.get(endpoint, None)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = {"state": CLOSED, "failures": 0, "opened_at": None, "probes": 0}
+        if circuit["state"] == OPEN and time.monotonic() - circuit["opened_at"] >= self._recovery_timeout:
+            circuit["state"], circuit["probes"] = HALF_OPEN, 0
+        return circuit
+
+    def state(self, url: str = "") -> str:
+        """
+        接口熔断状态
+        :param url: 请求 url
+        :return: closed or open or half_open
+        """
+        _, endpoint, _ = rate_limit_keys(url)
+        with self._lock:
+            return self._circuit(endpoint)["state"]
+
+    def states(self) -> dict:
+        """
+        所有接口熔断状态
+        :return: {endpoint: {"state":, "failures":}}
+        """
+        with self._lock:
+            return {
+                endpoint: {"state": self._circuit(endpoint)["state"], "failures": circuit["failures"]}
+                for endpoint, circuit in list(self._circuits.items())
+            }
+
+    def before_request(self, url: str = ""):
+        """
+        请求前检查 熔断中抛出 CircuitOpenError
+        :param url: 请求 url
+        :return:
+        """
+        _, endpoint, _ = rate_limit_keys(url)
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit["state"] == CLOSED:
+                return
+            if circuit["state"] == HALF_OPEN and circuit["probes"] < self._half_open_max_calls:
+                circuit["probes"] += 1
+                return
+            retry_after = 0.0
+            if circuit["state"] == OPEN:
+                retry_after = self._recovery_timeout - (time.monotonic() - circuit["opened_at"])
+        raise CircuitOpenError(endpoint=endpoint, retry_after=max(0.0, retry_after))
+
+    def on_result(self, url: str = "", failed: bool = False):
+        """
+        记录请求结果
+        :param url: 请求 url
+        :param failed: 是否失败 None 无法判断 只释放半开探测名额
+        :return:
+        """
+        _, endpoint, _ = rate_limit_keys(url)
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if failed is None:
+                circuit["probes"] = max(0, circuit["probes"] - 1)
+                return
+            if not failed:
+                circuit["state"], circuit["failures"], circuit["probes"] = CLOSED, 0, 0
+                return
+            circuit["failures"] += 1
+            if circuit["state"] == OPEN:
+                return
+            if circuit["state"] == HALF_OPEN or circuit["failures"] >= self._failure_threshold:
+                circuit["state"], circuit["opened_at"], circuit["probes"] = OPEN, time.monotonic(), 0
+
+    def reset(self, url: str = None):
+        """
+        关闭熔断
+        :param url: 请求 url None 关闭所有接口
+        :return:
+        """
+        with self._lock:
+            if url is None:
+                self._circuits.clear()
+                return
+            _, endpoint, _ = rate_limit_keys(url)
+            self._circuits.pop(endpoint, None)
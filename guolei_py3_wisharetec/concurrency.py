@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import contextvars
+import threading
+import time
+
+# 当前线程或协程持有并发槽的 AimdConcurrencyLimit
+_held_concurrency_limit = contextvars.ContextVar("held_concurrency_limit", default=None)
+
+
+class ConcurrencySlot(object):
+    """
+    并发槽 支持 with 与 async with
+
+    concurrency_limit 为 None 时不限制
+    """
+
+    def __init__(self, concurrency_limit=None, timeout: float = None, interval: float = 0.01):
+        """
+        构造函数
+        :param concurrency_limit: AimdConcurrencyLimit
+        :param timeout: 最长等待秒数 None 一直等待
+        :param interval: async with 重试间隔秒数
+        """
+        self._concurrency_limit = concurrency_limit
+        self._timeout = timeout
+        self._interval = interval
+        self._held_token = None
+        self.acquired = False
+
+    def __enter__(self):
+        if self._concurrency_limit is None:
+            return self
+        self.acquired = self._concurrency_limit.acquire(timeout=self._timeout)
+        if self.acquired:
+            self._held_token = _held_concurrency_limit.set(self._concurrency_limit)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.acquired and self._concurrency_limit is not None:
+            _held_concurrency_limit.reset(self._held_token)
+            self._held_token = None
+            self._concurrency_limit.release()
+            self.acquired = False
+
+    async def __aenter__(self):
+        if self._concurrency_limit is None:
+            return self
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+        while not self._concurrency_limit.try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                return self
+            await asyncio.sleep(self._interval)
+        self.acquired = True
+        self._held_token = _held_concurrency_limit.set(self._concurrency_limit)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+
+class AimdConcurrencyLimit(object):
+    """
+    AIMD 自适应并发数
+
+    延迟正常的成功响应每累计 limit 个 并发数加 increase 超时 5xx 429 或延迟超过 latency_tolerance 倍基线时 并发数乘 backoff
+
+    延迟为 smoothing 指数平均 基线为 baseline_smoothing 指数平均 基线跟随服务端整体变化 只对短时间内的延迟上升做出反应
+
+    同一往返时间内只收缩一次 避免同一批并发失败把并发数压到 min_limit
+    """
+
+    def __init__(
+            self,
+            initial_limit: float = 4,
+            min_limit: float = 1,
+            max_limit: float = 32,
+            increase: float = 1.0,
+            backoff: float = 0.5,
+            latency_tolerance: float = 2.0,
+            smoothing: float = 0.2,
+            baseline_smoothing: float = 0.01,
+    ):
+        """
+        构造函数
+        :param initial_limit: 初始并发数
+        :param min_limit: 最小并发数
+        :param max_limit: 最大并发数
+        :param increase: 每个往返时间增加的并发数
+        :param backoff: 收缩系数 0 < backoff < 1
+        :param latency_tolerance: 延迟超过基线多少倍视为拥塞 None or <=0 不按延迟收缩
+        :param smoothing: 延迟指数平均系数
+        :param baseline_smoothing: 基线延迟指数平均系数
+        """
+        self._min_limit = max(1, min_limit)
+        self._max_limit = max(self._min_limit, max_limit)
+        self._limit = float(min(self._max_limit, max(self._min_limit, initial_limit)))
+        self._increase = increase
+        self._backoff = backoff
+        self._latency_tolerance = latency_tolerance
+        self._smoothing = smoothing
+        self._baseline_smoothing = baseline_smoothing
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._latency = None
+        self._baseline_latency = None
+        self._last_decreased_at = 0.0
+        self._successes = 0
+        self._errors = 0
+        self._overloads = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """
+        当前并发数
+        :return:
+        """
+        return int(self._limit)
+
+    @property
+    def min_limit(self) -> int:
+        return int(self._min_limit)
+
+    @property
+    def max_limit(self) -> int:
+        return int(self._max_limit)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        当前执行中的数量
+        :return:
+        """
+        return self._in_flight
+
+    @property
+    def latency(self) -> float:
+        """
+        延迟指数平均秒数
+        :return:
+        """
+        return self._latency
+
+    @property
+    def baseline_latency(self) -> float:
+        """
+        基线延迟秒数
+        :return:
+        """
+        return self._baseline_latency
+
+    def stats(self) -> dict:
+        """
+        当前状态
+        :return:
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "latency": self._latency,
+                "baseline_latency": self._baseline_latency,
+                "successes": self._successes,
+                "errors": self._errors,
+                "overloads": self._overloads,
+                "decreases": self._decreases,
+            }
+
+    def try_acquire(self) -> bool:
+        """
+        非阻塞获取并发槽
+        :return:
+        """
+        with self._condition:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        获取并发槽
+        :param timeout: 最长等待秒数 None 一直等待
+        :return:
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < self.limit, timeout=timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self):
+        """
+        释放并发槽
+        :return:
+        """
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify()
+
+    def holds_slot(self) -> bool:
+        """
+        当前线程或协程是否持有本实例的并发槽 只有并发槽内的请求结果应计入 on_response
+        :return:
+        """
+        return _held_concurrency_limit.get() is self
+
+    def slot(self, timeout: float = None) -> ConcurrencySlot:
+        """
+        并发槽 with self.slot(): or async with self.slot():
+        :param timeout: 最长等待秒数 None 一直等待
+        :return:
+        """
+        return ConcurrencySlot(concurrency_limit=self, timeout=timeout)
+
+    def _decrease(self, now: float = 0.0):
+        if now - self._last_decreased_at < (self._latency or 0.0):
+            return
+        self._limit = max(self._min_limit, self._limit * self._backoff)
+        self._last_decreased_at = now
+        self._decreases += 1
+
+    def on_response(self, latency: float = None, overloaded: bool = False, failed: bool = False):
+        """
+        记录一次请求结果并调整并发数
+        :param latency: 请求耗时秒数
+        :param overloaded: 超时 5xx 429 等服务端过载
+        :param failed: 其他失败 不增加并发数
+        :return:
+        """
+        with self._condition:
+            now = time.monotonic()
+            if overloaded:
+                self._overloads += 1
+                self._decrease(now)
+                return
+            if isinstance(latency, (int, float)):
+                if self._latency is None:
+                    self._latency = self._baseline_latency = latency
+                self._latency += (latency - self._latency) * self._smoothing
+                self._baseline_latency += (latency - self._baseline_latency) * self._baseline_smoothing
+            if failed:
+                self._errors += 1
+                return
+            self._successes += 1
+            if isinstance(self._latency_tolerance, (int, float)) and self._latency_tolerance > 0 and (
+                    self._baseline_latency and self._latency > self._baseline_latency * self._latency_tolerance
+            ):
+                self._decrease(now)
+                return
+            self._limit = min(self._max_limit, self._limit + self._increase / self._limit)
+            self._condition.notify_all()
@@ -0,0 +1,869 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable
+
+import requests
+from addict import Dict
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 默认每次读取及写入 1MB
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# 多连接下载时每个分段的最小字节数 小于 2 个分段的文件使用单连接下载
+DOWNLOAD_MIN_RANGE_SIZE = 8 * DOWNLOAD_CHUNK_SIZE
+
+# 断点续传时重试的异常
+DOWNLOAD_RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# bytes start-end/total or bytes */total
+CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(?:(\d+)-(\d+)|\*)/(\d+|\*)")
+
+
+class IncompleteDownloadError(IOError):
+    """
+    下载的字节数小于 Content-Length 临时文件保留 可续传
+    """
+
+
+class RangeNotSatisfiedError(IOError):
+    """
+    分段请求的响应不是从请求的 offset 开始的 206 服务端忽略了 Range 或文件已变化
+    """
+
+
+class DownloadWriter(object):
+    """
+    流式写入 先写入 f"{fp}.part" 完成后原子重命名为 fp 写入时计算 sha256
+
+    失败时删除临时文件 fp 不会出现写了一半的文件 keep_part 时保留临时文件用于断点续传
+
+    offset > 0 时从临时文件的 offset 处续写 已有部分重新计算 sha256
+
+    keep_part 且有 validator 时写入 f"{fp}.part.meta" 记录 url 及 ETag 或 Last-Modified 续传时作为 If-Range
+
+    progress_callback(progress) 每 progress_interval 秒及完成时调用一次 progress 为 Dict:
+
+    fp bytes total offset elapsed bytes_per_second done sha256(完成时)
+
+    bytes 包含已有部分 bytes_per_second 只按本次写入计算
+    """
+
+    def __init__(
+            self,
+            fp: str = "",
+            total: int = None,
+            progress_callback: Callable = None,
+            progress_interval: float = 1.0,
+            offset: int = 0,
+            keep_part: bool = False,
+            expected_sha256: str = None,
+            url: str = None,
+            validator: str = None,
+    ):
+        """
+        构造函数
+        :param fp: 文件路径
+        :param total: 文件总字节数 None 未知
+        :param progress_callback: progress_callback(progress)
+        :param progress_interval: 进度回调间隔秒数
+        :param offset: 临时文件中已下载的字节数
+        :param keep_part: 失败时是否保留临时文件
+        :param expected_sha256: 期望的 sha256 不一致时删除临时文件并抛出 IOError
+        :param url: 下载地址 写入 f"{fp}.part.meta"
+        :param validator: 响应的 ETag 或 Last-Modified 写入 f"{fp}.part.meta"
+        """
+        self._fp = str(fp)
+        self._part_fp = f"{self._fp}.part"
+        self._total = total
+        self._progress_callback = progress_callback
+        self._progress_interval = progress_interval
+        self._offset = offset
+        self._keep_part = keep_part
+        self._expected_sha256 = expected_sha256
+        self._url = url
+        self._validator = validator
+        self._sha256 = hashlib.sha256()
+        self._bytes = 0
+        self._file = None
+        self._started_at = None
+        self._progress_at = None
+
+    @property
+    def fp(self) -> str:
+        return self._fp
+
+    @property
+    def part_fp(self) -> str:
+        """
+        临时文件路径
+        :return:
+        """
+        return self._part_fp
+
+    @property
+    def bytes(self) -> int:
+        """
+        已写入字节数
+        :return:
+        """
+        return self._bytes
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self._fp))
+        os.makedirs(directory, exist_ok=True)
+        if self._offset > 0:
+            self._file = open(self._part_fp, "r+b")
+            while self._bytes < self._offset:
+                chunk = self._file.read(min(DOWNLOAD_CHUNK_SIZE, self._offset - self._bytes))
+                if not chunk:
+                    break
+                self._sha256.update(chunk)
+                self._bytes += len(chunk)
+            self._offset = self._bytes
+            self._file.truncate(self._offset)
+            self._file.seek(self._offset)
+        else:
+            self._file = open(self._part_fp, "wb")
+        if self._keep_part and self._validator:
+            write_part_meta(self._fp, url=self._url, validator=self._validator)
+        else:
+            # 没有 validator 的临时文件不能确认与服务端文件一致 不续传
+            remove_part_meta(self._fp)
+        self._started_at = self._progress_at = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if exc_type is not None and not self._keep_part:
+            self.remove_part()
+
+    def remove_part(self):
+        """
+        删除临时文件
+        :return:
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        remove_part(self._fp)
+
+    def write(self, chunk: bytes = b""):
+        """
+        写入一块数据
+        :param chunk:
+        :return:
+        """
+        if not chunk:
+            return
+        self._file.write(chunk)
+        self._sha256.update(chunk)
+        self._bytes += len(chunk)
+        now = time.monotonic()
+        if now - self._progress_at >= self._progress_interval:
+            self._progress_at = now
+            self.progress()
+
+    def progress(self, done: bool = False) -> Dict:
+        """
+        当前进度 并调用 progress_callback
+        :param done: 是否完成
+        :return:
+        """
+        elapsed = time.monotonic() - self._started_at
+        progress = Dict({
+            "fp": self._fp,
+            "bytes": self._bytes,
+            "total": self._total,
+            "offset": self._offset,
+            "elapsed": elapsed,
+            "bytes_per_second": (self._bytes - self._offset) / elapsed if elapsed > 0 else 0.0,
+            "done": done,
+        })
+        if done:
+            progress.sha256 = self._sha256.hexdigest()
+        if isinstance(self._progress_callback, Callable):
+            self._progress_callback(progress)
+        return progress
+
+    def commit(self) -> Dict:
+        """
+        校验大小及 sha256 后写入磁盘 原子重命名为 fp
+
+        大小不足时抛出 IOError 保留临时文件 大小超出或 sha256 不一致时删除临时文件
+        :return: progress(done=True)
+        """
+        if isinstance(self._total, int) and self._bytes < self._total:
+            raise IncompleteDownloadError(f"download {self._fp} incomplete {self._bytes}/{self._total} bytes")
+        if isinstance(self._total, int) and self._bytes > self._total:
+            self.remove_part()
+            raise IOError(f"download {self._fp} oversize {self._bytes}/{self._total} bytes")
+        if self._expected_sha256 and self._sha256.hexdigest() != self._expected_sha256.lower():
+            self.remove_part()
+            raise IOError(f"download {self._fp} sha256 mismatch")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self._part_fp, self._fp)
+        remove_part_meta(self._fp)
+        return self.progress(done=True)
+
+
+class RangeDownloadWriter(object):
+    """
+    多连接分段写入 预分配 f"{fp}.ranges" 每个分段直接写入各自的 offset 不需要合并
+
+    失败时删除临时文件 分段文件中有空洞 不能按大小断点续传 所以不与 f"{fp}.part" 共用
+
+    sha256 在所有分段完成后顺序读取一次计算 progress 参考 DownloadWriter
+    """
+
+    def __init__(
+            self,
+            fp: str = "",
+            total: int = 0,
+            progress_callback: Callable = None,
+            progress_interval: float = 1.0,
+            expected_sha256: str = None,
+    ):
+        """
+        构造函数
+        :param fp: 文件路径
+        :param total: 文件总字节数
+        :param progress_callback: progress_callback(progress)
+        :param progress_interval: 进度回调间隔秒数
+        :param expected_sha256: 期望的 sha256 不一致时删除临时文件并抛出 IOError
+        """
+        self._fp = str(fp)
+        self._part_fp = f"{self._fp}.ranges"
+        self._total = total
+        self._progress_callback = progress_callback
+        self._progress_interval = progress_interval
+        self._expected_sha256 = expected_sha256
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._file = None
+        self._started_at = None
+        self._progress_at = None
+
+    @property
+    def fp(self) -> str:
+        return self._fp
+
+    @property
+    def part_fp(self) -> str:
+        """
+        临时文件路径
+        :return:
+        """
+        return self._part_fp
+
+    @property
+    def bytes(self) -> int:
+        """
+        已写入字节数
+        :return:
+        """
+        return self._bytes
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self._fp))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self._part_fp, "wb+")
+        try:
+            os.posix_fallocate(self._file.fileno(), 0, self._total)
+        except (AttributeError, OSError):
+            # 不支持 fallocate 的平台或文件系统 使用稀疏文件
+            self._file.truncate(self._total)
+        self._started_at = self._progress_at = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if exc_type is not None and os.path.exists(self._part_fp):
+            os.remove(self._part_fp)
+
+    def write_at(self, position: int = 0, chunk: bytes = b""):
+        """
+        在 position 处写入一块数据 线程安全
+        :param position: 文件 offset
+        :param chunk:
+        :return:
+        """
+        if not chunk:
+            return
+        with self._lock:
+            self._file.seek(position)
+            self._file.write(chunk)
+            self._bytes += len(chunk)
+            now = time.monotonic()
+            if now - self._progress_at < self._progress_interval:
+                return
+            self._progress_at = now
+        self.progress()
+
+    def progress(self, done: bool = False, sha256: str = None) -> Dict:
+        """
+        当前进度 并调用 progress_callback
+        :param done: 是否完成
+        :param sha256: 完成时的 sha256
+        :return:
+        """
+        elapsed = time.monotonic() - self._started_at
+        progress = Dict({
+            "fp": self._fp,
+            "bytes": self._bytes,
+            "total": self._total,
+            "offset": 0,
+            "elapsed": elapsed,
+            "bytes_per_second": self._bytes / elapsed if elapsed > 0 else 0.0,
+            "done": done,
+        })
+        if done:
+            progress.sha256 = sha256
+        if isinstance(self._progress_callback, Callable):
+            self._progress_callback(progress)
+        return progress
+
+    def commit(self) -> Dict:
+        """
+        校验大小及 sha256 后写入磁盘 原子重命名为 fp
+        :return: progress(done=True)
+        """
+        if self._bytes != self._total:
+            raise IncompleteDownloadError(f"download {self._fp} incomplete {self._bytes}/{self._total} bytes")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.seek(0)
+        sha256 = hashlib.sha256()
+        for chunk in iter(lambda: self._file.read(DOWNLOAD_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+        if self._expected_sha256 and sha256.hexdigest() != self._expected_sha256.lower():
+            raise IOError(f"download {self._fp} sha256 mismatch")
+        self._file.close()
+        self._file = None
+        os.replace(self._part_fp, self._fp)
+        return self.progress(done=True, sha256=sha256.hexdigest())
+
+
+def split_ranges(total: int = 0, connections: int = 4, min_range_size: int = DOWNLOAD_MIN_RANGE_SIZE) -> list:
+    """
+    按连接数分段 每段不小于 min_range_size
+    :param total: 文件总字节数
+    :param connections: 连接数
+    :param min_range_size: 每段最小字节数
+    :return: [(start, end)] end 包含在内
+    """
+    if total <= 0:
+        return []
+    count = max(1, min(connections, total // max(1, min_range_size)))
+    size = -(-total // count)
+    return [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+
+def probe_ranges(status_code: int = 200, headers=None) -> tuple:
+    """
+    按 Range: bytes=0-0 的响应判断是否支持分段下载
+    :param status_code: response.status_code
+    :param headers: response.headers
+    :return: (total, validator) 不支持时 total 为 None
+    """
+    if status_code != 206:
+        return None, None
+    start, _, total = content_range(headers)
+    if start != 0 or not total:
+        return None, None
+    return total, (headers or {}).get("ETag", None) or (headers or {}).get("Last-Modified", None)
+
+
+def content_length(headers=None) -> int:
+    """
+    Content-Length 压缩传输时为 None
+    :param headers: response.headers
+    :return:
+    """
+    headers = headers or {}
+    if headers.get("Content-Encoding", "identity") not in ("", "identity"):
+        return None
+    value = headers.get("Content-Length", None)
+    return int(value) if isinstance(value, str) and value.isdigit() else None
+
+
+def content_range(headers=None) -> tuple:
+    """
+    解析 Content-Range: bytes start-end/total
+    :param headers: response.headers
+    :return: (start, end, total) 未知的部分为 None
+    """
+    match = CONTENT_RANGE_PATTERN.match((headers or {}).get("Content-Range", None) or "")
+    if match is None:
+        return None, None, None
+    return tuple(None if value in (None, "*") else int(value) for value in match.groups())
+
+
+def part_size(fp: str = "") -> int:
+    """
+    已下载的临时文件大小
+    :param fp: 文件路径
+    :return:
+    """
+    part_fp = f"{fp}.part"
+    return os.path.getsize(part_fp) if os.path.isfile(part_fp) else 0
+
+
+def write_part_meta(fp: str = "", url: str = None, validator: str = None):
+    """
+    写入 f"{fp}.part.meta" 记录临时文件的下载地址及 ETag 或 Last-Modified
+    :param fp: 文件路径
+    :param url: 下载地址
+    :param validator: ETag or Last-Modified
+    :return:
+    """
+    with open(f"{fp}.part.meta", "w", encoding="utf-8") as file:
+        json.dump({"url": url, "validator": validator}, file)
+
+
+def remove_part_meta(fp: str = ""):
+    """
+    删除 f"{fp}.part.meta"
+    :param fp: 文件路径
+    :return:
+    """
+    if os.path.exists(f"{fp}.part.meta"):
+        os.remove(f"{fp}.part.meta")
+
+
+def remove_part(fp: str = ""):
+    """
+    删除临时文件 f"{fp}.part" 及 f"{fp}.part.meta"
+    :param fp: 文件路径
+    :return:
+    """
+    if os.path.exists(f"{fp}.part"):
+        os.remove(f"{fp}.part")
+    remove_part_meta(fp)
+
+
+def part_validator(fp: str = "", url: str = "") -> str:
+    """
+    临时文件的 ETag 或 Last-Modified 续传时作为 If-Range
+
+    f"{fp}.part.meta" 缺失 下载地址不同或没有 validator 时 无法确认临时文件与服务端文件一致 删除临时文件从头下载
+    :param fp: 文件路径
+    :param url: 下载地址
+    :return: validator or None
+    """
+    try:
+        with open(f"{fp}.part.meta", "r", encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        meta = None
+    if isinstance(meta, dict) and meta.get("url", None) == url and meta.get("validator", None):
+        return meta["validator"]
+    remove_part(fp)
+    return None
+
+
+def range_headers(offset: int = 0, validator: str = None) -> dict:
+    """
+    断点续传请求头 validator 为 ETag 或 Last-Modified 文件变化时服务端返回完整文件
+
+    不使用压缩传输 保证 Range 与已写入的字节一致
+    :param offset: 已下载字节数
+    :param validator: ETag or Last-Modified
+    :return:
+    """
+    headers = {"Accept-Encoding": "identity"}
+    if offset <= 0:
+        return headers
+    headers["Range"] = f"bytes={offset}-"
+    if validator:
+        headers["If-Range"] = validator
+    return headers
+
+
+def range_headers_between(start: int = 0, end: int = 0, validator: str = None) -> dict:
+    """
+    分段下载请求头 Range: bytes=start-end
+    :param start: 起始 offset
+    :param end: 结束 offset 包含在内
+    :param validator: ETag or Last-Modified 文件变化时服务端返回完整文件 分段下载失败
+    :return:
+    """
+    headers = {"Accept-Encoding": "identity", "Range": f"bytes={start}-{end}"}
+    if validator:
+        headers["If-Range"] = validator
+    return headers
+
+
+def check_range_response(status_code: int = 206, headers=None, start: int = 0):
+    """
+    检查分段响应 不是从 start 开始的 206 时抛出 RangeNotSatisfiedError
+    :param status_code: response.status_code
+    :param headers: response.headers
+    :param start: 请求的起始 offset
+    :return:
+    """
+    if status_code != 206 or content_range(headers)[0] != start:
+        raise RangeNotSatisfiedError(f"range from {start} not satisfied status {status_code} {(headers or {}).get('Content-Range')}")
+
+
+def resume_offset(status_code: int = 200, headers=None, offset: int = 0) -> tuple:
+    """
+    按响应确定续写位置
+    :param status_code: response.status_code
+    :param headers: response.headers
+    :param offset: 请求的 Range 起点
+    :return: (offset, total) offset 为 None 时临时文件已完整 服务端不支持 Range 或文件已变化时 offset 为 0
+    """
+    if offset > 0 and status_code == 416:
+        # 临时文件已完整时服务端返回 416 Content-Range: bytes */total
+        total = content_range(headers)[2]
+        return (None, total) if total == offset else (0, None)
+    if offset > 0 and status_code == 206:
+        start, _, total = content_range(headers)
+        return (offset, total) if start == offset else (0, None)
+    return 0, content_length(headers)
+
+
+def download(
+        session: requests.Session = None,
+        url: str = "",
+        fp: str = "",
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Callable = None,
+        progress_interval: float = 1.0,
+        timeout: float = 60.0,
+        resume: bool = True,
+        retries: int = 3,
+        expected_sha256: str = None,
+) -> Dict:
+    """
+    流式下载到 fp 内存中最多保留一个 chunk
+
+    resume 时从已有的 f"{fp}.part" 续传 传输中断后最多重试 retries 次 每次从中断处续传
+
+    续传时以 f"{fp}.part.meta" 中的 ETag 或 Last-Modified 作为 If-Range 服务端文件已变化时返回完整文件
+    meta 缺失或下载地址不同时从头下载 服务端不支持 Range 时从头下载
+    :param session: requests.Session if None usage requests
+    :param url: 下载地址
+    :param fp: 文件路径
+    :param chunk_size: 每次读取字节数
+    :param progress_callback: progress_callback(progress) 参考 DownloadWriter
+    :param progress_interval: 进度回调间隔秒数
+    :param timeout: 连接及每次读取超时秒数
+    :param resume: 是否断点续传
+    :param retries: 传输中断后的重试次数
+    :param expected_sha256: 期望的 sha256 None 不校验
+    :return: Dict(fp,bytes,total,offset,elapsed,bytes_per_second,done,sha256)
+    """
+    session = session or requests
+    attempt = 0
+    while True:
+        validator = part_validator(fp, url) if resume else None
+        requested_offset = part_size(fp) if resume else 0
+        try:
+            with session.get(url, stream=True, timeout=timeout,
+                             headers=range_headers(requested_offset, validator)) as response:
+                offset, total = resume_offset(response.status_code, response.headers, requested_offset)
+                if requested_offset > 0 and offset == 0 and response.status_code in (206, 416):
+                    # 临时文件与服务端文件不一致 删除后从头下载
+                    remove_part(fp)
+                    continue
+                if offset is not None:
+                    response.raise_for_status()
+                with DownloadWriter(
+                        fp=fp,
+                        total=total,
+                        progress_callback=progress_callback,
+                        progress_interval=progress_interval,
+                        offset=total if offset is None else offset,
+                        keep_part=resume,
+                        expected_sha256=expected_sha256,
+                        url=url,
+                        validator=response.headers.get("ETag", None) or response.headers.get("Last-Modified", None),
+                ) as writer:
+                    if offset is not None:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            writer.write(chunk)
+                    return writer.commit()
+        except DOWNLOAD_RETRY_EXCEPTIONS:
+            attempt += 1
+            if not resume or attempt > retries:
+                raise
+        except IncompleteDownloadError:
+            # 服务端提前关闭连接
+            attempt += 1
+            if not resume or attempt > retries:
+                raise
+
+
+async def async_download(
+        async_client=None,
+        url: str = "",
+        fp: str = "",
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Callable = None,
+        progress_interval: float = 1.0,
+        resume: bool = True,
+        retries: int = 3,
+        expected_sha256: str = None,
+) -> Dict:
+    """
+    流式下载到 fp asyncio 版本 写文件为同步写入 每次一个 chunk
+    :param async_client: httpx.AsyncClient
+    :param url: 下载地址
+    :param fp: 文件路径
+    :param chunk_size: 每次读取字节数
+    :param progress_callback: progress_callback(progress) 参考 DownloadWriter
+    :param progress_interval: 进度回调间隔秒数
+    :param resume: 是否断点续传 参考 download()
+    :param retries: 传输中断后的重试次数
+    :param expected_sha256: 期望的 sha256 None 不校验
+    :return: Dict(fp,bytes,total,offset,elapsed,bytes_per_second,done,sha256)
+    """
+    attempt = 0
+    while True:
+        validator = part_validator(fp, url) if resume else None
+        requested_offset = part_size(fp) if resume else 0
+        try:
+            async with async_client.stream("GET", url, headers=range_headers(requested_offset, validator)) as response:
+                offset, total = resume_offset(response.status_code, response.headers, requested_offset)
+                if requested_offset > 0 and offset == 0 and response.status_code in (206, 416):
+                    # 临时文件与服务端文件不一致 删除后从头下载
+                    remove_part(fp)
+                    continue
+                if offset is not None:
+                    response.raise_for_status()
+                with DownloadWriter(
+                        fp=fp,
+                        total=total,
+                        progress_callback=progress_callback,
+                        progress_interval=progress_interval,
+                        offset=total if offset is None else offset,
+                        keep_part=resume,
+                        expected_sha256=expected_sha256,
+                        url=url,
+                        validator=response.headers.get("ETag", None) or response.headers.get("Last-Modified", None),
+                ) as writer:
+                    if offset is not None:
+                        async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                            writer.write(chunk)
+                    return writer.commit()
+        except httpx.TransportError:
+            attempt += 1
+            if not resume or attempt > retries:
+                raise
+        except IncompleteDownloadError:
+            attempt += 1
+            if not resume or attempt > retries:
+                raise
+
+
+def parallel_download(
+        session: requests.Session = None,
+        url: str = "",
+        fp: str = "",
+        connections: int = 4,
+        min_range_size: int = DOWNLOAD_MIN_RANGE_SIZE,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Callable = None,
+        progress_interval: float = 1.0,
+        timeout: float = 60.0,
+        resume: bool = True,
+        retries: int = 3,
+        retry_backoff: float = 0.5,
+        expected_sha256: str = None,
+) -> Dict:
+    """
+    多连接分段下载 每个连接下载一个 Range 写入预分配文件的对应 offset
+
+    服务端不支持 Range 或文件小于 2 个 min_range_size 时使用 download() 单连接下载
+    分段响应不是请求的 Range 时 服务端忽略了 Range 或文件已变化 放弃分段改为 download()
+
+    每个分段传输中断后最多重试 retries 次 等待 retry_backoff * 2 ** (重试次数 - 1) 秒后从该分段中断处续传
+    :param session: requests.Session if None usage requests 连接池大小应不小于 connections
+    :param url: 下载地址
+    :param fp: 文件路径
+    :param connections: 连接数
+    :param min_range_size: 每段最小字节数
+    :param chunk_size: 每次读取字节数
+    :param progress_callback: progress_callback(progress) 参考 DownloadWriter
+    :param progress_interval: 进度回调间隔秒数
+    :param timeout: 连接及每次读取超时秒数
+    :param resume: 使用 download() 单连接下载时是否断点续传
+    :param retries: 每个分段传输中断后的重试次数
+    :param retry_backoff: 分段重试的初始等待秒数
+    :param expected_sha256: 期望的 sha256 None 不校验
+    :return: Dict(fp,bytes,total,offset,elapsed,bytes_per_second,done,sha256)
+    """
+    session = session or requests
+
+    def _download():
+        return download(session=session, url=url, fp=fp, chunk_size=chunk_size, progress_callback=progress_callback,
+                        progress_interval=progress_interval, timeout=timeout, resume=resume, retries=retries,
+                        expected_sha256=expected_sha256)
+
+    with session.get(url, stream=True, timeout=timeout, headers=range_headers_between(0, 0)) as response:
+        total, validator = probe_ranges(response.status_code, response.headers)
+    ranges = split_ranges(total or 0, connections, min_range_size)
+    if len(ranges) < 2:
+        return _download()
+    stopped = threading.Event()
+
+    def _fetch(start: int = 0, end: int = 0):
+        position = start
+        attempt = 0
+        while position <= end:
+            try:
+                with session.get(url, stream=True, timeout=timeout,
+                                 headers=range_headers_between(position, end, validator)) as response:
+                    check_range_response(response.status_code, response.headers, position)
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if stopped.is_set():
+                            return
+                        chunk = chunk[:end + 1 - position]
+                        writer.write_at(position, chunk)
+                        position += len(chunk)
+                        if position > end:
+                            break
+                if position <= end:
+                    raise IncompleteDownloadError(f"download {fp} range {position}-{end} incomplete")
+            except DOWNLOAD_RETRY_EXCEPTIONS + (IncompleteDownloadError,):
+                attempt += 1
+                if attempt > retries:
+                    raise
+                if stopped.wait(retry_backoff * 2 ** (attempt - 1)):
+                    return
+
+    try:
+        with RangeDownloadWriter(
+                fp=fp,
+                total=total,
+                progress_callback=progress_callback,
+                progress_interval=progress_interval,
+                expected_sha256=expected_sha256,
+        ) as writer:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(_fetch, start, end) for start, end in ranges]
+                wait(futures, return_when=FIRST_EXCEPTION)
+                stopped.set()
+                for future in futures:
+                    future.result()
+            return writer.commit()
+    except RangeNotSatisfiedError:
+        return _download()
+
+
+async def async_parallel_download(
+        async_client=None,
+        url: str = "",
+        fp: str = "",
+        connections: int = 4,
+        min_range_size: int = DOWNLOAD_MIN_RANGE_SIZE,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Callable = None,
+        progress_interval: float = 1.0,
+        resume: bool = True,
+        retries: int = 3,
+        retry_backoff: float = 0.5,
+        expected_sha256: str = None,
+) -> Dict:
+    """
+    多连接分段下载 asyncio 版本 参考 parallel_download()
+    :param async_client: httpx.AsyncClient 连接池大小应不小于 connections
+    :param url: 下载地址
+    :param fp: 文件路径
+    :param connections: 连接数
+    :param min_range_size: 每段最小字节数
+    :param chunk_size: 每次读取字节数
+    :param progress_callback: progress_callback(progress) 参考 DownloadWriter
+    :param progress_interval: 进度回调间隔秒数
+    :param resume: 使用 async_download() 单连接下载时是否断点续传
+    :param retries: 每个分段传输中断后的重试次数
+    :param retry_backoff: 分段重试的初始等待秒数
+    :param expected_sha256: 期望的 sha256 None 不校验
+    :return: Dict(fp,bytes,total,offset,elapsed,bytes_per_second,done,sha256)
+    """
+
+    def _download():
+        return async_download(async_client=async_client, url=url, fp=fp, chunk_size=chunk_size,
+                              progress_callback=progress_callback, progress_interval=progress_interval,
+                              resume=resume, retries=retries, expected_sha256=expected_sha256)
+
+    async with async_client.stream("GET", url, headers=range_headers_between(0, 0)) as response:
+        total, validator = probe_ranges(response.status_code, response.headers)
+    ranges = split_ranges(total or 0, connections, min_range_size)
+    if len(ranges) < 2:
+        return await _download()
+
+    async def _fetch(start: int = 0, end: int = 0):
+        position = start
+        attempt = 0
+        while position <= end:
+            try:
+                async with async_client.stream(
+                        "GET", url, headers=range_headers_between(position, end, validator)
+                ) as response:
+                    check_range_response(response.status_code, response.headers, position)
+                    async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                        chunk = chunk[:end + 1 - position]
+                        writer.write_at(position, chunk)
+                        position += len(chunk)
+                        if position > end:
+                            break
+                if position <= end:
+                    raise IncompleteDownloadError(f"download {fp} range {position}-{end} incomplete")
+            except (httpx.TransportError, IncompleteDownloadError):
+                attempt += 1
+                if attempt > retries:
+                    raise
+                await asyncio.sleep(retry_backoff * 2 ** (attempt - 1))
+
+    try:
+        with RangeDownloadWriter(
+                fp=fp,
+                total=total,
+                progress_callback=progress_callback,
+                progress_interval=progress_interval,
+                expected_sha256=expected_sha256,
+        ) as writer:
+            tasks = [asyncio.ensure_future(_fetch(start, end)) for start, end in ranges]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            return writer.commit()
+    except RangeNotSatisfiedError:
+        return await _download()
@@ -8,17 +8,111 @@ email:[174000902@qq.com]
 github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
 =================================================
 """
+import functools
 import hashlib
 from datetime import timedelta
 from typing import Union, Callable
 
 import diskcache
 import redis
-import requests
 from addict import Dict
 from guolei_py3_requests.library import ResponseCallback, Request
-from jsonschema.validators import Draft202012Validator, validate
-from requests import Response
+from jsonschema.validators import Draft202012Validator
+from requests import Response, exceptions
+
+from guolei_py3_wisharetec.circuitbreaker import CircuitBreaker
+from guolei_py3_wisharetec.ratelimit import RateLimiter
+from guolei_py3_wisharetec.refresher import TokenRefresher
+from guolei_py3_wisharetec.session import PooledSession
+from guolei_py3_wisharetec.singleflight import SingleFlight, request_key
+from guolei_py3_wisharetec.token_store import TokenStore, token_store, token_store_key
+
+
+STATUS_100_DATA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": {
+            "oneOf": [
+                {"type": "integer", "const": 100},
+                {"type": "string", "const": "100"},
+            ]
+        }
+    },
+    "required": ["status", "data"],
+}
+
+STATUS_100_DATA_RESULTLIST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": {
+            "oneOf": [
+                {"type": "integer", "const": 100},
+                {"type": "string", "const": "100"},
+            ]
+        },
+        "data": {
+            "type": "object",
+            "properties": {
+                "resultList": {
+                    "type": "array",
+                    "minItems": 1,
+                },
+                "required": ["resultList"]
+            }
+        }
+    },
+    "required": ["status", "data"],
+}
+
+TOKEN_DATA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "token": {"type": "string", "minLength": 1},
+        "companyCode": {"type": "string", "minLength": 1},
+    },
+    "required": ["token", "companyCode"],
+}
+
+STATUS_100_DATA_VALIDATOR = Draft202012Validator(STATUS_100_DATA_SCHEMA)
+STATUS_100_DATA_RESULTLIST_VALIDATOR = Draft202012Validator(STATUS_100_DATA_RESULTLIST_SCHEMA)
+TOKEN_DATA_VALIDATOR = Draft202012Validator(TOKEN_DATA_SCHEMA)
+
+
+def is_status_100_data(json_object=None) -> bool:
+    """
+    STATUS_100_DATA_SCHEMA 的结构检查 不使用 jsonschema
+    :param json_object:
+    :return:
+    """
+    return isinstance(json_object, dict) and "data" in json_object and json_object.get("status", None) in (
+        100, "100")
+
+
+def is_status_100_data_resultlist(json_object=None) -> bool:
+    """
+    STATUS_100_DATA_RESULTLIST_SCHEMA 的结构检查 不使用 jsonschema
+    :param json_object:
+    :return:
+    """
+    if not is_status_100_data(json_object):
+        return False
+    data = json_object.get("data", None)
+    if not isinstance(data, dict):
+        return False
+    if "resultList" not in data:
+        return True
+    return isinstance(data.get("resultList"), list) and len(data.get("resultList")) > 0
+
+
+def is_token_data(token_data=None) -> bool:
+    """
+    TOKEN_DATA_SCHEMA 的结构检查 不使用 jsonschema
+    :param token_data:
+    :return:
+    """
+    return isinstance(token_data, dict) and all(
+        isinstance(token_data.get(key, None), str) and len(token_data.get(key)) for key in ["token", "companyCode"]
+    )
 
 
 class ResponseCallback(ResponseCallback):
@@ -32,47 +126,25 @@ class ResponseCallback(ResponseCallback):
         return isinstance(text, str) and text.lower().startswith("null")
 
     @staticmethod
-    def json_status_100_data(response: Response = None, status_code: int = 200):
+    def json_status_100_data(response: Response = None, status_code: int = 200, validate_schema: bool = True):
         json_addict = ResponseCallback.json_addict(response=response, status_code=status_code)
-        if Draft202012Validator({
-            "type": "object",
-            "properties": {
-                "status": {
-                    "oneOf": [
-                        {"type": "integer", "const": 100},
-                        {"type": "string", "const": "100"},
-                    ]
-                }
-            },
-            "required": ["status", "data"],
-        }).is_valid(json_addict):
+        if validate_schema:
+            is_valid = STATUS_100_DATA_VALIDATOR.is_valid(json_addict)
+        else:
+            is_valid = is_status_100_data(json_addict)
+        if is_valid:
             return json_addict.data
         return None
 
-    def json_status_100_data_resultlist(response: Response = None, status_code: int = 200):
+    @staticmethod
+    def json_status_100_data_resultlist(response: Response = None, status_code: int = 200,
+                                        validate_schema: bool = True):
         json_addict = ResponseCallback.json_addict(response=response, status_code=status_code)
-        if Draft202012Validator({
-            "type": "object",
-            "properties": {
-                "status": {
-                    "oneOf": [
-                        {"type": "integer", "const": 100},
-                        {"type": "string", "const": "100"},
-                    ]
-                },
-                "data": {
-                    "type": "object",
-                    "properties": {
-                        "resultList": {
-                            "type": "array",
-                            "minItems": 1,
-                        },
-                        "required": ["resultList"]
-                    }
-                }
-            },
-            "required": ["status", "data"],
-        }).is_valid(json_addict):
+        if validate_schema:
+            is_valid = STATUS_100_DATA_RESULTLIST_VALIDATOR.is_valid(json_addict)
+        else:
+            is_valid = is_status_100_data_resultlist(json_addict)
+        if is_valid:
             return json_addict.data.resultList
         return None
 
@@ -124,6 +196,16 @@ class UrlSetting(object):
     UPDATE_PARKING_AUTH_AUDIT_STATUS: str = "/manage/carParkApplication/completeTask"
     QUERY_EXPORT_BY_PAGINATOR: str = "/manage/export/log"
     UPLOAD: str = "/upload"
+    QUERY_SHOP_BY_PAGINATOR: str = "/manage/shop/page"
+    QUERY_SHOP_DETAIL: str = "/manage/shop/getShopInfo"
+    QUERY_STORE_BY_PAGINATOR: str = "/manage/store/page"
+    QUERY_STORE_DETAIL: str = "/manage/store/getStoreDetail"
+    QUERY_SHOP_GOODS_EXPORT: str = "/manage/goods/exportShopGoods"
+    QUERY_STORE_PRODUCT_EXPORT: str = "/manage/storeProduct/exportStoreProductList"
+    QUERY_DEVICE_BY_PAGINATOR: str = "/manage/device/DeviceList"
+    QUERY_DEVICE_PATROL_DETAIL: str = "/manage/devicePatrol/detail"
+    QUERY_ENTERPRISE_USER_BY_PAGINATOR: str = "/manage/newEnterpriseUserInfo/selectEnterpriseUserInfoList"
+    SAVE_DEVICE_PATROL: str = "/manage/devicePatrol/patrol/save"
 
 
 class Api(Request):
@@ -136,7 +218,16 @@ class Api(Request):
             base_url: str = "https://sq.wisharetec.com/",
             username: str = None,
             password: str = None,
-            cache_instance: Union[diskcache.Cache, redis.Redis, redis.StrictRedis] = None
+            cache_instance: Union[diskcache.Cache, redis.Redis, redis.StrictRedis] = None,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            keep_alive_timeout: float = 60.0,
+            validate_schema: bool = True,
+            token_store: TokenStore = None,
+            rate_limiter: RateLimiter = None,
+            circuit_breaker: CircuitBreaker = None,
+            coalesce_requests: bool = False,
     ):
         """
         构造函数
@@ -144,6 +235,15 @@ class Api(Request):
         :param username: 用户名
         :param password: 密码
         :param cache_instance: 缓存实例
+        :param pool_connections: 连接池 缓存的 host 连接池数量
+        :param pool_maxsize: 连接池 每个 host 最大连接数
+        :param pool_block: 连接池耗尽时是否阻塞等待
+        :param keep_alive_timeout: 空闲连接保持秒数
+        :param validate_schema: False 时使用结构检查代替 jsonschema 校验
+        :param token_store: token 存储 if None 按 cache_instance 生成 TwoTierTokenStore
+        :param rate_limiter: 令牌桶限流 guolei_py3_wisharetec.ratelimit.rate_limiter() None 不限流
+        :param circuit_breaker: 按接口熔断 None 不熔断
+        :param coalesce_requests: 是否合并同一时刻相同的 GET 请求 合并后调用方共享同一结果对象
         """
         super().__init__()
         self._base_url = base_url
@@ -151,6 +251,20 @@ class Api(Request):
         self._password = password
         self._cache_instance = cache_instance
         self._token_data = Dict()
+        self._headers_key = None
+        self._headers = {}
+        self._validate_schema = validate_schema
+        self._token_store = token_store
+        self._token_refresher = None
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self._session = PooledSession(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive_timeout=keep_alive_timeout,
+        )
 
     @property
     def base_url(self):
@@ -237,16 +351,199 @@ class Api(Request):
         """
         self._token_data = Dict(token_data)
 
+    @property
+    def headers(self) -> dict:
+        """
+        Token Companycode 请求头 token data 变化时重新生成
+        :return:
+        """
+        token_data = self._token_data if isinstance(self._token_data, dict) else {}
+        token = token_data.get("token", "")
+        company_code = token_data.get("companyCode", "")
+        if self._headers_key != (token, company_code):
+            self._headers = {"Token": token, "Companycode": company_code}
+            self._headers_key = (token, company_code)
+        return self._headers
+
+    def build_request_kwargs(self, path: str = None, kwargs: dict = None) -> dict:
+        """
+        生成 session.request(**kwargs) 参数 headers 与 self.headers 合并 kwargs 优先
+        :param path: if url is None: url=f"{self.base_url}{path}"
+        :param kwargs: requests.request(**kwargs)
+        :return: plain dict
+        """
+        kwargs = dict(kwargs or {})
+        kwargs.setdefault("url", f"{self.base_url}{path}")
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers", None) or {})}
+        return kwargs
+
+    @property
+    def validate_schema(self):
+        """
+        False 时使用结构检查代替 jsonschema 校验
+        :return:
+        """
+        return self._validate_schema
+
+    @validate_schema.setter
+    def validate_schema(self, validate_schema):
+        """
+        False 时使用结构检查代替 jsonschema 校验
+        :param validate_schema:
+        :return:
+        """
+        self._validate_schema = validate_schema
+
+    @property
+    def token_store(self) -> TokenStore:
+        """
+        token 存储 进程内一级缓存 + cache_instance 二级缓存
+        :return:
+        """
+        if isinstance(self._token_store, TokenStore):
+            return self._token_store
+        return token_store(self.cache_instance)
+
+    @token_store.setter
+    def token_store(self, token_store: TokenStore = None):
+        """
+        token 存储
+        :param token_store:
+        :return:
+        """
+        self._token_store = token_store
+
+    @property
+    def token_store_key(self) -> tuple:
+        """
+        token store key
+        :return: (base_url, username)
+        """
+        return token_store_key(base_url=self.base_url, uid=self.username)
+
+    def is_token_data(self, token_data: dict = None) -> bool:
+        """
+        校验 token 数据
+        :param token_data:
+        :return:
+        """
+        if self.validate_schema:
+            return TOKEN_DATA_VALIDATOR.is_valid(token_data)
+        return is_token_data(token_data)
+
+    @property
+    def rate_limiter(self):
+        """
+        令牌桶限流
+        :return:
+        """
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: RateLimiter = None):
+        """
+        令牌桶限流
+        :param rate_limiter:
+        :return:
+        """
+        self._rate_limiter = rate_limiter
+
+    @property
+    def circuit_breaker(self):
+        """
+        按接口熔断
+        :return:
+        """
+        return self._circuit_breaker
+
+    @circuit_breaker.setter
+    def circuit_breaker(self, circuit_breaker: CircuitBreaker = None):
+        """
+        按接口熔断
+        :param circuit_breaker:
+        :return:
+        """
+        self._circuit_breaker = circuit_breaker
+
+    @property
+    def single_flight(self):
+        """
+        GET 请求合并 single_flight.stats() 查看合并次数 None 不合并
+        :return:
+        """
+        return self._single_flight
+
+    @property
+    def session(self):
+        """
+        keep-alive 连接池 Session
+        :return:
+        """
+        return self._session
+
+    def close(self):
+        """
+        停止后台 token 刷新 关闭连接池
+        :return:
+        """
+        self.stop_token_refresher()
+        self._session.close()
+
+    def send(self, on_response_callback: Callable = None, **kwargs):
+        """
+        使用连接池 session 执行请求
+        :param on_response_callback: response callback
+        :param kwargs: session.request(**kwargs)
+        :return: on_response_callback(response) or response
+        """
+        if not self.validate_schema and on_response_callback in (
+                ResponseCallback.json_status_100_data,
+                ResponseCallback.json_status_100_data_resultlist,
+        ):
+            on_response_callback = functools.partial(on_response_callback, validate_schema=False)
+        url = kwargs.get("url", "")
+        if isinstance(self.circuit_breaker, CircuitBreaker):
+            self.circuit_breaker.before_request(url)
+        if isinstance(self.rate_limiter, RateLimiter):
+            self.rate_limiter.wait(url)
+        try:
+            response = self.session.request(**kwargs)
+        except BaseException as error:
+            self.on_request_result(url=url, error=error)
+            raise
+        self.on_request_result(url=url, response=response)
+        if isinstance(on_response_callback, Callable):
+            return on_response_callback(response)
+        return response
+
+    def on_request_result(self, url: str = "", response: Response = None, error: BaseException = None):
+        """
+        记录请求结果到 circuit_breaker 超时 连接失败 5xx 429 计为失败
+        :param url: 请求 url
+        :param response: response
+        :param error: 请求异常
+        :return:
+        """
+        if not isinstance(self.circuit_breaker, CircuitBreaker):
+            return
+        if error is not None:
+            failed = True if isinstance(error, (exceptions.Timeout, exceptions.ConnectionError)) else None
+        else:
+            failed = response.status_code >= 500 or response.status_code == 429
+        self.circuit_breaker.on_result(url, failed=failed)
+
     def get_token_data_by_cache(self, name: str = None):
         """
         get token data by cache
 
-        if isinstance(self.cache_instance,(diskcache.Cache,redis.Redis,redis.StrictRedis)): usage cache
+        if name is None: usage self.token_store else if isinstance(self.cache_instance,(diskcache.Cache,redis.Redis,redis.StrictRedis)): usage cache
 
         :param name: cache key
         :return: token data
         """
-        name = name or f"guolei_py3_wisharetec_token_data__{self.username}"
+        if name is None:
+            self.token_data = self.token_store.get(key=self.token_store_key) or {}
+            return Dict(self.token_data)
         if isinstance(self.cache_instance, diskcache.Cache):
             self.token_data = self.cache_instance.get(key=name)
         if isinstance(self.cache_instance, (redis.Redis, redis.StrictRedis)):
@@ -261,23 +558,23 @@ class Api(Request):
         """
         put token data into cache
 
-        if isinstance(self.cache_instance,(diskcache.Cache,redis.Redis,redis.StrictRedis)): usage cache
+        if name is None: usage self.token_store else if isinstance(self.cache_instance,(diskcache.Cache,redis.Redis,redis.StrictRedis)): usage cache
+
+        此前的 schema 要求 name expire token_data 字段 校验总是失败 从未写入缓存 现在 token companyCode 非空即写入
         :param name: cache key
         :param expire: cache expire time
         :param token_data: token data
         :return:
         """
-        token_data = Dict(self.token_data)
-        if not Draft202012Validator({
-            "type": "object",
-            "properties": {
-                "token": {"type": "string", "minLength": 1},
-                "companyCode": {"type": "string", "minLength": 1},
-            },
-            "required": ["name", "expire", "token_data"]
-        }).is_valid(token_data):
+        token_data = Dict(token_data or self.token_data)
+        if not self.is_token_data(token_data):
             return False
-        name = name or f"guolei_py3_wisharetec_token_data__{self.username}"
+        if name is None:
+            return self.token_store.set(
+                key=self.token_store_key,
+                value=token_data.to_dict(),
+                expire=expire or timedelta(days=30),
+            )
         if isinstance(self.cache_instance, diskcache.Cache):
             return self.cache_instance.set(
                 key=name,
@@ -299,7 +596,7 @@ class Api(Request):
 
     def get(self, on_response_callback: Callable = ResponseCallback.json_status_100_data, path: str = None, **kwargs):
         """
-        execute Request.get()
+        execute get by pooled session
 
         headers.setdefault("Token", self.token_data.get("token", ""))
 
@@ -310,19 +607,26 @@ class Api(Request):
         :param kwargs: requests.get(**kwargs)
         :return: on_response_callback(response) or response
         """
-        kwargs = Dict(kwargs)
-        kwargs.setdefault("url", f"{self.base_url}{path}")
-        kwargs.headers = Dict({
-            **{
-                "Token": self.token_data.get("token", ""),
-                "Companycode": self.token_data.get("companyCode", "")
-            }
-        })
-        return super().get(on_response_callback=on_response_callback, **kwargs.to_dict())
+        kwargs = self.build_request_kwargs(path=path, kwargs=kwargs)
+        if not isinstance(self.single_flight, SingleFlight) or any(
+                kwargs.get(name, None) is not None for name in ("data", "json", "files")
+        ):
+            return self.send(on_response_callback=on_response_callback, method="GET", **kwargs)
+        key = request_key(
+            method="GET",
+            url=kwargs.get("url"),
+            params=kwargs.get("params", None),
+            headers=kwargs.get("headers", None),
+            response_callable=on_response_callback,
+        )
+        return self.single_flight.do(
+            key,
+            lambda: self.send(on_response_callback=on_response_callback, method="GET", **kwargs),
+        )
 
     def post(self, on_response_callback: Callable = ResponseCallback.json_status_100_data, path: str = None, **kwargs):
         """
-        execute post by requests.post
+        execute post by pooled session
 
         headers.setdefault("Token", self.token_data.get("token", ""))
 
@@ -333,20 +637,12 @@ class Api(Request):
         :param kwargs: requests.get(**kwargs)
         :return: on_response_callback(response) or response
         """
-
-        kwargs = Dict(kwargs)
-        kwargs.setdefault("url", f"{self.base_url}{path}")
-        kwargs.headers = Dict({
-            **{
-                "Token": self.token_data.get("token", ""),
-                "Companycode": self.token_data.get("companyCode", "")
-            }
-        })
-        return super().post(on_response_callback=on_response_callback, **kwargs.to_dict())
+        kwargs = self.build_request_kwargs(path=path, kwargs=kwargs)
+        return self.send(on_response_callback=on_response_callback, method="POST", **kwargs)
 
     def put(self, on_response_callback: Callable = ResponseCallback.json_status_100_data, path: str = None, **kwargs):
         """
-        execute put by requests.put
+        execute put by pooled session
 
         headers.setdefault("Token", self.token_data.get("token", ""))
 
@@ -357,20 +653,13 @@ class Api(Request):
         :param kwargs: requests.get(**kwargs)
         :return: on_response_callback(response) or response
         """
-        kwargs = Dict(kwargs)
-        kwargs.setdefault("url", f"{self.base_url}{path}")
-        kwargs.headers = Dict({
-            **{
-                "Token": self.token_data.get("token", ""),
-                "Companycode": self.token_data.get("companyCode", "")
-            }
-        })
-        return super().put(on_response_callback=on_response_callback, **kwargs.to_dict())
+        kwargs = self.build_request_kwargs(path=path, kwargs=kwargs)
+        return self.send(on_response_callback=on_response_callback, method="PUT", **kwargs)
 
     def request(self, on_response_callback: Callable = ResponseCallback.json_status_100_data, path: str = None,
                 **kwargs):
         """
-        execute request by requests.request
+        execute request by pooled session
 
         headers.setdefault("Token", self.token_data.get("token", ""))
 
@@ -381,15 +670,8 @@ class Api(Request):
         :param kwargs: requests.get(**kwargs)
         :return: on_response_callback(response) or response
         """
-        kwargs = Dict(kwargs)
-        kwargs.setdefault("url", f"{self.base_url}{path}")
-        kwargs.headers = Dict({
-            **{
-                "Token": self.token_data.get("token", ""),
-                "Companycode": self.token_data.get("companyCode", "")
-            }
-        })
-        return super().request(on_response_callback=on_response_callback, **kwargs.to_dict())
+        kwargs = self.build_request_kwargs(path=path, kwargs=kwargs)
+        return self.send(on_response_callback=on_response_callback, **kwargs)
 
     def login(self):
         """
@@ -397,15 +679,108 @@ class Api(Request):
 
         if isinstance(self.cache_instance,(diskcache.Cache,redis.Redis,redis.StrictRedis)): usage cache
 
+        token 失效时在 token_store.lock 内登录 同一 (base_url, username) 只有一个线程或进程请求登录
+
         :return:
         """
         self.token_data = self.get_token_data_by_cache()
-        result: bool = self.get(
+        if self.check_login():
+            return self
+        stale_token = self.token_data.get("token", None)
+        with self.token_store.lock(key=self.token_store_key):
+            # 等待期间其他调用方可能已登录
+            self.token_data = self.token_store.get(key=self.token_store_key, refresh=True) or {}
+            if self.token_data.get("token", None) != stale_token and self.check_login():
+                return self
+            return self.login_without_cache()
+
+    def check_login(self) -> bool:
+        """
+        检测登录
+        :return:
+        """
+        if not self.token_data.get("token", None):
+            return False
+        return self.get(
             on_response_callback=ResponseCallback.text_start_with_null,
             path=f"{UrlSetting.QUERY_LOGIN_STATE}"
         )
-        if result:
-            return self
+
+    def refresh_token(self, force_login: bool = False) -> bool:
+        """
+        重新校验 token 失效或 force_login 时登录 结果写入缓存
+        :param force_login: 是否直接重新登录
+        :return: 是否持有有效 token 登录失败时旧 token 仍保留 返回 False
+        """
+        self.token_data = self.token_store.get(key=self.token_store_key, refresh=True) or {}
+        if not force_login and self.check_login():
+            return True
+        stale_token = self.token_data.get("token", None)
+        with self.token_store.lock(key=self.token_store_key):
+            # 等待期间 包括等待超时 其他调用方可能已登录 先读取 token 存储
+            self.token_data = self.token_store.get(key=self.token_store_key, refresh=True) or self.token_data
+            if self.token_data.get("token", None) != stale_token and self.check_login():
+                return True
+            # login_without_cache 只在登录成功时替换 _token_data
+            stale_token_data = self._token_data
+            self.login_without_cache()
+        return self._token_data is not stale_token_data and self.is_token_data(self.token_data)
+
+    @property
+    def token_refresher(self) -> TokenRefresher:
+        """
+        后台 token 刷新 未启动时为 None
+        :return:
+        """
+        return self._token_refresher
+
+    @property
+    def last_refreshed_at(self):
+        """
+        后台 token 最近一次刷新成功的时间戳 time.time()
+        :return:
+        """
+        if self._token_refresher is None:
+            return None
+        return self._token_refresher.last_refreshed_at
+
+    def start_token_refresher(
+            self,
+            interval: float = 120.0,
+            renew_interval: float = None,
+            restart_after_fork: bool = False,
+    ) -> TokenRefresher:
+        """
+        启动后台 token 刷新线程
+        :param interval: 校验间隔秒数
+        :param renew_interval: 重新登录间隔秒数 None 只在 token 失效时登录
+        :param restart_after_fork: fork 后是否在子进程中重新启动
+        :return:
+        """
+        if self._token_refresher is None:
+            self._token_refresher = TokenRefresher(
+                refresh=self.refresh_token,
+                interval=interval,
+                renew_interval=renew_interval,
+                restart_after_fork=restart_after_fork,
+            )
+        return self._token_refresher.start()
+
+    def stop_token_refresher(self, timeout: float = None):
+        """
+        停止后台 token 刷新线程
+        :param timeout: 最长等待秒数
+        :return:
+        """
+        if self._token_refresher is not None:
+            self._token_refresher.stop(timeout=timeout)
+        return self
+
+    def login_without_cache(self):
+        """
+        请求登录接口 成功后写入缓存
+        :return:
+        """
         result: dict = self.post(
             on_response_callback=ResponseCallback.json_status_100_data,
             path=f"{UrlSetting.LOGIN}",
@@ -415,14 +790,7 @@ class Api(Request):
                 "mode": "PASSWORD",
             }
         )
-        if Draft202012Validator({
-            "type": "object",
-            "properties": {
-                "token": {"type": "string", "minLength": 1},
-                "companyCode": {"type": "string", "minLength": 1},
-            },
-            "required": ["token", "companyCode"],
-        }).is_valid(result):
+        if self.is_token_data(result):
             self.token_data = result
             self.put_token_data_to_cache()
         return self
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import abc
+import asyncio
+import threading
+import time
+from typing import Union, Iterable
+from urllib.parse import urlsplit
+
+import redis
+
+# redis 令牌桶 使用 redis 时间 多进程共享同一个桶
+# 令牌可以为负 表示已预约的请求 返回值为需要等待的秒数
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(now - ts, 0) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+def rate_limit_keys(url: str = "") -> tuple:
+    """
+    限流 key
+    :param url: 请求 url
+    :return: (base_url key, endpoint key, path)
+    """
+    parts = urlsplit(url or "")
+    base_url = f"{parts.scheme}://{parts.netloc}"
+    return base_url, f"{base_url}{parts.path}", parts.path
+
+
+def request_url(requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> str:
+    """
+    从 requests.request 参数中取得 url
+    :param requests_request_args: requests.request(*requests_request_args,**requests_request_kwargs)
+    :param requests_request_kwargs: requests.request(*requests_request_args,**requests_request_kwargs)
+    :return:
+    """
+    url = requests_request_kwargs.get("url", None)
+    if url is None:
+        args = list(requests_request_args)
+        url = args[1] if len(args) > 1 else ""
+    return url
+
+
+class RateLimiter(abc.ABC):
+    """
+    令牌桶限流基类
+
+    每个 base_url + path 一个桶 rates 按 path 单独设置 base_url_rate 限制同一 base_url 的总速率
+    """
+
+    def __init__(
+            self,
+            rate: float = 10.0,
+            burst: float = None,
+            rates: dict = None,
+            base_url_rate: float = None,
+            base_url_burst: float = None,
+    ):
+        """
+        构造函数
+        :param rate: 每个接口每秒请求数 None or <=0 不限制
+        :param burst: 每个接口桶容量 if None usage max(rate,1)
+        :param rates: {path: (rate, burst)} 单独设置的接口
+        :param base_url_rate: 同一 base_url 每秒总请求数 None 不限制
+        :param base_url_burst: 同一 base_url 桶容量 if None usage max(base_url_rate,1)
+        """
+        self._rate = rate
+        self._burst = burst
+        self._rates = dict(rates or {})
+        self._base_url_rate = base_url_rate
+        self._base_url_burst = base_url_burst
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def rates(self) -> dict:
+        return self._rates
+
+    @property
+    def base_url_rate(self) -> float:
+        return self._base_url_rate
+
+    def endpoint_rate(self, path: str = "") -> tuple:
+        """
+        接口速率
+        :param path: url path
+        :return: (rate, burst)
+        """
+        rate, burst = self.rates.get(path, (self._rate, self._burst))
+        return rate, burst if burst else max(rate or 0, 1)
+
+    @abc.abstractmethod
+    def reserve_token(self, key: str = "", rate: float = 10.0, burst: float = 10.0) -> float:
+        """
+        预约一个令牌
+        :param key: 桶 key
+        :param rate: 每秒令牌数
+        :param burst: 桶容量
+        :return: 需要等待的秒数
+        """
+
+    def reserve(self, url: str = "") -> float:
+        """
+        为一次请求预约令牌
+        :param url: 请求 url
+        :return: 需要等待的秒数
+        """
+        base_url, endpoint, path = rate_limit_keys(url)
+        delay = 0.0
+        rate, burst = self.endpoint_rate(path)
+        if rate and rate > 0:
+            delay = self.reserve_token(key=endpoint, rate=rate, burst=burst)
+        if self._base_url_rate and self._base_url_rate > 0:
+            delay = max(delay, self.reserve_token(
+                key=base_url,
+                rate=self._base_url_rate,
+                burst=self._base_url_burst or max(self._base_url_rate, 1),
+            ))
+        return delay
+
+    def wait(self, url: str = "") -> float:
+        """
+        等待直到允许请求
+        :param url: 请求 url
+        :return: 等待秒数
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def async_wait(self, url: str = "") -> float:
+        """
+        等待直到允许请求 asyncio
+        :param url: 请求 url
+        :return: 等待秒数
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    进程内令牌桶 线程安全
+    """
+
+    def __init__(
+            self,
+            rate: float = 10.0,
+            burst: float = None,
+            rates: dict = None,
+            base_url_rate: float = None,
+            base_url_burst: float = None,
+    ):
+        super().__init__(rate=rate, burst=burst, rates=rates, base_url_rate=base_url_rate,
+                         base_url_burst=base_url_burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve_token(self, key: str = "", rate: float = 10.0, burst: float = 10.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, ts = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - ts) * rate) - 1
+            self._buckets[key] = (tokens, now)
+        if tokens >= 0:
+            return 0.0
+        return -tokens / rate
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    redis 令牌桶 多进程共享 每次预约一次 EVALSHA
+    """
+
+    def __init__(
+            self,
+            strict_redis: Union[redis.Redis, redis.StrictRedis] = None,
+            rate: float = 10.0,
+            burst: float = None,
+            rates: dict = None,
+            base_url_rate: float = None,
+            base_url_burst: float = None,
+            key_prefix: str = "guolei_py3_wisharetec_rate_limit_",
+    ):
+        """
+        构造函数
+        :param strict_redis: redis.StrictRedis
+        :param key_prefix: redis key 前缀
+        """
+        super().__init__(rate=rate, burst=burst, rates=rates, base_url_rate=base_url_rate,
+                         base_url_burst=base_url_burst)
+        self._strict_redis = strict_redis
+        self._key_prefix = key_prefix
+        self._script = strict_redis.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+
+    @property
+    def strict_redis(self) -> Union[redis.Redis, redis.StrictRedis]:
+        return self._strict_redis
+
+    def reserve_token(self, key: str = "", rate: float = 10.0, burst: float = 10.0) -> float:
+        delay = self._script(keys=[f"{self._key_prefix}{key}"], args=[rate, burst])
+        return float(delay)
+
+
+def rate_limiter(
+        strict_redis: Union[redis.Redis, redis.StrictRedis] = None,
+        rate: float = 10.0,
+        burst: float = None,
+        rates: dict = None,
+        base_url_rate: float = None,
+        base_url_burst: float = None,
+) -> RateLimiter:
+    """
+    生成限流器 strict_redis 为 redis 实例时多进程共享 否则进程内
+    :param strict_redis: redis.StrictRedis
+    :param rate: 每个接口每秒请求数
+    :param burst: 每个接口桶容量
+    :param rates: {path: (rate, burst)} 单独设置的接口
+    :param base_url_rate: 同一 base_url 每秒总请求数
+    :param base_url_burst: 同一 base_url 桶容量
+    :return:
+    """
+    if isinstance(strict_redis, (redis.Redis, redis.StrictRedis)):
+        return RedisRateLimiter(strict_redis=strict_redis, rate=rate, burst=burst, rates=rates,
+                                base_url_rate=base_url_rate, base_url_burst=base_url_burst)
+    return MemoryRateLimiter(rate=rate, burst=burst, rates=rates, base_url_rate=base_url_rate,
+                             base_url_burst=base_url_burst)
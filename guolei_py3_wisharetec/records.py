@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import functools
+import keyword
+from typing import Iterable
+
+
+class Record(object):
+    """
+    __slots__ 行记录基类 由 record_type 按字段生成子类
+
+    字段名为合法标识符时可按属性访问 所有字段均可按 record[key] 访问
+    """
+    __slots__ = ()
+    _keys: tuple = ()
+    _slots: tuple = ()
+    _key_slots: dict = {}
+
+    def __init__(self, row: dict = None):
+        row = row or {}
+        for key, slot in zip(self._keys, self._slots):
+            object.__setattr__(self, slot, row.get(key, None))
+
+    def __getitem__(self, key):
+        if key not in self._key_slots:
+            raise KeyError(key)
+        return getattr(self, self._key_slots[key])
+
+    def __contains__(self, key):
+        return key in self._key_slots
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key, default=None):
+        if key not in self._key_slots:
+            return default
+        return getattr(self, self._key_slots[key])
+
+    def keys(self) -> tuple:
+        return self._keys
+
+    def to_dict(self) -> dict:
+        """
+        转换为 dict
+        :return:
+        """
+        return {key: getattr(self, slot) for key, slot in zip(self._keys, self._slots)}
+
+
+def is_slot_name(key: str = None) -> bool:
+    """
+    字段名能否直接作为 __slots__ 名称 不能时使用 _{index}
+    :param key:
+    :return:
+    """
+    return isinstance(key, str) and key.isidentifier() and not keyword.iskeyword(key) and not key.startswith(
+        "_") and not hasattr(Record, key)
+
+
+@functools.lru_cache(maxsize=None)
+def record_type(name: str = "Record", keys: tuple = ()) -> type:
+    """
+    按字段生成 Record 子类 相同 name keys 复用同一个类
+    :param name: 类名
+    :param keys: 字段名
+    :return:
+    """
+    slots = tuple(
+        key if is_slot_name(key) else f"_{index}"
+        for index, key in enumerate(keys)
+    )
+    class_name = "".join(part.capitalize() for part in str(name).split("_")) or "Record"
+    return type(class_name, (Record,), {
+        "__slots__": slots,
+        "_keys": tuple(keys),
+        "_slots": slots,
+        "_key_slots": dict(zip(keys, slots)),
+    })
+
+
+class RecordFactory(object):
+    """
+    将 dict 行转换为 Record
+
+    字段取自首行 后续行出现新字段时扩展字段生成新的 Record 子类
+    """
+
+    def __init__(self, name: str = "Record"):
+        """
+        构造函数
+        :param name: 记录名称 通常为接口方法名称
+        """
+        self._name = name
+        self._record_type = None
+
+    @property
+    def record_type(self) -> type:
+        """
+        当前 Record 子类
+        :return:
+        """
+        return self._record_type
+
+    def __call__(self, row: dict = None):
+        if not isinstance(row, dict):
+            return row
+        if self._record_type is None or not row.keys() <= self._record_type._key_slots.keys():
+            keys = tuple(self._record_type._keys) if self._record_type is not None else ()
+            known = set(keys)
+            keys += tuple(key for key in row.keys() if key not in known)
+            self._record_type = record_type(self._name, keys)
+        return self._record_type(row)
+
+
+def to_records(rows: Iterable = (), name: str = "Record"):
+    """
+    将 dict 行逐行转换为 Record
+    :param rows:
+    :param name: 记录名称 通常为接口方法名称
+    :return: generator
+    """
+    factory = RecordFactory(name=name)
+    for row in rows:
+        yield factory(row)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import atexit
+import os
+import threading
+import time
+import weakref
+from typing import Callable
+
+# 所有 TokenRefresher 用于 fork 后重置及退出时停止
+_REFRESHERS = weakref.WeakSet()
+
+
+class TokenRefresher(object):
+    """
+    后台 token 刷新线程
+
+    每 interval 秒调用一次 refresh(force_login=False) 距上次重新登录超过 renew_interval 秒时调用 refresh(force_login=True)
+
+    fork 后子进程中的刷新线程不存在 restart_after_fork 为 True 时在子进程中重新启动
+    """
+
+    def __init__(
+            self,
+            refresh: Callable = None,
+            interval: float = 120.0,
+            renew_interval: float = None,
+            restart_after_fork: bool = False,
+            name: str = "TokenRefresher",
+    ):
+        """
+        构造函数
+        :param refresh: refresh(force_login=False) -> bool
+        :param interval: 校验间隔秒数
+        :param renew_interval: 重新登录间隔秒数 None 只在 token 失效时登录
+        :param restart_after_fork: fork 后是否在子进程中重新启动
+        :param name: 线程名称
+        """
+        self._refresh = refresh
+        self._interval = interval
+        self._renew_interval = renew_interval
+        self._restart_after_fork = restart_after_fork
+        self._name = name
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_refreshed_at = None
+        self._last_renewed_at = time.time()
+        self._last_error = None
+        _REFRESHERS.add(self)
+
+    @property
+    def interval(self) -> float:
+        """
+        校验间隔秒数
+        :return:
+        """
+        return self._interval
+
+    @property
+    def renew_interval(self) -> float:
+        """
+        重新登录间隔秒数
+        :return:
+        """
+        return self._renew_interval
+
+    @property
+    def last_refreshed_at(self):
+        """
+        最近一次刷新成功的时间戳 time.time()
+        :return:
+        """
+        return self._last_refreshed_at
+
+    @property
+    def last_error(self):
+        """
+        最近一次刷新失败的异常
+        :return:
+        """
+        return self._last_error
+
+    @property
+    def is_running(self) -> bool:
+        """
+        刷新线程是否运行中
+        :return:
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh_once(self) -> bool:
+        """
+        刷新一次 异常不向外抛出 记录到 last_error
+        :return:
+        """
+        force_login = isinstance(self.renew_interval, (int, float)) and self.renew_interval > 0 and (
+                time.time() - self._last_renewed_at >= self.renew_interval
+        )
+        try:
+            result = self._refresh(force_login=force_login)
+        except Exception as error:
+            self._last_error = error
+            return False
+        if not result:
+            return False
+        self._last_refreshed_at = time.time()
+        if force_login:
+            self._last_renewed_at = self._last_refreshed_at
+        self._last_error = None
+        return True
+
+    def _run(self, stop_event: threading.Event = None):
+        while not stop_event.is_set():
+            self.refresh_once()
+            if stop_event.wait(self.interval):
+                break
+
+    def start(self):
+        """
+        启动刷新线程 已启动时不重复启动
+        :return:
+        """
+        with self._lock:
+            if self.is_running:
+                return self
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._stop_event,),
+                name=self._name,
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        停止刷新线程 等待当前刷新结束
+        :param timeout: 最长等待秒数
+        :return:
+        """
+        with self._lock:
+            thread = self._thread
+            self._stop_event.set()
+            self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        return self
+
+    def _after_fork_in_child(self):
+        # 子进程中只有 fork 调用线程 刷新线程及其持有的锁都需要重建
+        running = self._thread is not None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        if running and self._restart_after_fork:
+            self.start()
+
+
+class AsyncTokenRefresher(TokenRefresher):
+    """
+    后台 token 刷新 asyncio task
+
+    refresh 为 coroutine function 在调用 start 的事件循环中运行
+    """
+
+    def __init__(
+            self,
+            refresh: Callable = None,
+            interval: float = 120.0,
+            renew_interval: float = None,
+            name: str = "AsyncTokenRefresher",
+    ):
+        """
+        构造函数
+        :param refresh: async refresh(force_login=False) -> bool
+        :param interval: 校验间隔秒数
+        :param renew_interval: 重新登录间隔秒数 None 只在 token 失效时登录
+        :param name: task 名称
+        """
+        super().__init__(refresh=refresh, interval=interval, renew_interval=renew_interval, name=name)
+        self._task = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def refresh_once(self) -> bool:
+        force_login = isinstance(self.renew_interval, (int, float)) and self.renew_interval > 0 and (
+                time.time() - self._last_renewed_at >= self.renew_interval
+        )
+        try:
+            result = await self._refresh(force_login=force_login)
+        except Exception as error:
+            self._last_error = error
+            return False
+        if not result:
+            return False
+        self._last_refreshed_at = time.time()
+        if force_login:
+            self._last_renewed_at = self._last_refreshed_at
+        self._last_error = None
+        return True
+
+    async def _run(self, stop_event: threading.Event = None):
+        while not stop_event.is_set():
+            await self.refresh_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """
+        在当前事件循环中启动刷新 task
+        :return:
+        """
+        if self.is_running:
+            return self
+        self._stop_event = threading.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(self._stop_event), name=self._name)
+        return self
+
+    async def stop(self, timeout: float = None):
+        """
+        停止刷新 task
+        :param timeout: 最长等待秒数
+        :return:
+        """
+        task, self._task = self._task, None
+        self._stop_event.set()
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await asyncio.wait_for(task, timeout)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+        return self
+
+    def _after_fork_in_child(self):
+        # 事件循环不跨进程 子进程中不重新启动
+        self._stop_event = threading.Event()
+        self._task = None
+
+
+def _after_fork_in_child():
+    for refresher in list(_REFRESHERS):
+        refresher._after_fork_in_child()
+
+
+def _stop_all():
+    for refresher in list(_REFRESHERS):
+        if not isinstance(refresher, AsyncTokenRefresher):
+            refresher.stop(timeout=1.0)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_stop_all)
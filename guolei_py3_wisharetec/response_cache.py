@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import base64
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Union
+
+import diskcache
+import redis
+
+# 默认缓存的详情接口 key 为 AdminApi 方法名称
+DETAIL_ENDPOINTS = (
+    "query_house",
+    "query_shop",
+    "query_store",
+    "query_shop_product",
+    "query_store_goods",
+    "query_parking_auth",
+)
+
+# 默认 stale-while-revalidate 的基础数据接口 过期后仍返回缓存并在后台刷新
+REFERENCE_ENDPOINTS = (
+    "query_communities",
+    "query_shops",
+    "query_stores",
+    "query_shop_product_categories",
+)
+
+
+# 默认缓存"不存在"结果的详情接口
+NOT_FOUND_ENDPOINTS = (
+    "query_house",
+    "query_parking_auth",
+    "query_device_patrol",
+)
+
+# 为 False 时当前线程或 asyncio 任务中的请求不读写响应缓存 写接口仍使缓存失效
+response_cache_enabled = contextvars.ContextVar("response_cache_enabled", default=True)
+
+
+class ResponseCache(object):
+    """
+    只读接口响应缓存
+
+    进程内 LRU 按接口设置 TTL cache 为 diskcache or redis 时作为二级缓存 多进程共享
+
+    缓存的是 HTTP 200 且 json status 为 100 的响应内容 每次命中都重新经过 requests_response_callable 解析
+
+    stale_ttls 中的接口过期后 stale_ttl 秒内仍返回缓存 同一 key 只由一个调用方在后台刷新
+
+    not_found_ttls 中的接口缓存 AdminApi.is_not_found_json() 识别的"不存在"响应 只保存在进程内 最多 not_found_maxsize 条
+
+    invalidate(name) 使该接口所有缓存失效 通过递增接口版本号实现 使用二级缓存时每次读取多一次版本号查询
+    """
+
+    def __init__(
+            self,
+            ttls: dict = None,
+            ttl: float = 300.0,
+            maxsize: int = 1024,
+            cache: Union[diskcache.Cache, redis.Redis, redis.StrictRedis] = None,
+            key_prefix: str = "guolei_py3_wisharetec_response_cache_",
+            stale_ttls: dict = None,
+            stale_ttl: float = 3600.0,
+            not_found_ttls: dict = None,
+            not_found_ttl: float = 60.0,
+            not_found_maxsize: int = 4096,
+    ):
+        """
+        构造函数
+        :param ttls: {AdminApi 方法名称: 缓存秒数} if None 缓存 DETAIL_ENDPOINTS 及 REFERENCE_ENDPOINTS
+        :param ttl: ttls 为 None 时的缓存秒数
+        :param maxsize: 进程内最多缓存条数
+        :param cache: 二级缓存 diskcache.Cache or redis.StrictRedis None 只使用进程内缓存
+        :param key_prefix: 二级缓存 key 前缀
+        :param stale_ttls: {AdminApi 方法名称: 过期后仍可返回的秒数} if None 使用 REFERENCE_ENDPOINTS
+        :param stale_ttl: stale_ttls 为 None 时过期后仍可返回的秒数
+        :param not_found_ttls: {AdminApi 方法名称: "不存在"结果缓存秒数} if None 使用 NOT_FOUND_ENDPOINTS
+        :param not_found_ttl: not_found_ttls 为 None 时"不存在"结果缓存秒数
+        :param not_found_maxsize: 进程内最多缓存"不存在"结果条数
+        """
+        self._ttls = dict(ttls) if isinstance(ttls, dict) else {
+            name: ttl for name in DETAIL_ENDPOINTS + REFERENCE_ENDPOINTS
+        }
+        self._stale_ttls = dict(stale_ttls) if isinstance(stale_ttls, dict) else {
+            name: stale_ttl for name in REFERENCE_ENDPOINTS
+        }
+        self._not_found_ttls = dict(not_found_ttls) if isinstance(not_found_ttls, dict) else {
+            name: not_found_ttl for name in NOT_FOUND_ENDPOINTS
+        }
+        self._maxsize = max(1, maxsize)
+        self._not_found_maxsize = max(1, not_found_maxsize)
+        self._cache = cache
+        self._key_prefix = key_prefix
+        self._lock = threading.Lock()
+        # {cache_key: (fresh_until, stale_until, entry)} time.time()
+        self._entries = OrderedDict()
+        # {cache_key: (expire_at, entry)} time.time()
+        self._not_found_entries = OrderedDict()
+        self._generations = {}
+        self._revalidating = set()
+        self._hits = 0
+        self._stale_hits = 0
+        self._not_found_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._revalidations = 0
+        self._bytes = 0
+
+    @property
+    def ttls(self) -> dict:
+        """
+        {AdminApi 方法名称: 缓存秒数}
+        :return:
+        """
+        return self._ttls
+
+    @property
+    def stale_ttls(self) -> dict:
+        """
+        {AdminApi 方法名称: 过期后仍可返回的秒数}
+        :return:
+        """
+        return self._stale_ttls
+
+    @property
+    def not_found_ttls(self) -> dict:
+        """
+        {AdminApi 方法名称: "不存在"结果缓存秒数}
+        :return:
+        """
+        return self._not_found_ttls
+
+    @property
+    def cache(self) -> Union[diskcache.Cache, redis.Redis, redis.StrictRedis]:
+        return self._cache
+
+    def cacheable(self, name: str = "") -> bool:
+        """
+        接口是否缓存
+        :param name: AdminApi 方法名称
+        :return:
+        """
+        return self._positive(self._ttls.get(name, None)) or self._positive(self._not_found_ttls.get(name, None))
+
+    @staticmethod
+    def _positive(value: float = None) -> bool:
+        return isinstance(value, (int, float)) and value > 0
+
+    def stale_ttl(self, name: str = "") -> float:
+        """
+        接口过期后仍可返回的秒数
+        :param name: AdminApi 方法名称
+        :return:
+        """
+        stale_ttl = self._stale_ttls.get(name, None)
+        return stale_ttl if isinstance(stale_ttl, (int, float)) and stale_ttl > 0 else 0.0
+
+    def stats(self) -> dict:
+        """
+        命中率及进程内缓存大小
+        :return:
+        """
+        with self._lock:
+            requests_count = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "not_found_hits": self._not_found_hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / requests_count if requests_count else 0.0,
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "bytes": self._bytes,
+                "not_found_size": len(self._not_found_entries),
+                "not_found_maxsize": self._not_found_maxsize,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "revalidations": self._revalidations,
+                "revalidating": len(self._revalidating),
+            }
+
+    def _l2_name(self, key: str = "") -> str:
+        return f"{self._key_prefix}{hashlib.md5(key.encode('utf-8')).hexdigest()}"
+
+    def _generation(self, name: str = "") -> int:
+        if isinstance(self._cache, diskcache.Cache):
+            return int(self._cache.get(f"{self._key_prefix}generation_{name}", 0) or 0)
+        if isinstance(self._cache, (redis.Redis, redis.StrictRedis)):
+            return int(self._cache.get(f"{self._key_prefix}generation_{name}") or 0)
+        return self._generations.get(name, 0)
+
+    def _get_l2(self, key: str = ""):
+        if isinstance(self._cache, diskcache.Cache):
+            return self._cache.get(self._l2_name(key), None)
+        value = self._cache.get(self._l2_name(key))
+        if value is None:
+            return None
+        fresh_until, status_code, content_type, content = json.loads(value)
+        return fresh_until, (status_code, content_type, base64.b64decode(content))
+
+    def _set_l2(self, key: str = "", fresh_until: float = 0.0, entry: tuple = None, expire: float = 0.0):
+        if isinstance(self._cache, diskcache.Cache):
+            self._cache.set(self._l2_name(key), (fresh_until, entry), expire=expire)
+            return
+        status_code, content_type, content = entry
+        self._cache.set(
+            self._l2_name(key),
+            json.dumps([fresh_until, status_code, content_type, base64.b64encode(content).decode("ascii")]),
+            ex=max(1, int(expire)),
+        )
+
+    def _set_l1(self, key: str = "", fresh_until: float = 0.0, stale_until: float = 0.0, entry: tuple = None):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous[2][2])
+        self._entries[key] = (fresh_until, stale_until, entry)
+        self._bytes += len(entry[2])
+        while len(self._entries) > self._maxsize:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted[2])
+            self._evictions += 1
+
+    def cache_key(self, name: str = "", key: str = "") -> str:
+        """
+        带接口版本号的缓存 key 请求前生成 请求期间接口缓存失效时响应不会写入新版本
+        :param name: AdminApi 方法名称
+        :param key: 由 base_url companyCode 请求参数生成
+        :return:
+        """
+        return f"{name}:{self._generation(name)}:{key}"
+
+    def lookup(self, name: str = "", cache_key: str = "") -> tuple:
+        """
+        读取缓存 过期但在 stale_ttl 内时同样返回
+
+        返回 revalidate 为 True 的调用方负责刷新 刷新结束后调用 end_revalidate(cache_key)
+        :param name: AdminApi 方法名称
+        :param cache_key: self.cache_key(name, key)
+        :return: (entry or None, revalidate)
+        """
+        if not self.cacheable(name):
+            return None, False
+        now = time.time()
+        if not self._positive(self._ttls.get(name, None)):
+            with self._lock:
+                return self._lookup_not_found(cache_key, now), False
+        with self._lock:
+            item = self._entries.get(cache_key, None)
+            if item is not None and item[1] <= now:
+                self._bytes -= len(self._entries.pop(cache_key)[2][2])
+                item = None
+        if (item is None or item[0] <= now) and self._cache is not None:
+            # 进程内已过期时 其他进程可能已刷新二级缓存
+            l2_item = self._get_l2(cache_key)
+            if l2_item is not None and (item is None or l2_item[0] > item[0]):
+                fresh_until, entry = l2_item
+                item = (fresh_until, fresh_until + self.stale_ttl(name), entry)
+                with self._lock:
+                    self._set_l1(cache_key, *item)
+        with self._lock:
+            if item is None:
+                return self._lookup_not_found(cache_key, now), False
+            self._entries.move_to_end(cache_key)
+            self._hits += 1
+            if item[0] > now:
+                return item[2], False
+            self._stale_hits += 1
+            if cache_key in self._revalidating:
+                return item[2], False
+            self._revalidating.add(cache_key)
+            self._revalidations += 1
+            return item[2], True
+
+    def _lookup_not_found(self, cache_key: str = "", now: float = 0.0):
+        item = self._not_found_entries.get(cache_key, None)
+        if item is not None and item[0] <= now:
+            del self._not_found_entries[cache_key]
+            item = None
+        if item is None:
+            self._misses += 1
+            return None
+        self._not_found_entries.move_to_end(cache_key)
+        self._hits += 1
+        self._not_found_hits += 1
+        return item[1]
+
+    def end_revalidate(self, cache_key: str = ""):
+        """
+        后台刷新结束
+        :param cache_key:
+        :return:
+        """
+        with self._lock:
+            self._revalidating.discard(cache_key)
+
+    def get(self, name: str = "", cache_key: str = ""):
+        """
+        读取缓存 不触发后台刷新
+        :param name: AdminApi 方法名称
+        :param cache_key: self.cache_key(name, key)
+        :return: (status_code, content_type, content) or None
+        """
+        entry, revalidate = self.lookup(name, cache_key)
+        if revalidate:
+            self.end_revalidate(cache_key)
+        return entry
+
+    def set(self, name: str = "", cache_key: str = "", entry: tuple = None):
+        """
+        写入缓存
+        :param name: AdminApi 方法名称
+        :param cache_key: self.cache_key(name, key)
+        :param entry: (status_code, content_type, content)
+        :return:
+        """
+        if not self._positive(self._ttls.get(name, None)):
+            return
+        fresh_until = time.time() + self._ttls[name]
+        stale_ttl = self.stale_ttl(name)
+        if self._cache is not None:
+            self._set_l2(cache_key, fresh_until, entry, self._ttls[name] + stale_ttl)
+        with self._lock:
+            self._not_found_entries.pop(cache_key, None)
+            self._set_l1(cache_key, fresh_until, fresh_until + stale_ttl, entry)
+
+    def set_not_found(self, name: str = "", cache_key: str = "", entry: tuple = None):
+        """
+        写入"不存在"结果 只保存在进程内
+        :param name: AdminApi 方法名称
+        :param cache_key: self.cache_key(name, key)
+        :param entry: (status_code, content_type, content)
+        :return:
+        """
+        if not self._positive(self._not_found_ttls.get(name, None)):
+            return
+        with self._lock:
+            self._not_found_entries.pop(cache_key, None)
+            self._not_found_entries[cache_key] = (time.time() + self._not_found_ttls[name], entry)
+            while len(self._not_found_entries) > self._not_found_maxsize:
+                self._not_found_entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, name: str = None):
+        """
+        使接口所有缓存失效
+        :param name: AdminApi 方法名称 None 所有接口
+        :return:
+        """
+        names = list({**self._ttls, **self._not_found_ttls}.keys()) if name is None else [name]
+        for name in names:
+            if isinstance(self._cache, diskcache.Cache):
+                self._cache.incr(f"{self._key_prefix}generation_{name}", default=0)
+            if isinstance(self._cache, (redis.Redis, redis.StrictRedis)):
+                self._cache.incr(f"{self._key_prefix}generation_{name}")
+            with self._lock:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                prefix = f"{name}:"
+                for key in [key for key in self._entries.keys() if key.startswith(prefix)]:
+                    self._bytes -= len(self._entries.pop(key)[2][2])
+                for key in [key for key in self._not_found_entries.keys() if key.startswith(prefix)]:
+                    del self._not_found_entries[key]
+                self._invalidations += 1
+
+    def clear(self):
+        """
+        清空进程内缓存
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+            self._not_found_entries.clear()
+            self._bytes = 0
@@ -9,8 +9,13 @@ github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
 =================================================
 """
 import hashlib
+import itertools
 import json
 import pathlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from datetime import timedelta, datetime
 from typing import Union, Iterable, Callable
 
@@ -18,10 +23,52 @@ import redis
 import requests
 from addict import Dict
 from diskcache import Cache
-from guolei_py3_requests import requests_request, RequestsResponseCallable
+from guolei_py3_requests import RequestsResponseCallable
 from requests import Response
 from retrying import retry
 
+from guolei_py3_wisharetec.circuitbreaker import CircuitBreaker
+from guolei_py3_wisharetec.concurrency import AimdConcurrencyLimit, ConcurrencySlot
+from guolei_py3_wisharetec.download import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_MIN_RANGE_SIZE,
+    download,
+    parallel_download,
+)
+from guolei_py3_wisharetec.library.scaasp.admin.api import UrlSetting, is_token_data
+from guolei_py3_wisharetec.ratelimit import RateLimiter, request_url
+from guolei_py3_wisharetec.records import to_records
+from guolei_py3_wisharetec.refresher import TokenRefresher
+from guolei_py3_wisharetec.response_cache import ResponseCache, response_cache_enabled
+from guolei_py3_wisharetec.session import PooledSession
+from guolei_py3_wisharetec.singleflight import SingleFlight, request_key
+from guolei_py3_wisharetec.token_store import TOKEN_DATA_EXPIRE, TokenStore, token_store, token_store_key
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(content: Union[bytes, str] = None):
+    """
+    解析 JSON 安装 orjson 时使用 orjson
+    :param content: response.content
+    :return:
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def json_status_is_100(json_object=None) -> bool:
+    """
+    json_object.status 是否为 100
+    :param json_object:
+    :return:
+    """
+    return isinstance(json_object, dict) and json_object.get("status", None) in (100, "100")
+
 
 class RequestsResponseCallable(RequestsResponseCallable):
 
@@ -29,36 +76,333 @@ class RequestsResponseCallable(RequestsResponseCallable):
     def status_code_200_text_is_str_null(response: Response = None):
         return RequestsResponseCallable.status_code_200_text(response=response).strip() == "null"
 
+    @staticmethod
+    def status_code_200_json_once(response: Response = None):
+        """
+        只解析一次 response.content 不转换为 addict.Dict
+        :param response:
+        :return: json object or None
+        """
+        if response.status_code != 200:
+            return None
+        try:
+            return json_loads(response.content)
+        except ValueError:
+            return None
+
     @staticmethod
     def status_code_200_json_addict_status_100(response: Response = None):
-        json_addict = RequestsResponseCallable.status_code_200_json_addict(response=response)
-        return json_addict.status == 100 or json_addict.status == "100"
+        return json_status_is_100(RequestsResponseCallable.status_code_200_json_once(response=response))
 
     @staticmethod
     def status_code_200_json_addict_status_100_data(response: Response = None):
-        if RequestsResponseCallable.status_code_200_json_addict_status_100(response=response):
-            return RequestsResponseCallable.status_code_200_json_addict(response=response).data
+        json_object = RequestsResponseCallable.status_code_200_json_once(response=response)
+        if json_status_is_100(json_object):
+            return Dict(json_object).data
         return Dict({})
 
     @staticmethod
     def status_code_200_json_addict_status_100_data_result_list(response: Response = None):
-        if RequestsResponseCallable.status_code_200_json_addict_status_100(response=response):
-            return RequestsResponseCallable.status_code_200_json_addict(response=response).data.resultList
+        json_object = RequestsResponseCallable.status_code_200_json_once(response=response)
+        if json_status_is_100(json_object):
+            return Dict(json_object).data.resultList
         return Dict({})
 
+    @staticmethod
+    def status_code_200_json_status_100_data(response: Response = None):
+        """
+        返回 data 不转换为 addict.Dict
+        :param response:
+        :return:
+        """
+        json_object = RequestsResponseCallable.status_code_200_json_once(response=response)
+        if json_status_is_100(json_object):
+            return json_object.get("data", None)
+        return {}
+
+    @staticmethod
+    def status_code_200_json_status_100_data_result_list(response: Response = None):
+        """
+        返回 data.resultList 不转换为 addict.Dict
+        :param response:
+        :return:
+        """
+        data = RequestsResponseCallable.status_code_200_json_status_100_data(response=response)
+        if isinstance(data, dict) and isinstance(data.get("resultList", None), list):
+            return data.get("resultList")
+        return []
+
+
+def page_result_list(result=None) -> list:
+    """
+    从分页查询结果中取出 resultList
+    :param result: data or data.resultList
+    :return:
+    """
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict) and isinstance(result.get("resultList", None), list):
+        return result.get("resultList")
+    return []
+
+
+def page_result_total(result=None, total_keys: Iterable = ("total", "totalCount", "totalRecord", "count")):
+    """
+    从分页查询结果中取出总数
+    :param result: data
+    :param total_keys: 总数字段名称
+    :return: int or None
+    """
+    if not isinstance(result, dict):
+        return None
+    for key in total_keys:
+        value = result.get(key, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+    return None
+
+
+def honoured_page_size(page_size: int = 20, result=None):
+    """
+    根据探测结果判断接口实际支持的 pageSize
+    :param page_size: 请求的 pageSize
+    :param result: data
+    :return: int or None 无法判断时返回 None
+    """
+    rows = page_result_list(result)
+    total = page_result_total(result)
+    if not len(rows):
+        return None
+    if len(rows) >= page_size or (isinstance(total, int) and total <= len(rows)):
+        return page_size
+    if isinstance(total, int) and total > len(rows):
+        return len(rows)
+    return None
+
+
+def page_size_divisor(page_size: int = 20) -> int:
+    """
+    不超过 page_size 一半的最大约数 用于拆分超时的分页请求
+    :param page_size:
+    :return: page_size 为 1 时返回 1
+    """
+    for divisor in range(page_size // 2, 0, -1):
+        if page_size % divisor == 0:
+            return divisor
+    return page_size
+
+
+class Endpoint(object):
+    """
+    接口定义 path method 默认参数 响应解析 写接口使哪些详情接口的响应缓存失效
+    """
+    __slots__ = ("path", "method", "params", "response_callable", "auth", "invalidates")
+
+    def __init__(
+            self,
+            path: str = "",
+            method: str = "GET",
+            params: dict = None,
+            response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
+            auth: bool = True,
+            invalidates: tuple = (),
+    ):
+        """
+        构造函数
+        :param path: UrlSetting 中的路径
+        :param method: 请求方法
+        :param params: 默认 query 参数
+        :param response_callable: 默认响应解析
+        :param auth: 是否携带 Token Companycode 请求头
+        :param invalidates: 请求后失效的响应缓存 ENDPOINTS key
+        """
+        self.path = path
+        self.method = method
+        self.params = params or {}
+        self.response_callable = response_callable
+        self.auth = auth
+        self.invalidates = tuple(invalidates)
+
+    def __repr__(self):
+        return f"Endpoint({self.method} {self.path})"
+
+
+# 接口表 key 为 AdminApi 方法名称
+ENDPOINTS = {
+    "check_login": Endpoint(
+        UrlSetting.QUERY_LOGIN_STATE,
+        "GET",
+        response_callable=RequestsResponseCallable.status_code_200_text_is_str_null,
+    ),
+    "login": Endpoint(UrlSetting.LOGIN, "POST", auth=False),
+    "query_communities": Endpoint(UrlSetting.QUERY_COMMUNITY_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_shops": Endpoint(UrlSetting.QUERY_SHOP_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_shop": Endpoint(UrlSetting.QUERY_SHOP_DETAIL, "GET"),
+    "query_stores": Endpoint(UrlSetting.QUERY_STORE_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_store": Endpoint(UrlSetting.QUERY_STORE_DETAIL, "GET"),
+    "query_shop_products": Endpoint(UrlSetting.QUERY_SHOP_GOODS_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_shop_product": Endpoint(UrlSetting.QUERY_SHOP_GOODS_DETAIL, "GET"),
+    "query_shop_product_store_edits": Endpoint(UrlSetting.QUERY_SHOP_GOODS_PUSH_TO_STORE, "GET"),
+    "save_shop_product_store_edits": Endpoint(
+        UrlSetting.SAVE_SHOP_GOODS_PUSH_TO_STORE,
+        "POST",
+        response_callable=RequestsResponseCallable.status_code_200_json_addict_status_100,
+        invalidates=("query_store_goods",),
+    ),
+    "save_shop_product": Endpoint(
+        UrlSetting.SAVE_SHOP_GOODS,
+        "POST",
+        response_callable=RequestsResponseCallable.status_code_200_json_addict_status_100,
+        invalidates=("query_shop_product",),
+    ),
+    "update_shop_product": Endpoint(UrlSetting.UPDATE_SHOP_GOODS, "PUT", invalidates=("query_shop_product",)),
+    "query_store_goodses": Endpoint(UrlSetting.QUERY_STORE_PRODUCT_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_store_goods": Endpoint(UrlSetting.QUERY_STORE_PRODUCT_DETAIL, "GET"),
+    "update_store_goods": Endpoint(UrlSetting.UPDATE_STORE_PRODUCT, "POST", invalidates=("query_store_goods",)),
+    "update_shop_product_status": Endpoint(
+        UrlSetting.UPDATE_STORE_PRODUCT,
+        "PUT",
+        invalidates=("query_shop_product", "query_store_goods"),
+    ),
+    "update_store_goods_status": Endpoint(
+        UrlSetting.UPDATE_STORE_PRODUCT_STATUS,
+        "PUT",
+        invalidates=("query_store_goods",),
+    ),
+    "query_parking_auth_audits": Endpoint(UrlSetting.QUERY_PARKING_AUTH_AUDIT_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_parking_auth_audit_checks": Endpoint(UrlSetting.QUERY_PARKING_AUTH_AUDIT_CHECK_BY_PAGINATOR, "GET"),
+    "query_parking_auths": Endpoint(UrlSetting.QUERY_PARKING_AUTH_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_parking_auth": Endpoint(UrlSetting.QUERY_PARKING_AUTH_DETAIL, "GET"),
+    "query_house": Endpoint(UrlSetting.QUERY_ROOM_DETAIL, "GET"),
+    "query_business_orders": Endpoint(UrlSetting.QUERY_BUSINESS_ORDER_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "upload_file": Endpoint(UrlSetting.UPLOAD, "POST"),
+    "query_registered_owners": Endpoint(UrlSetting.QUERY_REGISTER_OWNER_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_unregistered_owners": Endpoint(UrlSetting.QUERY_UNREGISTER_OWNER_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_service_orders": Endpoint(UrlSetting.QUERY_WORK_ORDER_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_exports": Endpoint(
+        UrlSetting.QUERY_EXPORT_BY_PAGINATOR,
+        "GET",
+        {"pageSize": 20, "userType": 102, "myExport": 1},
+    ),
+    "business_orders_export_1": Endpoint(UrlSetting.QUERY_BUSINESS_ORDER_EXPORT_1, "GET"),
+    "business_orders_export_2": Endpoint(UrlSetting.QUERY_BUSINESS_ORDER_EXPORT_2, "GET"),
+    "business_orders_export_3": Endpoint(UrlSetting.QUERY_BUSINESS_ORDER_EXPORT_3, "GET"),
+    "houses_export": Endpoint(UrlSetting.QUERY_ROOM_EXPORT, "GET"),
+    "registered_owners_export": Endpoint(UrlSetting.QUERY_REGISTER_OWNER_EXPORT, "GET"),
+    "unregistered_owners_export": Endpoint(UrlSetting.QUERY_UNREGISTER_OWNER_EXPORT, "GET"),
+    "service_orders_export": Endpoint(UrlSetting.QUERY_WORK_ORDER_EXPORT, "GET"),
+    "shop_products_export": Endpoint(UrlSetting.QUERY_SHOP_GOODS_EXPORT, "GET"),
+    "store_goodses_export": Endpoint(UrlSetting.QUERY_STORE_PRODUCT_EXPORT, "GET"),
+    "query_devices": Endpoint(UrlSetting.QUERY_DEVICE_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "query_device_patrol": Endpoint(UrlSetting.QUERY_DEVICE_PATROL_DETAIL, "GET"),
+    "query_enterprise_users": Endpoint(UrlSetting.QUERY_ENTERPRISE_USER_BY_PAGINATOR, "GET", {"pageSize": 20}),
+    "update_device_patrol_info": Endpoint(
+        UrlSetting.SAVE_DEVICE_PATROL,
+        "POST",
+        invalidates=("query_device_patrol",),
+    ),
+    "update_parking_auth_audit_status": Endpoint(
+        UrlSetting.UPDATE_PARKING_AUTH_AUDIT_STATUS,
+        "POST",
+        invalidates=("query_parking_auth",),
+    ),
+    "update_parking_auth": Endpoint(UrlSetting.UPDATE_PARKING_AUTH, "PUT", invalidates=("query_parking_auth",)),
+    "query_shop_product_categories": Endpoint(UrlSetting.QUERY_SHOP_GOODS_CATEGORY_BY_PAGINATOR, "GET"),
+}
+
+# (method, path) -> ENDPOINTS key 用于在请求层识别接口
+ENDPOINT_ROUTES = {(endpoint.method, endpoint.path): name for name, endpoint in ENDPOINTS.items()}
+
+
+def paginated_iterator(query: str = "", title: str = "") -> Callable:
+    """
+    生成 AdminApi.iter_xxx 自动分页迭代方法 调用 self.iter_pages(query)
+    :param query: 分页查询方法名称 ENDPOINTS key
+    :param title: docstring 中的列表名称
+    :return:
+    """
+
+    def iter_method(
+            self,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            prefetch: bool = False,
+            max_workers: int = 1,
+            ordered: bool = True,
+            as_records: bool = False,
+            **kwargs
+    ):
+        return self.iter_pages(
+            query,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_workers=max_workers,
+            ordered=ordered,
+            as_records=as_records,
+            **kwargs
+        )
+
+    iter_method.__name__ = query.replace("query_", "iter_", 1)
+    iter_method.__qualname__ = f"AdminApi.{iter_method.__name__}"
+    iter_method.__doc__ = f"""
+        自动分页迭代{title}
+        :param requests_request_kwargs_params: self.{query}(requests_request_kwargs_params)
+        :param page_size: 每页数量 None 使用 resolve_page_size
+        :param prefetch: 是否在后台预取下一页
+        :param max_workers: >1 时首页返回总数后并发查询其余页
+        :param ordered: 并发查询时 True 按页码顺序返回 False 按完成顺序返回
+        :param as_records: True 时逐行返回 __slots__ Record
+        :param kwargs: self.{query}(**kwargs)
+        :return: generator
+        """
+    return iter_method
+
 
 class AdminApi(object):
     """
     慧享(绿城)科技 智慧社区全域服务平台 Admin API Class
     """
 
+    # 分页请求出现以下异常时缩小 pageSize 重试
+    page_size_shrink_exceptions = (requests.exceptions.Timeout,)
+
+    # 以下 HTTP 状态码视为 token 失效
+    auth_failure_status_codes = (401, 403)
+
+    # 以下 json status 视为"不存在"结果 json status 为 100 且 data 为 null 时同样视为"不存在"
+    not_found_statuses = ()
+
+    # token 失效重新登录后可重放的幂等请求方法
+    replay_methods = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+    # 以下状态码及异常视为服务端过载 自适应并发数收缩 熔断计为失败
+    overload_status_codes = (429,)
+    overload_exceptions = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
     def __init__(
             self,
             base_url: str = "",
             uid: str = "",
             pwd: str = "",
             diskcache: Cache = None,
-            strict_redis: redis.StrictRedis = None
+            strict_redis: redis.StrictRedis = None,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            keep_alive_timeout: float = 60.0,
+            adaptive_page_size: bool = True,
+            max_page_size: int = 1000,
+            token_trust_seconds: float = 300.0,
+            token_store: TokenStore = None,
+            auto_relogin: bool = True,
+            rate_limiter: RateLimiter = None,
+            concurrency_limit: AimdConcurrencyLimit = None,
+            circuit_breaker: CircuitBreaker = None,
+            response_cache: ResponseCache = None,
+            coalesce_requests: bool = False,
     ):
         """
         慧享(绿城)科技 智慧社区全域服务平台 Class 构造函数
@@ -67,6 +411,20 @@ class AdminApi(object):
         :param pwd: 密码
         :param diskcache: diskcache.core.Cache
         :param strict_redis: redis.StrictRedis
+        :param pool_connections: 连接池 缓存的 host 连接池数量
+        :param pool_maxsize: 连接池 每个 host 最大连接数
+        :param pool_block: 连接池耗尽时是否阻塞等待
+        :param keep_alive_timeout: 空闲连接保持秒数
+        :param adaptive_page_size: 自动分页时是否探测并使用接口最大 pageSize
+        :param max_page_size: 探测起始 pageSize
+        :param token_trust_seconds: token 校验通过后多少秒内不再请求 checkSession None or <=0 每次都校验
+        :param token_store: token 存储 if None 按 diskcache or strict_redis 生成 TwoTierTokenStore
+        :param auto_relogin: token 失效时是否自动重新登录并重放幂等请求
+        :param rate_limiter: 令牌桶限流 guolei_py3_wisharetec.ratelimit.rate_limiter() None 不限流
+        :param concurrency_limit: 批量操作自适应并发数 None 使用固定 max_workers
+        :param circuit_breaker: 按接口熔断 None 不熔断
+        :param response_cache: 响应缓存 None 不缓存
+        :param coalesce_requests: 是否合并同一时刻相同的 GET 请求 合并后调用方共享同一结果对象
         """
         self._base_url = base_url
         self._uid = uid
@@ -74,6 +432,28 @@ class AdminApi(object):
         self._token_data = Dict({})
         self._diskcache = diskcache
         self._strict_redis = strict_redis
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._keep_alive_timeout = keep_alive_timeout
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._adaptive_page_size = adaptive_page_size
+        self._max_page_size = max_page_size
+        self._page_sizes = {}
+        self._headers_key = None
+        self._headers = {}
+        self._token_trust_seconds = token_trust_seconds
+        self._token_validated_at = None
+        self._token_validated = None
+        self._token_store = token_store
+        self._auto_relogin = auto_relogin
+        self._token_refresher = None
+        self._rate_limiter = rate_limiter
+        self._concurrency_limit = concurrency_limit
+        self._circuit_breaker = circuit_breaker
+        self._response_cache = response_cache
+        self._single_flight = SingleFlight() if coalesce_requests else None
 
     @property
     def base_url(self):
@@ -142,43 +522,764 @@ class AdminApi(object):
         """
         return self._diskcache
 
-    @diskcache.setter
-    def diskcache(self, value: Cache = None):
+    @diskcache.setter
+    def diskcache(self, value: Cache = None):
+        """
+        diskcache.core.Cache Class Object
+        :param value:
+        :return:
+        """
+        return self._diskcache
+
+    @property
+    def strict_redis(self) -> redis.StrictRedis:
+        """
+        redis.StrictRedis Class Object
+        :return:
+        """
+        return self._strict_redis
+
+    @strict_redis.setter
+    def strict_redis(self, value: redis.StrictRedis = None):
+        """
+        redis.StrictRedis Class Object
+        :param value:
+        :return:
+        """
+        self._strict_redis = value
+
+    @property
+    def adaptive_page_size(self) -> bool:
+        """
+        自动分页时是否探测并使用接口最大 pageSize
+        :return:
+        """
+        return self._adaptive_page_size
+
+    @adaptive_page_size.setter
+    def adaptive_page_size(self, value: bool = True):
+        """
+        自动分页时是否探测并使用接口最大 pageSize
+        :param value:
+        :return:
+        """
+        self._adaptive_page_size = value
+
+    @property
+    def max_page_size(self) -> int:
+        """
+        探测起始 pageSize
+        :return:
+        """
+        return self._max_page_size
+
+    @max_page_size.setter
+    def max_page_size(self, value: int = 1000):
+        """
+        探测起始 pageSize
+        :param value:
+        :return:
+        """
+        self._max_page_size = value
+
+    @property
+    def token_trust_seconds(self) -> float:
+        """
+        token 校验通过后多少秒内不再请求 checkSession
+        :return:
+        """
+        return self._token_trust_seconds
+
+    @token_trust_seconds.setter
+    def token_trust_seconds(self, value: float = 300.0):
+        """
+        token 校验通过后多少秒内不再请求 checkSession
+        :param value:
+        :return:
+        """
+        self._token_trust_seconds = value
+
+    @property
+    def token_validated_at(self):
+        """
+        token 最近一次校验通过的时间戳 time.time()
+        :return:
+        """
+        return self._token_validated_at
+
+    @property
+    def token_trusted(self) -> bool:
+        """
+        token 是否在信任期内
+        :return:
+        """
+        if not self.token_trust_seconds or self.token_trust_seconds <= 0:
+            return False
+        if not isinstance(self._token_validated_at, (int, float)):
+            return False
+        if self._token_validated != Dict(self.token_data).token:
+            return False
+        return time.time() - self._token_validated_at < self.token_trust_seconds
+
+    def trust_token(self, validated_at: float = None):
+        """
+        标记 token 已校验通过
+        :param validated_at: 校验时间戳 if None usage time.time()
+        :return:
+        """
+        self._token_validated_at = validated_at if isinstance(validated_at, (int, float)) else time.time()
+        self._token_validated = Dict(self.token_data).token
+        return self
+
+    def distrust_token(self, delete_cache: bool = True):
+        """
+        取消 token 信任 下次 check_login 重新请求 checkSession
+        :param delete_cache: 是否同时删除缓存中的校验时间戳
+        :return:
+        """
+        if delete_cache and self._token_validated_at is not None:
+            self.token_store.delete(key=self.token_store_key, field="validated_at")
+        self._token_validated_at = None
+        self._token_validated = None
+        return self
+
+    @property
+    def session(self) -> PooledSession:
+        """
+        keep-alive 连接池 Session 所有接口共享
+        :return:
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = PooledSession(
+                        pool_connections=self._pool_connections,
+                        pool_maxsize=self._pool_maxsize,
+                        pool_block=self._pool_block,
+                        keep_alive_timeout=self._keep_alive_timeout,
+                    )
+        return self._session
+
+    def close(self):
+        """
+        停止后台 token 刷新 关闭连接池
+        :return:
+        """
+        if self._token_refresher is not None:
+            self.stop_token_refresher()
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    @property
+    def headers(self) -> dict:
+        """
+        Token Companycode 请求头 token data 变化时重新生成
+        :return:
+        """
+        token_data = self._token_data if isinstance(self._token_data, dict) else {}
+        token = token_data.get("token", None)
+        company_code = token_data.get("companyCode", None)
+        if self._headers_key != (token, company_code):
+            self._headers = {
+                "Token": token if isinstance(token, str) else "",
+                "Companycode": company_code if isinstance(company_code, str) else "",
+            }
+            self._headers_key = (token, company_code)
+        return self._headers
+
+    def build_requests_request_kwargs(
+            self,
+            endpoint: Union[Endpoint, str] = None,
+            params: dict = None,
+            data: dict = None,
+            json: dict = None,
+            files: dict = None,
+            requests_request_kwargs: dict = {}
+    ) -> dict:
+        """
+        按接口表生成 requests_request_kwargs
+
+        headers params data json 与 requests_request_kwargs 中的同名 dict 合并 requests_request_kwargs 优先
+        :param endpoint: Endpoint or ENDPOINTS key
+        :param params: query 参数
+        :param data: form 参数
+        :param json: json 参数
+        :param files: 上传文件
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :return: dict
+        """
+        if isinstance(endpoint, str):
+            endpoint = ENDPOINTS[endpoint]
+        kwargs = {
+            key: value.to_dict() if isinstance(value, Dict) else value
+            for key, value in (requests_request_kwargs or {}).items()
+        }
+        kwargs.setdefault("url", f"{self.base_url}{endpoint.path}")
+        kwargs.setdefault("method", endpoint.method)
+        if endpoint.auth:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers", None) or {})}
+        if endpoint.params or params or kwargs.get("params", None):
+            kwargs["params"] = {**endpoint.params, **(params or {}), **(kwargs.get("params", None) or {})}
+        for key, value in (("data", data), ("json", json)):
+            if value is not None:
+                kwargs[key] = {**value, **(kwargs.get(key, None) or {})}
+        if files is not None and "files" not in kwargs:
+            kwargs["files"] = files
+        return kwargs
+
+    def requests_request(
+            self,
+            requests_response_callable: Callable = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            relogin: bool = True,
+    ):
+        """
+        使用连接池 session 执行请求
+
+        coalesce_requests 时同一时刻相同的 GET 请求只发送一次 调用方共享解析结果
+        :param requests_response_callable: requests_response_callable(response)
+        :param requests_request_args: session.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: session.request(*requests_request_args,**requests_request_kwargs)
+        :param relogin: token 失效时是否重新登录
+        :return: requests_response_callable(response) or response
+        """
+        if isinstance(requests_request_kwargs, Dict):
+            requests_request_kwargs = requests_request_kwargs.to_dict()
+        key = self.coalesce_key(requests_response_callable, requests_request_args, requests_request_kwargs, relogin)
+        if key is None:
+            return self.requests_request_without_coalescing(
+                requests_response_callable, requests_request_args, requests_request_kwargs, relogin
+            )
+        return self._single_flight.do(
+            key,
+            lambda: self.requests_request_without_coalescing(
+                requests_response_callable, requests_request_args, requests_request_kwargs, relogin
+            ),
+        )
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """
+        GET 请求合并 single_flight.stats() 查看合并次数 None 不合并
+        :return:
+        """
+        return self._single_flight
+
+    def coalesce_key(
+            self,
+            requests_response_callable: Callable = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            relogin: bool = True,
+    ) -> tuple:
+        """
+        合并请求 key 只合并没有请求体的 GET 请求
+        :param requests_response_callable:
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :param relogin:
+        :return: key or None 不合并
+        """
+        if not isinstance(self._single_flight, SingleFlight):
+            return None
+        method = requests_request_kwargs.get("method", None)
+        if method is None and len(requests_request_args):
+            method = list(requests_request_args)[0]
+        if not isinstance(method, str) or method.upper() != "GET" or len(list(requests_request_args)) > 2:
+            return None
+        if any(requests_request_kwargs.get(name, None) is not None for name in ("data", "json", "files")):
+            return None
+        return request_key(
+            method=method,
+            url=request_url(requests_request_args, requests_request_kwargs),
+            params=requests_request_kwargs.get("params", None),
+            headers=requests_request_kwargs.get("headers", None),
+            response_callable=requests_response_callable,
+        ) + (relogin,)
+
+    def requests_request_without_coalescing(
+            self,
+            requests_response_callable: Callable = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            relogin: bool = True,
+    ):
+        """
+        使用连接池 session 执行请求
+
+        auto_relogin 时 token 失效后通过缓存登录一次 并重放幂等请求
+        :param requests_response_callable: requests_response_callable(response)
+        :param requests_request_args: session.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: session.request(*requests_request_args,**requests_request_kwargs)
+        :param relogin: token 失效时是否重新登录
+        :return: requests_response_callable(response) or response
+        """
+        response = self.send_request(requests_request_args, requests_request_kwargs)
+        result = requests_response_callable(response) if isinstance(requests_response_callable, Callable) else response
+        if getattr(response, "from_cache", False):
+            return result
+        self.cache_not_found(requests_request_args, requests_request_kwargs, response)
+        if not relogin or not self.auto_relogin or not self.is_authenticated_request(requests_request_kwargs):
+            if response.status_code in self.auth_failure_status_codes:
+                self.distrust_token()
+            return result
+        stale_token = requests_request_kwargs["headers"]["Token"]
+        auth_failure = self.auth_failure(response=response, result=result)
+        if auth_failure is None and stale_token != Dict(self.token_data).token:
+            # 请求期间 token 已被其他调用方更新 使用新 token 重放
+            auth_failure = True
+        if auth_failure is None and self.token_trusted:
+            # 信任期内的 token 非 100 响应为业务结果 不请求 checkSession
+            auth_failure = False
+        elif auth_failure is None:
+            # check_login 确认失效后才删除共享的校验时间戳
+            auth_failure = not self.check_login()
+        if not auth_failure:
+            return result
+        if not self.relogin(stale_token=stale_token):
+            return result
+        if not self.is_replayable(requests_request_args, requests_request_kwargs):
+            return result
+        response = self.send_request(requests_request_args, self.replay_kwargs(requests_request_kwargs))
+        if isinstance(requests_response_callable, Callable):
+            return requests_response_callable(response)
+        return response
+
+    def send_request(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> Response:
+        """
+        发送请求 命中响应缓存时直接返回 过期的 stale-while-revalidate 缓存同样直接返回并在后台刷新
+        :param requests_request_args: session.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: session.request(*requests_request_args,**requests_request_kwargs)
+        :return:
+        """
+        endpoint_name, cache_key = self.response_cache_key(requests_request_args, requests_request_kwargs)
+        if cache_key is not None:
+            entry, revalidate = self._response_cache.lookup(endpoint_name, cache_key)
+            if revalidate:
+                self.revalidate_response(endpoint_name, cache_key, requests_request_args, requests_request_kwargs)
+            if entry is not None:
+                return self.response_from_cache(entry, requests_request_kwargs)
+        return self.send_request_without_cache(
+            requests_request_args,
+            requests_request_kwargs,
+            endpoint_name=endpoint_name,
+            cache_key=cache_key,
+        )
+
+    def send_request_without_cache(
+            self,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            endpoint_name: str = None,
+            cache_key: str = None,
+    ) -> Response:
+        """
+        熔断检查及限流后发送请求 并将耗时及结果记录到 concurrency_limit 及 circuit_breaker 及响应缓存
+
+        接口熔断中时抛出 CircuitOpenError 不发送请求
+        :param requests_request_args: session.request(*requests_request_args,**requests_request_kwargs)
+        :param requests_request_kwargs: session.request(*requests_request_args,**requests_request_kwargs)
+        :param endpoint_name: ENDPOINTS key
+        :param cache_key: self.response_cache_key()[1]
+        :return:
+        """
+        url = request_url(requests_request_args, requests_request_kwargs)
+        if isinstance(self._circuit_breaker, CircuitBreaker):
+            self._circuit_breaker.before_request(url)
+        self.wait_rate_limit(requests_request_args, requests_request_kwargs)
+        started_at = time.monotonic()
+        try:
+            response = self.session.request(*requests_request_args, **requests_request_kwargs)
+        except BaseException as error:
+            self.observe_response(response=None, latency=time.monotonic() - started_at, url=url, error=error)
+            raise
+        self.observe_response(response=response, latency=time.monotonic() - started_at, url=url)
+        self.cache_response(endpoint_name, cache_key, response)
+        return response
+
+    def revalidate_response(
+            self,
+            endpoint_name: str = None,
+            cache_key: str = None,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+    ):
+        """
+        在后台线程中使用当前 token 刷新过期的响应缓存 失败时保留旧缓存
+        :param endpoint_name: ENDPOINTS key
+        :param cache_key: self.response_cache_key()[1]
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :return:
+        """
+
+        def _revalidate():
+            try:
+                self.send_request_without_cache(
+                    requests_request_args,
+                    self.replay_kwargs(requests_request_kwargs),
+                    endpoint_name=endpoint_name,
+                    cache_key=cache_key,
+                )
+            except Exception:
+                pass
+            finally:
+                self._response_cache.end_revalidate(cache_key)
+
+        threading.Thread(target=_revalidate, name="ResponseCacheRevalidate", daemon=True).start()
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """
+        响应缓存 response_cache.stats() 查看命中率及大小
+        :return:
+        """
+        return self._response_cache
+
+    @response_cache.setter
+    def response_cache(self, value: ResponseCache = None):
+        """
+        详情接口响应缓存
+        :param value:
+        :return:
+        """
+        self._response_cache = value
+
+    def endpoint_name(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> str:
+        """
+        按 method 及 url 识别 ENDPOINTS key
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :return: ENDPOINTS key or None
+        """
+        url = request_url(requests_request_args, requests_request_kwargs)
+        if not isinstance(url, str) or not url.startswith(self.base_url):
+            return None
+        method = requests_request_kwargs.get("method", None)
+        if method is None and len(requests_request_args):
+            method = list(requests_request_args)[0]
+        return ENDPOINT_ROUTES.get((str(method).upper(), url[len(self.base_url):]), None)
+
+    def response_cache_key(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> tuple:
+        """
+        响应缓存 key 由 base_url Companycode 请求参数生成 不包含 Token
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :return: (ENDPOINTS key, cache key) 不缓存时 cache key 为 None
+        """
+        if not isinstance(self._response_cache, ResponseCache):
+            return None, None
+        endpoint_name = self.endpoint_name(requests_request_args, requests_request_kwargs)
+        if endpoint_name is None or not response_cache_enabled.get() or not self._response_cache.cacheable(
+                endpoint_name):
+            return endpoint_name, None
+        key = json.dumps(
+            [
+                self.base_url,
+                (requests_request_kwargs.get("headers", None) or {}).get("Companycode", ""),
+                requests_request_kwargs.get("params", None) or {},
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return endpoint_name, self._response_cache.cache_key(endpoint_name, key)
+
+    def cache_response(self, endpoint_name: str = None, cache_key: str = None, response: Response = None):
+        """
+        缓存 HTTP 200 且 json status 为 100 的响应 写接口请求后使 Endpoint.invalidates 中的缓存失效
+        :param endpoint_name: ENDPOINTS key
+        :param cache_key: self.response_cache_key()[1]
+        :param response: response
+        :return:
+        """
+        if not isinstance(self._response_cache, ResponseCache) or endpoint_name is None:
+            return
+        for name in ENDPOINTS[endpoint_name].invalidates:
+            self._response_cache.invalidate(name)
+        if cache_key is None or response.status_code != 200:
+            return
+        json_object = RequestsResponseCallable.status_code_200_json_once(response=response)
+        if not json_status_is_100(json_object) or self.is_not_found_json(json_object):
+            return
+        self._response_cache.set(
+            endpoint_name,
+            cache_key,
+            (response.status_code, response.headers.get("Content-Type", ""), response.content),
+        )
+
+    def cache_not_found(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {},
+                        response: Response = None):
+        """
+        缓存 is_not_found_json() 识别的"不存在"结果 其他非 100 响应如限流 系统繁忙不缓存
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :param response: response
+        :return:
+        """
+        endpoint_name, cache_key = self.response_cache_key(requests_request_args, requests_request_kwargs)
+        if cache_key is None or response.status_code != 200:
+            return
+        if not self.is_not_found_json(RequestsResponseCallable.status_code_200_json_once(response=response)):
+            return
+        self._response_cache.set_not_found(
+            endpoint_name,
+            cache_key,
+            (response.status_code, response.headers.get("Content-Type", ""), response.content),
+        )
+
+    def response_from_cache(self, entry: tuple = None, requests_request_kwargs: dict = {}) -> Response:
+        """
+        由缓存生成 response response.from_cache 为 True
+        :param entry: (status_code, content_type, content)
+        :param requests_request_kwargs:
+        :return:
+        """
+        status_code, content_type, content = entry
+        response = Response()
+        response.status_code = status_code
+        response.headers["Content-Type"] = content_type
+        response._content = content
+        response.encoding = "utf-8"
+        response.url = requests_request_kwargs.get("url", "")
+        response.from_cache = True
+        return response
+
+    def is_overloaded_response(self, response: Response = None) -> bool:
+        """
+        是否为服务端过载响应 None 为超时或连接失败
+        :param response:
+        :return:
+        """
+        return response is None or response.status_code >= 500 or response.status_code in self.overload_status_codes
+
+    def observe_response(self, response: Response = None, latency: float = None, url: str = "",
+                         error: Exception = None):
+        """
+        记录请求结果到 concurrency_limit 及 circuit_breaker
+
+        只有 concurrency_slot() 内的请求计入 concurrency_limit 单次调用不影响批量操作的并发数
+        :param response: response None 为请求异常
+        :param latency: 请求耗时秒数
+        :param url: 请求 url
+        :param error: 请求异常 非 overload_exceptions 时不计入结果
+        :return:
+        """
+        if error is not None and not isinstance(error, self.overload_exceptions):
+            if isinstance(self._circuit_breaker, CircuitBreaker):
+                self._circuit_breaker.on_result(url, failed=None)
+            return
+        overloaded = self.is_overloaded_response(response)
+        if isinstance(self._circuit_breaker, CircuitBreaker):
+            self._circuit_breaker.on_result(url, failed=overloaded)
+        if isinstance(self._concurrency_limit, AimdConcurrencyLimit) and self._concurrency_limit.holds_slot():
+            self._concurrency_limit.on_response(
+                latency=latency,
+                overloaded=overloaded,
+                failed=response is not None and response.status_code >= 400,
+            )
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """
+        按接口熔断 circuit_breaker.states() 查看各接口状态
+        :return:
+        """
+        return self._circuit_breaker
+
+    @circuit_breaker.setter
+    def circuit_breaker(self, value: CircuitBreaker = None):
+        """
+        按接口熔断
+        :param value:
+        :return:
+        """
+        self._circuit_breaker = value
+
+    @property
+    def concurrency_limit(self) -> AimdConcurrencyLimit:
+        """
+        批量操作自适应并发数 concurrency_limit.stats() 查看当前并发数及延迟
+        :return:
+        """
+        return self._concurrency_limit
+
+    @concurrency_limit.setter
+    def concurrency_limit(self, value: AimdConcurrencyLimit = None):
+        """
+        批量操作自适应并发数
+        :param value:
+        :return:
+        """
+        self._concurrency_limit = value
+
+    def concurrency_slot(self) -> ConcurrencySlot:
+        """
+        批量操作并发槽 with self.concurrency_slot(): 未设置 concurrency_limit 时不限制
+        :return:
+        """
+        if isinstance(self._concurrency_limit, AimdConcurrencyLimit):
+            return self._concurrency_limit.slot()
+        return ConcurrencySlot()
+
+    def bulk_workers(self, max_workers: int = 4) -> int:
+        """
+        批量操作线程数 设置 concurrency_limit 时为 concurrency_limit.max_limit
+        :param max_workers:
+        :return:
+        """
+        if isinstance(self._concurrency_limit, AimdConcurrencyLimit):
+            return self._concurrency_limit.max_limit
+        return max(1, max_workers)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """
+        令牌桶限流
+        :return:
+        """
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, value: RateLimiter = None):
+        """
+        令牌桶限流
+        :param value:
+        :return:
+        """
+        self._rate_limiter = value
+
+    def wait_rate_limit(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> float:
+        """
+        按 base_url 及接口限流 等待直到允许请求
+        :param requests_request_args:
+        :param requests_request_kwargs:
+        :return: 等待秒数
+        """
+        if not isinstance(self._rate_limiter, RateLimiter):
+            return 0.0
+        return self._rate_limiter.wait(request_url(requests_request_args, requests_request_kwargs))
+
+    @property
+    def auto_relogin(self) -> bool:
+        """
+        token 失效时是否自动重新登录并重放幂等请求
+        :return:
+        """
+        return self._auto_relogin
+
+    @auto_relogin.setter
+    def auto_relogin(self, value: bool = True):
+        """
+        token 失效时是否自动重新登录并重放幂等请求
+        :param value:
+        :return:
+        """
+        self._auto_relogin = value
+
+    def is_authenticated_request(self, requests_request_kwargs: dict = {}) -> bool:
+        """
+        请求是否携带 Token
+        :param requests_request_kwargs:
+        :return:
+        """
+        headers = requests_request_kwargs.get("headers", None)
+        return isinstance(headers, dict) and bool(headers.get("Token", None))
+
+    def auth_failure(self, response: Response = None, result=None):
+        """
+        判断 token 是否失效
+
+        HTTP 或 json status 为 401 403 时失效 响应解析结果非空为未失效 其他 json status 非 100 时需要 check_login 确认
+        :param response: response
+        :param result: requests_response_callable(response)
+        :return: True 失效 False 未失效 None 需要 check_login 确认
+        """
+        if response.status_code in self.auth_failure_status_codes:
+            return True
+        if response.status_code != 200:
+            return False
+        if result is not response and result:
+            return False
+        try:
+            json_object = json_loads(response.content)
+        except ValueError:
+            return False
+        if not isinstance(json_object, dict) or json_status_is_100(json_object):
+            return False
+        if str(json_object.get("status", "")) in [str(code) for code in self.auth_failure_status_codes]:
+            return True
+        if self.is_not_found_json(json_object):
+            return False
+        return None
+
+    def is_not_found_json(self, json_object=None) -> bool:
         """
-        diskcache.core.Cache Class Object
-        :param value:
+        是否为"不存在"结果 json status 为 100 且 data 为 null 或 json status 在 not_found_statuses 中
+        :param json_object:
         :return:
         """
-        return self._diskcache
-
-    @property
-    def strict_redis(self) -> redis.StrictRedis:
-        """
-        redis.StrictRedis Class Object
+        if not isinstance(json_object, dict):
+            return False
+        if json_status_is_100(json_object):
+            return "data" in json_object and json_object["data"] is None
+        return str(json_object.get("status", "")) in [str(status) for status in self.not_found_statuses]
+
+    def relogin(self, stale_token: str = None) -> bool:
+        """
+        token 失效后通过缓存登录 同时失效的调用方只有一个请求登录
+        :param stale_token: 失效请求使用的 token if None usage self.token_data.token
+        :return: 是否取得新 token
+        """
+        if stale_token is None:
+            stale_token = Dict(self.token_data).token
+        token = Dict(self.token_data).token
+        if isinstance(token, str) and len(token) and token != stale_token:
+            # 其他调用方已重新登录
+            return True
+        self.distrust_token()
+        self.login_with_token_store()
+        token = Dict(self.token_data).token
+        return isinstance(token, str) and len(token) > 0 and token != stale_token
+
+    def is_replayable(self, requests_request_args: Iterable = (), requests_request_kwargs: dict = {}) -> bool:
+        """
+        请求是否幂等 可在重新登录后重放
+        :param requests_request_args:
+        :param requests_request_kwargs:
         :return:
         """
-        return self._strict_redis
+        method = requests_request_kwargs.get("method", None)
+        if method is None and len(requests_request_args):
+            method = list(requests_request_args)[0]
+        return isinstance(method, str) and method.upper() in self.replay_methods
 
-    @strict_redis.setter
-    def strict_redis(self, value: redis.StrictRedis = None):
+    def replay_kwargs(self, requests_request_kwargs: dict = {}) -> dict:
         """
-        redis.StrictRedis Class Object
-        :param value:
+        使用新 token 请求头生成重放参数
+        :param requests_request_kwargs:
         :return:
         """
-        self._strict_redis = value
+        return {
+            **requests_request_kwargs,
+            "headers": {**(requests_request_kwargs.get("headers", None) or {}), **self.headers},
+        }
 
     def check_login(
             self,
             requests_response_callable: Callable = RequestsResponseCallable.status_code_200_text_is_str_null,
             requests_request_args: Iterable = (),
-            requests_request_kwargs: dict = {}
+            requests_request_kwargs: dict = {},
+            skip_if_trusted: bool = True,
     ) -> bool:
         """
         检测登录
         :param requests_response_callable: RequestsResponseCallable.status_code_200_text_is_str_null
         :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param skip_if_trusted: 信任期内是否直接返回 True False 时总是请求 checkSession 校验期间其他调用方仍信任 token
         :return:
         """
         if not isinstance(self.token_data, dict):
@@ -189,21 +1290,21 @@ class AdminApi(object):
             return False
         if not len(Dict(self.token_data).token):
             return False
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict({
-            "url": f"{self.base_url}/old/serverUserAction!checkSession.action",
-            "method": "GET",
-            "headers": {
-                "Token": Dict(self.token_data).token,
-                "Companycode": Dict(self.token_data).companyCode,
-            },
-            **requests_request_kwargs,
-        })
-        return requests_request(
+        if skip_if_trusted and self.token_trusted:
+            return True
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="check_login",
+            requests_request_kwargs=requests_request_kwargs,
+        )
+        result = self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            relogin=False,
         )
+        if isinstance(result, bool):
+            self.trust_token() if result else self.distrust_token()
+        return result
 
     def login(
             self,
@@ -218,51 +1319,227 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict({
-            "url": f"{self.base_url}/manage/login",
-            "method": "POST",
-            "data": {
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="login",
+            data={
                 "username": self.uid,
                 "password": hashlib.md5(self.pwd.encode("utf-8")).hexdigest(),
                 "mode": "PASSWORD",
             },
-            **requests_request_kwargs,
-        })
-        self._token_data = requests_request(
+            requests_request_kwargs=requests_request_kwargs,
+        )
+        token_data = self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            relogin=False,
         )
-        if not len(self.token_data.keys()):
+        if not is_token_data(token_data):
+            # 登录失败时保留原 token 原 token 是否有效由 check_login 判断
             return False
+        self._token_data = token_data
+        self.trust_token()
         return True
 
-    def login_with_strict_redis(self, strict_redis: redis.StrictRedis = None):
+    def token_data_cache_key(self, cache_type: str = "diskcache") -> str:
         """
-        使用redis.StrictRedis登录
-        :param strict_redis: redis.StrictRedis if None usage self.strict_redis
+        token data 缓存key
+        :param cache_type: diskcache or redis
         :return:
         """
-        # 缓存key
-        cache_key = "_".join([
+        return "_".join([
             f"guolei_py3_wisharetec",
             f"scaasp",
             f"AdminApi",
-            f"redis",
+            f"{cache_type}",
             f"token_data",
             f"{hashlib.md5(self.base_url.encode('utf-8')).hexdigest()}",
             f"{self.uid}",
         ])
+
+    @property
+    def token_store_key(self) -> tuple:
+        """
+        token store key
+        :return: (base_url, uid)
+        """
+        return token_store_key(base_url=self.base_url, uid=self.uid)
+
+    @property
+    def token_store(self) -> TokenStore:
+        """
+        token 存储 进程内一级缓存 + diskcache or redis 二级缓存
+        :return:
+        """
+        if isinstance(self._token_store, TokenStore):
+            return self._token_store
+        if isinstance(self.diskcache, Cache):
+            return token_store(self.diskcache)
+        return token_store(self.strict_redis)
+
+    @token_store.setter
+    def token_store(self, value: TokenStore = None):
+        """
+        token 存储
+        :param value:
+        :return:
+        """
+        self._token_store = value
+
+    def load_token_from_store(self, token_store: TokenStore = None, refresh: bool = False, keep_token: bool = False):
+        """
+        从 token 存储读取 token data 及校验时间戳
+        :param token_store: TokenStore if None usage self.token_store
+        :param refresh: 是否跳过进程内一级缓存
+        :param keep_token: token 存储中没有 token 时是否保留当前 token
+        :return:
+        """
+        if not isinstance(token_store, TokenStore):
+            token_store = self.token_store
+        token_data = token_store.get(key=self.token_store_key, refresh=refresh)
+        if is_token_data(token_data) or not keep_token:
+            self._token_data = Dict(token_data or {})
+        validated_at = token_store.get(key=self.token_store_key, field="validated_at", refresh=refresh)
+        if not self.token_trusted and isinstance(validated_at, (int, float)):
+            self.trust_token(validated_at)
+        return self
+
+    def save_token_to_store(self, token_store: TokenStore = None):
+        """
+        写入 token data 及校验时间戳 校验时间戳在信任期结束后自动过期
+        :param token_store: TokenStore if None usage self.token_store
+        :return:
+        """
+        if not isinstance(token_store, TokenStore):
+            token_store = self.token_store
+        if len(Dict(self.token_data).keys()):
+            token_store.set(key=self.token_store_key, value=Dict(self.token_data).to_dict(), expire=TOKEN_DATA_EXPIRE)
+        if self.token_trusted:
+            token_store.set(key=self.token_store_key, value=self.token_validated_at,
+                            expire=self.token_trust_seconds, field="validated_at")
+        return self
+
+    def login_with_token_store(self, token_store: TokenStore = None):
+        """
+        使用 token 存储登录
+
+        token 失效时在 token_store.lock 内登录 同一 (base_url, uid) 只有一个线程或进程请求登录 其他调用方等待后复用新 token
+        :param token_store: TokenStore if None usage self.token_store
+        :return:
+        """
+        if not isinstance(token_store, TokenStore):
+            token_store = self.token_store
+        self.load_token_from_store(token_store=token_store)
+        if self.token_trusted:
+            return self
+        if self.check_login():
+            return self.save_token_to_store(token_store=token_store)
+        stale_token = Dict(self.token_data).token
+        with token_store.lock(key=self.token_store_key):
+            # 等待期间其他调用方可能已登录
+            self.load_token_from_store(token_store=token_store, refresh=True)
+            if self.token_trusted:
+                return self
+            if Dict(self.token_data).token == stale_token or not self.check_login():
+                self.login()
+            return self.save_token_to_store(token_store=token_store)
+
+    def refresh_token(self, force_login: bool = False) -> bool:
+        """
+        重新校验 token 失效或 force_login 时登录 结果写入 token 存储
+
+        校验期间不取消 token 信任 请求线程继续使用当前 token 登录失败时保留当前 token 及 token 存储
+        :param force_login: 是否直接重新登录
+        :return: 是否持有有效 token
+        """
+        token_store = self.token_store
+        self.load_token_from_store(token_store=token_store, refresh=True, keep_token=True)
+        if not force_login and self.check_login(skip_if_trusted=False):
+            self.save_token_to_store(token_store=token_store)
+            return True
+        stale_token = Dict(self.token_data).token
+        with token_store.lock(key=self.token_store_key):
+            # 等待期间 包括等待超时 其他调用方可能已登录 先读取 token 存储
+            self.load_token_from_store(token_store=token_store, refresh=True, keep_token=True)
+            if Dict(self.token_data).token != stale_token and (self.token_trusted or self.check_login()):
+                self.save_token_to_store(token_store=token_store)
+                return True
+            if not self.login():
+                return False
+            self.save_token_to_store(token_store=token_store)
+        return True
+
+    @property
+    def token_refresher(self) -> TokenRefresher:
+        """
+        后台 token 刷新 未启动时为 None
+        :return:
+        """
+        return self._token_refresher
+
+    @property
+    def last_refreshed_at(self):
+        """
+        后台 token 最近一次刷新成功的时间戳 time.time()
+        :return:
+        """
+        if self._token_refresher is None:
+            return None
+        return self._token_refresher.last_refreshed_at
+
+    def token_refresher_interval(self, interval: float = None) -> float:
+        """
+        后台 token 刷新间隔秒数 默认为信任期的一半 使 token 始终在信任期内
+        :param interval:
+        :return:
+        """
+        if isinstance(interval, (int, float)) and interval > 0:
+            return interval
+        if isinstance(self.token_trust_seconds, (int, float)) and self.token_trust_seconds > 0:
+            return self.token_trust_seconds / 2
+        return 120.0
+
+    def start_token_refresher(
+            self,
+            interval: float = None,
+            renew_interval: float = None,
+            restart_after_fork: bool = False,
+    ) -> TokenRefresher:
+        """
+        启动后台 token 刷新线程
+        :param interval: 校验间隔秒数 if None usage token_trust_seconds / 2
+        :param renew_interval: 重新登录间隔秒数 None 只在 token 失效时登录
+        :param restart_after_fork: fork 后是否在子进程中重新启动
+        :return:
+        """
+        if self._token_refresher is None:
+            self._token_refresher = TokenRefresher(
+                refresh=self.refresh_token,
+                interval=self.token_refresher_interval(interval),
+                renew_interval=renew_interval,
+                restart_after_fork=restart_after_fork,
+            )
+        return self._token_refresher.start()
+
+    def stop_token_refresher(self, timeout: float = None):
+        """
+        停止后台 token 刷新线程
+        :param timeout: 最长等待秒数
+        :return:
+        """
+        if self._token_refresher is not None:
+            self._token_refresher.stop(timeout=timeout)
+        return self
+
+    def login_with_strict_redis(self, strict_redis: redis.StrictRedis = None):
+        """
+        使用redis.StrictRedis登录
+        :param strict_redis: redis.StrictRedis if None usage self.strict_redis
+        :return:
+        """
         if strict_redis is None or not isinstance(strict_redis, redis.StrictRedis):
             strict_redis = self.strict_redis
-        if isinstance(strict_redis, redis.StrictRedis):
-            self._token_data = Dict(json.loads(strict_redis.get(cache_key)))
-        if not self.check_login():
-            if self.login():
-                if isinstance(strict_redis, redis.StrictRedis):
-                    strict_redis.setex(name=cache_key, value=json.dumps(self.token_data), time=timedelta(days=90))
-        return self
+        return self.login_with_token_store(token_store=token_store(strict_redis))
 
     def login_with_diskcache(self, diskcache: Cache = None):
         """
@@ -270,25 +1547,9 @@ class AdminApi(object):
         :param cache: diskcache.core.Cache if None usage self.diskcache
         :return:
         """
-        # 缓存key
-        cache_key = "_".join([
-            f"guolei_py3_wisharetec",
-            f"scaasp",
-            f"AdminApi",
-            f"diskcache",
-            f"token_data",
-            f"{hashlib.md5(self.base_url.encode('utf-8')).hexdigest()}",
-            f"{self.uid}",
-        ])
         if diskcache is None or not isinstance(diskcache, Cache):
             diskcache = self.diskcache
-        if isinstance(diskcache, Cache):
-            self._token_data = diskcache.get(key=cache_key, default={})
-        if not self.check_login():
-            if self.login():
-                if isinstance(diskcache, Cache):
-                    diskcache.set(key=cache_key, value=self.token_data, expire=timedelta(days=90).total_seconds())
-        return self
+        return self.login_with_token_store(token_store=token_store(diskcache))
 
     def login_with_cache(self, cache_type: str = "diskcache", cache: Union[Cache, redis.StrictRedis] = None):
         """
@@ -312,6 +1573,508 @@ class AdminApi(object):
         self.login()
         return self
 
+    def page_size_cache_key(self, method_name: str = "") -> str:
+        """
+        接口最大 pageSize 缓存key
+        :param method_name: 分页查询方法名称
+        :return:
+        """
+        return "_".join([
+            f"guolei_py3_wisharetec",
+            f"scaasp",
+            f"AdminApi",
+            f"page_size",
+            f"{hashlib.md5(self.base_url.encode('utf-8')).hexdigest()}",
+            f"{method_name}",
+        ])
+
+    def get_page_size(self, method: Union[Callable, str] = None):
+        """
+        获取已发现的接口最大 pageSize 优先内存 其次 diskcache or strict_redis
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :return: int or None
+        """
+        method_name = method if isinstance(method, str) else method.__name__
+        if method_name in self._page_sizes:
+            return self._page_sizes[method_name]
+        cache_key = self.page_size_cache_key(method_name=method_name)
+        page_size = None
+        if isinstance(self.diskcache, Cache):
+            page_size = self.diskcache.get(key=cache_key, default=None)
+        elif isinstance(self.strict_redis, redis.StrictRedis):
+            page_size = self.strict_redis.get(cache_key)
+        if page_size is None or int(page_size) <= 0:
+            return None
+        self._page_sizes[method_name] = int(page_size)
+        return int(page_size)
+
+    def put_page_size(self, method: Union[Callable, str] = None, page_size: int = 20):
+        """
+        记录接口最大 pageSize 到内存 and diskcache or strict_redis
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param page_size: 最大 pageSize
+        :return:
+        """
+        method_name = method if isinstance(method, str) else method.__name__
+        self._page_sizes[method_name] = page_size
+        cache_key = self.page_size_cache_key(method_name=method_name)
+        if isinstance(self.diskcache, Cache):
+            self.diskcache.set(key=cache_key, value=page_size, expire=timedelta(days=7).total_seconds())
+        elif isinstance(self.strict_redis, redis.StrictRedis):
+            self.strict_redis.setex(name=cache_key, value=page_size, time=timedelta(days=7))
+        return page_size
+
+    def discover_page_size(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            max_page_size: int = None,
+            min_page_size: int = 20,
+            method_kwargs: dict = {},
+    ) -> int:
+        """
+        探测接口实际支持的最大 pageSize 并缓存
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param max_page_size: 探测起始 pageSize None 使用 self.max_page_size
+        :param min_page_size: 最小 pageSize
+        :param method_kwargs: method(**method_kwargs)
+        :return:
+        """
+        page_size, _ = self.probe_page_size(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            max_page_size=max_page_size,
+            min_page_size=min_page_size,
+            method_kwargs=method_kwargs,
+        )
+        return page_size
+
+    def probe_page_size(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            max_page_size: int = None,
+            min_page_size: int = 20,
+            method_kwargs: dict = {},
+    ):
+        """
+        探测接口实际支持的最大 pageSize 并缓存 探测到的首页供分页复用
+
+        以 max_page_size 查询首页 超时减半重试 返回行数小于请求数且小于总数时 以返回行数为准
+        无法判断时缓存实际请求的 pageSize 避免每次分页重复探测
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param max_page_size: 探测起始 pageSize None 使用 self.max_page_size
+        :param min_page_size: 最小 pageSize
+        :param method_kwargs: method(**method_kwargs)
+        :return: (pageSize, 首页 (resultList, 总数 or None, pageSize) 已缓存 pageSize 时为 None)
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        page_size = self.get_page_size(method)
+        if page_size:
+            return page_size, None
+        page_size = max_page_size or self.max_page_size
+        while True:
+            try:
+                result = method(
+                    requests_request_kwargs_params={**Dict(requests_request_kwargs_params), "pageSize": page_size,
+                                                    "curPage": 1},
+                    **method_kwargs
+                )
+                break
+            except self.page_size_shrink_exceptions:
+                if page_size // 2 < min_page_size:
+                    raise
+                page_size //= 2
+        page_size = honoured_page_size(page_size=page_size, result=result) or page_size
+        return self.put_page_size(method, page_size), (page_result_list(result), page_result_total(result), page_size)
+
+    def resolve_page_size(
+            self,
+            method: Callable = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            method_kwargs: dict = {},
+    ) -> int:
+        """
+        确定分页 pageSize
+
+        requests_request_kwargs_params.pageSize > page_size > 已发现的最大 pageSize > 20
+        :param method: 分页查询方法
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量
+        :param method_kwargs: method(**method_kwargs)
+        :return:
+        """
+        page_size, _ = self.resolve_first_page(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            method_kwargs=method_kwargs,
+        )
+        return page_size
+
+    def resolve_first_page(
+            self,
+            method: Callable = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            cur_page: int = 1,
+            method_kwargs: dict = {},
+    ):
+        """
+        确定分页 pageSize 起始页为首页时复用探测 pageSize 时查询到的首页
+        :param method: 分页查询方法
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量
+        :param cur_page: 起始页码
+        :param method_kwargs: method(**method_kwargs)
+        :return: (pageSize, 首页 (resultList, 总数 or None, pageSize) or None)
+        """
+        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+        if str(requests_request_kwargs_params.pageSize).isdigit() and int(requests_request_kwargs_params.pageSize):
+            return int(requests_request_kwargs_params.pageSize), None
+        if isinstance(page_size, int) and page_size > 0:
+            return page_size, None
+        if not self.adaptive_page_size:
+            return 20, None
+        page_size, first_page = self.probe_page_size(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            method_kwargs=method_kwargs,
+        )
+        return page_size, first_page if cur_page == 1 else None
+
+    def fetch_page(
+            self,
+            method: Callable = None,
+            requests_request_kwargs_params: dict = {},
+            cur_page: int = 1,
+            page_size: int = 20,
+            method_kwargs: dict = {},
+    ):
+        """
+        查询单页 超时时按更小 pageSize 拆分查询同一区间 并记录更小的 pageSize
+        :param method: 分页查询方法
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param cur_page: 页码
+        :param page_size: 每页数量
+        :param method_kwargs: method(**method_kwargs)
+        :return: (resultList, 总数 or None, 后续使用的 pageSize)
+        """
+        try:
+            result = method(
+                requests_request_kwargs_params={**requests_request_kwargs_params, "pageSize": page_size,
+                                                "curPage": cur_page},
+                **method_kwargs
+            )
+            return page_result_list(result), page_result_total(result), page_size
+        except self.page_size_shrink_exceptions:
+            smaller = page_size_divisor(page_size)
+            if smaller >= page_size:
+                raise
+            if self.adaptive_page_size:
+                self.put_page_size(method, smaller)
+        rows, total, size = [], None, smaller
+        offset, end = (cur_page - 1) * page_size, cur_page * page_size
+        while offset < end:
+            span = size
+            sub_rows, sub_total, size = self.fetch_page(
+                method=method,
+                requests_request_kwargs_params=requests_request_kwargs_params,
+                cur_page=offset // span + 1,
+                page_size=span,
+                method_kwargs=method_kwargs,
+            )
+            rows.extend(sub_rows)
+            total = sub_total if sub_total is not None else total
+            if not len(sub_rows):
+                break
+            offset += span
+        return rows, total, size
+
+    def paginate(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            cur_page: int = 1,
+            prefetch: bool = False,
+            as_records: bool = False,
+            method_kwargs: dict = {},
+    ):
+        """
+        自动分页 逐行返回 resultList 直到返回空 resultList
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量 None 使用 resolve_page_size
+        :param cur_page: 起始页码
+        :param prefetch: 是否在后台预取下一页
+        :param as_records: True 时以 plain dict 解析并逐行转换为 __slots__ Record
+        :param method_kwargs: method(**method_kwargs)
+        :return: generator
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        if as_records:
+            yield from to_records(
+                self.paginate(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    page_size=page_size,
+                    cur_page=cur_page,
+                    prefetch=prefetch,
+                    method_kwargs={
+                        "requests_response_callable": RequestsResponseCallable.status_code_200_json_status_100_data,
+                        **method_kwargs,
+                    },
+                ),
+                name=method.__name__,
+            )
+            return
+        page_size, first_page = self.resolve_first_page(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            cur_page=cur_page,
+            method_kwargs=method_kwargs,
+        )
+        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+        requests_request_kwargs_params.pop("pageSize", None)
+
+        def _fetch(page: int = 1, size: int = 20):
+            return self.fetch_page(
+                method=method,
+                requests_request_kwargs_params=requests_request_kwargs_params,
+                cur_page=page,
+                page_size=size,
+                method_kwargs=method_kwargs,
+            )
+
+        if not prefetch:
+            while True:
+                rows, _, size = first_page or _fetch(cur_page, page_size)
+                first_page = None
+                if not len(rows):
+                    return
+                yield from rows
+                cur_page, page_size = cur_page * page_size // size + 1, size
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = Future()
+        if first_page:
+            future.set_result(first_page)
+        else:
+            future = executor.submit(_fetch, cur_page, page_size)
+        try:
+            while True:
+                rows, _, size = future.result()
+                if not len(rows):
+                    return
+                cur_page, page_size = cur_page * page_size // size + 1, size
+                future = executor.submit(_fetch, cur_page, page_size)
+                yield from rows
+        finally:
+            future.cancel()
+            executor.shutdown(wait=False)
+
+    def paginate_parallel(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            cur_page: int = 1,
+            max_workers: int = 4,
+            ordered: bool = True,
+            as_records: bool = False,
+            method_kwargs: dict = {},
+    ):
+        """
+        并发分页 首页返回总数后 其余页在线程池中并发查询 逐行返回 resultList
+
+        首页没有总数时退化为 paginate
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量 None 使用 resolve_page_size
+        :param cur_page: 起始页码
+        :param max_workers: 最大并发数 设置 concurrency_limit 时由 concurrency_limit 自适应调整
+        :param ordered: True 按页码顺序返回 False 按完成顺序返回
+        :param as_records: True 时以 plain dict 解析并逐行转换为 __slots__ Record
+        :param method_kwargs: method(**method_kwargs)
+        :return: generator
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        if as_records:
+            yield from to_records(
+                self.paginate_parallel(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    page_size=page_size,
+                    cur_page=cur_page,
+                    max_workers=max_workers,
+                    ordered=ordered,
+                    method_kwargs={
+                        "requests_response_callable": RequestsResponseCallable.status_code_200_json_status_100_data,
+                        **method_kwargs,
+                    },
+                ),
+                name=method.__name__,
+            )
+            return
+        page_size, first_page = self.resolve_first_page(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            cur_page=cur_page,
+            method_kwargs=method_kwargs,
+        )
+        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
+        requests_request_kwargs_params.pop("pageSize", None)
+
+        def _fetch(page: int = 1, size: int = 20):
+            with self.concurrency_slot():
+                return self.fetch_page(
+                    method=method,
+                    requests_request_kwargs_params=requests_request_kwargs_params,
+                    cur_page=page,
+                    page_size=size,
+                    method_kwargs=method_kwargs,
+                )
+
+        rows, total, size = first_page or _fetch(cur_page, page_size)
+        yield from rows
+        if not len(rows):
+            return
+        next_page = cur_page * page_size // size + 1
+        if total is None:
+            yield from self.paginate(
+                method=method,
+                requests_request_kwargs_params=requests_request_kwargs_params,
+                page_size=size,
+                cur_page=next_page,
+                method_kwargs=method_kwargs,
+            )
+            return
+        if size == page_size and len(rows) < min(page_size, total - (cur_page - 1) * page_size):
+            # 行数少于该页应有行数 服务端限制了 pageSize 以实际行数为准 最后一页行数不足不视为限制
+            size, next_page = len(rows), cur_page + 1
+            if self.adaptive_page_size:
+                self.put_page_size(method, size)
+        pages = iter(range(next_page, -(-total // size) + 1))
+        max_workers = self.bulk_workers(max_workers)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = deque()
+        try:
+            for page in itertools.islice(pages, max_workers * 2):
+                futures.append(executor.submit(_fetch, page, size))
+            while len(futures):
+                if ordered:
+                    future = futures.popleft()
+                    future.result()
+                else:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    futures.remove(future)
+                for page in itertools.islice(pages, 1):
+                    futures.append(executor.submit(_fetch, page, size))
+                yield from future.result()[0]
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def bulk_call(
+            self,
+            method: Union[Callable, str] = None,
+            method_kwargs_list: Iterable = (),
+            max_workers: int = 4,
+            return_exceptions: bool = False,
+    ) -> list:
+        """
+        批量调用接口方法 用于批量查询及批量更新
+
+        设置 concurrency_limit 时并发数按延迟及过载响应自适应调整
+        :param method: 接口方法 self.update_store_goods or "update_store_goods"
+        :param method_kwargs_list: [method(**method_kwargs)]
+        :param max_workers: 最大并发数 设置 concurrency_limit 时由 concurrency_limit 自适应调整
+        :param return_exceptions: True 时异常作为结果返回 False 时抛出第一个异常
+        :return: 与 method_kwargs_list 顺序一致的结果列表
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+
+        def _call(method_kwargs: dict = {}):
+            with self.concurrency_slot():
+                return method(**method_kwargs)
+
+        max_workers = self.bulk_workers(max_workers)
+        method_kwargs_list = iter(method_kwargs_list)
+        results = []
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = deque()
+        try:
+            for method_kwargs in itertools.islice(method_kwargs_list, max_workers * 2):
+                futures.append(executor.submit(_call, method_kwargs))
+            while len(futures):
+                future = futures.popleft()
+                try:
+                    results.append(future.result())
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    results.append(error)
+                for method_kwargs in itertools.islice(method_kwargs_list, 1):
+                    futures.append(executor.submit(_call, method_kwargs))
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return results
+
+    def bulk_query(
+            self,
+            method: Union[Callable, str] = None,
+            ids: Iterable = (),
+            max_workers: int = 4,
+            cache: bool = True,
+            method_kwargs: dict = {},
+    ) -> list:
+        """
+        按 id 批量查询详情 如 self.bulk_query("query_house", ids)
+
+        每个 id 的结果及异常单独返回 某个 id 失败不影响其他 id
+        :param method: 详情接口方法 self.query_house or "query_house"
+        :param ids: id 列表
+        :param max_workers: 最大并发数 设置 concurrency_limit 时由 concurrency_limit 自适应调整
+        :param cache: 是否读写响应缓存 False 时每个 id 都请求接口且结果不写入缓存
+        :param method_kwargs: method(id=id,**method_kwargs) 的其他参数
+        :return: 与 ids 顺序一致的 [Dict(id=,data=,error=)] 请求异常时 error 为异常
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+
+        def _query(**kwargs):
+            token = response_cache_enabled.set(cache)
+            try:
+                return method(**kwargs)
+            finally:
+                response_cache_enabled.reset(token)
+
+        ids = list(ids)
+        results = self.bulk_call(
+            method=_query,
+            method_kwargs_list=({**method_kwargs, "id": id} for id in ids),
+            max_workers=max_workers,
+            return_exceptions=True,
+        )
+        return [
+            Dict({"id": id, "data": None, "error": result}) if isinstance(result, Exception) else Dict(
+                {"id": id, "data": result, "error": None})
+            for id, result in zip(ids, results)
+        ]
+
     def query_communities(
             self,
             requests_request_kwargs_params: dict = {},
@@ -327,27 +2090,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/communityInfo/getAdminCommunityList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_communities",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -368,27 +2116,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shop/page",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_shops",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -409,25 +2142,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shop/getShopInfo",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "shopId": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_shop",
+            params={"shopId": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -448,27 +2168,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/store/page",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_stores",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -489,25 +2194,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/store/getStoreDetail",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "storeId": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_store",
+            params={"storeId": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -528,27 +2220,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shopGoods/getAdminShopGoods",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_shop_products",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -569,25 +2246,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shopGoods/getShopGoodsDetail",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "id": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_shop_product",
+            params={"id": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -608,25 +2272,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shopGoods/getGoodsStoreEdits",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "id": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_shop_product_store_edits",
+            params={"id": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -647,26 +2298,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_json = Dict(requests_request_kwargs_json)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shopGoods/saveGoodsStoreEdits",
-                "method": "POST",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "json": {
-                    **requests_request_kwargs_json,
-                    **requests_request_kwargs.json,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="save_shop_product_store_edits",
+            json=requests_request_kwargs_json,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -688,28 +2325,13 @@ class AdminApi(object):
         :return:
         """
         requests_request_kwargs_json = Dict(requests_request_kwargs_json)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/shopGoods/saveSysShopGoods",
-                "method": "POST",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "json": {
-                    **requests_request_kwargs_json,
-                    **requests_request_kwargs.json,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_shop_product" if isinstance(requests_request_kwargs_json.id, str) and len(
+                requests_request_kwargs_json.id) else "save_shop_product",
+            json=requests_request_kwargs_json,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        if isinstance(requests_request_kwargs_json.id, str) and len(requests_request_kwargs_json.id):
-            requests_request_kwargs.method = "PUT"
-            requests_request_kwargs.url = f"{self.base_url}/manage/shopGoods/updateShopGoods"
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -730,27 +2352,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/storeProduct/getAdminStoreProductList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_store_goodses",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -771,25 +2378,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/storeProduct/getStoreProductInfo",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "id": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_store_goods",
+            params={"id": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -810,26 +2404,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_json = Dict(requests_request_kwargs_json)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/storeProduct/updateStoreProductInfo",
-                "method": "POST",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "json": {
-                    **requests_request_kwargs_json,
-                    **requests_request_kwargs.json,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_store_goods",
+            json=requests_request_kwargs_json,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -850,26 +2430,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_data = Dict(requests_request_kwargs_data)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/storeProduct/updateStoreProductInfo",
-                "method": "PUT",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "data": {
-                    **requests_request_kwargs_data,
-                    **requests_request_kwargs.data,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_shop_product_status",
+            data=requests_request_kwargs_data,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -890,26 +2456,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_data = Dict(requests_request_kwargs_data)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/storeProduct/updateProductStatus",
-                "method": "PUT",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "data": {
-                    **requests_request_kwargs_data,
-                    **requests_request_kwargs.data,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_store_goods_status",
+            data=requests_request_kwargs_data,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -930,27 +2482,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/carParkApplication/carParkCard/parkingCardManagerByAudit",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_parking_auth_audits",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -971,26 +2508,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/carParkApplication/getParkingCheckList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_parking_auth_audit_checks",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1011,27 +2534,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/carParkApplication/carParkCard/list",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_parking_auths",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1052,25 +2560,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/carParkApplication/carParkCard",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "id": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_parking_auth",
+            params={"id": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1091,25 +2586,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/communityRoom/getFullRoomInfo",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "id": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_house",
+            params={"id": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1130,27 +2612,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/businessOrderShu/list",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_business_orders",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1175,32 +2642,14 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs_data = Dict(requests_request_kwargs_data)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/upload",
-                "method": "POST",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                "data": {
-                    **requests_request_kwargs_data,
-                    **requests_request_kwargs.data,
-                },
-                "files": requests_request_kwargs_files,
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="upload_file",
+            params=requests_request_kwargs_params,
+            data=requests_request_kwargs_data,
+            files=requests_request_kwargs_files,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1221,27 +2670,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/user/information/register/list",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_registered_owners",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1259,30 +2693,15 @@ class AdminApi(object):
         :param requests_request_kwargs_params:
         :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data
         :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
-        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
-        :return:
-        """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/user/information/unregister/list",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :return:
+        """
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_unregistered_owners",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1303,27 +2722,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/old/orderAction!viewList.action",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_service_orders",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1344,38 +2748,20 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/export/log",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    "userType": 102,
-                    "myExport": 1,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_exports",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
         )
 
-    def business_orders_export(
+    def retry_export(
             self,
-            export_type: int = 1,
-            requests_request_kwargs_params: dict = {},
+            export_name: str = "",
             requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
             requests_request_args: Iterable = (),
             requests_request_kwargs: dict = {},
@@ -1383,9 +2769,8 @@ class AdminApi(object):
             retry_kwargs: dict = {},
     ):
         """
-        商业订单数据导出
-        :param export_type:
-        :param requests_request_kwargs_params:
+        重试执行数据导出 直到返回导出id
+        :param export_name: 导出方法名称
         :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data
         :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
@@ -1393,30 +2778,6 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
-        )
-        if export_type == 1:
-            requests_request_kwargs.url = f"{self.base_url}/manage/businessOrder/exportToExcelByOrder"
-        if export_type == 2:
-            requests_request_kwargs.url = f"{self.base_url}/manage/businessOrder/exportToExcelByProduct"
-        if export_type == 3:
-            requests_request_kwargs.url = f"{self.base_url}/manage/businessOrder/exportToExcelByOrderAndProduct"
         retry_kwargs = Dict(
             {
                 "stop_max_attempt_number": timedelta(minutes=6).seconds,
@@ -1432,15 +2793,15 @@ class AdminApi(object):
                 requests_request_kwargs: dict = {},
         ):
             print(
-                f"{datetime.now()} exec business_orders_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
+                f"{datetime.now()} exec {export_name}({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
+            result = self.requests_request(
                 requests_response_callable=requests_response_callable,
                 requests_request_args=requests_request_args,
                 requests_request_kwargs=requests_request_kwargs
             )
             if not isinstance(result, int):
                 raise Exception(
-                    f"{datetime.now()} exec business_orders_export({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
+                    f"{datetime.now()} exec {export_name}({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
             return result
 
         return _retry_func(
@@ -1449,8 +2810,9 @@ class AdminApi(object):
             requests_request_kwargs=requests_request_kwargs
         )
 
-    def houses_export(
+    def business_orders_export(
             self,
+            export_type: int = 1,
             requests_request_kwargs_params: dict = {},
             requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
             requests_request_args: Iterable = (),
@@ -1459,7 +2821,8 @@ class AdminApi(object):
             retry_kwargs: dict = {},
     ):
         """
-        有效房号数据导出
+        商业订单数据导出
+        :param export_type:
         :param requests_request_kwargs_params:
         :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data
         :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
@@ -1468,55 +2831,51 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/communityRoom/exportDelayCommunityRoomList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint=f"business_orders_export_{export_type}",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        retry_kwargs = Dict(
-            {
-                "stop_max_attempt_number": timedelta(minutes=6).seconds,
-                "wait_fixed": timedelta(seconds=10).seconds * 1000,
-                **retry_kwargs,
-            }
+        return self.retry_export(
+            export_name="business_orders_export",
+            requests_response_callable=requests_response_callable,
+            requests_request_args=requests_request_args,
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
-        @retry(*retry_args, **retry_kwargs)
-        def _retry_func(
-                requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
-                requests_request_args: Iterable = (),
-                requests_request_kwargs: dict = {},
-        ):
-            print(
-                f"{datetime.now()} exec houses_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
-                requests_response_callable=requests_response_callable,
-                requests_request_args=requests_request_args,
-                requests_request_kwargs=requests_request_kwargs
-            )
-            if not isinstance(result, int):
-                raise Exception(
-                    f"{datetime.now()} exec houses_export({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
-            return result
-
-        return _retry_func(
+    def houses_export(
+            self,
+            requests_request_kwargs_params: dict = {},
+            requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
+            requests_request_args: Iterable = (),
+            requests_request_kwargs: dict = {},
+            retry_args: Iterable = (),
+            retry_kwargs: dict = {},
+    ):
+        """
+        有效房号数据导出
+        :param requests_request_kwargs_params:
+        :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data
+        :param requests_request_args: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
+        :param retry_args:
+        :param retry_kwargs:
+        :return:
+        """
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="houses_export",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
+        )
+        return self.retry_export(
+            export_name="houses_export",
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
     def registered_owners_export(
@@ -1538,55 +2897,18 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/user/information/register/list/export",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
-        )
-        retry_kwargs = Dict(
-            {
-                "stop_max_attempt_number": timedelta(minutes=6).seconds,
-                "wait_fixed": timedelta(seconds=10).seconds * 1000,
-                **retry_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="registered_owners_export",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-
-        @retry(*retry_args, **retry_kwargs)
-        def _retry_func(
-                requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
-                requests_request_args: Iterable = (),
-                requests_request_kwargs: dict = {},
-        ):
-            print(
-                f"{datetime.now()} exec registered_owners_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
-                requests_response_callable=requests_response_callable,
-                requests_request_args=requests_request_args,
-                requests_request_kwargs=requests_request_kwargs
-            )
-            if not isinstance(result, int):
-                raise Exception(
-                    f"{datetime.now()} exec registered_owners_export({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
-            return result
-
-        return _retry_func(
+        return self.retry_export(
+            export_name="registered_owners_export",
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
     def unregistered_owners_export(
@@ -1608,55 +2930,18 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/user/information/unregister/list/export",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
-        )
-        retry_kwargs = Dict(
-            {
-                "stop_max_attempt_number": timedelta(minutes=6).seconds,
-                "wait_fixed": timedelta(seconds=10).seconds * 1000,
-                **retry_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="unregistered_owners_export",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-
-        @retry(*retry_args, **retry_kwargs)
-        def _retry_func(
-                requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
-                requests_request_args: Iterable = (),
-                requests_request_kwargs: dict = {},
-        ):
-            print(
-                f"{datetime.now()} exec unregistered_owners_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
-                requests_response_callable=requests_response_callable,
-                requests_request_args=requests_request_args,
-                requests_request_kwargs=requests_request_kwargs
-            )
-            if not isinstance(result, int):
-                raise Exception(
-                    f"{datetime.now()} exec unregistered_owners_export({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
-            return result
-
-        return _retry_func(
+        return self.retry_export(
+            export_name="unregistered_owners_export",
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
     def service_orders_export(
@@ -1678,55 +2963,18 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/order/work/export",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
-        )
-        retry_kwargs = Dict(
-            {
-                "stop_max_attempt_number": timedelta(minutes=6).seconds,
-                "wait_fixed": timedelta(seconds=10).seconds * 1000,
-                **retry_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="service_orders_export",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-
-        @retry(*retry_args, **retry_kwargs)
-        def _retry_func(
-                requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
-                requests_request_args: Iterable = (),
-                requests_request_kwargs: dict = {},
-        ):
-            print(
-                f"{datetime.now()} exec service_orders_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
-                requests_response_callable=requests_response_callable,
-                requests_request_args=requests_request_args,
-                requests_request_kwargs=requests_request_kwargs
-            )
-            if not isinstance(result, int):
-                raise Exception(
-                    f"{datetime.now()} exec service_orders_export({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
-            return result
-
-        return _retry_func(
+        return self.retry_export(
+            export_name="service_orders_export",
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
     def shop_products_export(
@@ -1748,55 +2996,18 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/goods/exportShopGoods",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="shop_products_export",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        retry_kwargs = Dict(
-            {
-                "stop_max_attempt_number": timedelta(minutes=6).seconds,
-                "wait_fixed": timedelta(seconds=10).seconds * 1000,
-                **retry_kwargs,
-            }
-        )
-
-        @retry(*retry_args, **retry_kwargs)
-        def _retry_func(
-                requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
-                requests_request_args: Iterable = (),
-                requests_request_kwargs: dict = {},
-        ):
-            print(
-                f"{datetime.now()} exec shop_products_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
-                requests_response_callable=requests_response_callable,
-                requests_request_args=requests_request_args,
-                requests_request_kwargs=requests_request_kwargs
-            )
-            if not isinstance(result, int):
-                raise Exception(
-                    f"{datetime.now()} exec shop_products_export({requests_response_callable}{requests_request_args},{requests_request_kwargs}) error")
-            return result
-
-        return _retry_func(
+        return self.retry_export(
+            export_name="shop_products_export",
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
     def store_goodses_export(
@@ -1818,55 +3029,71 @@ class AdminApi(object):
         :param retry_kwargs:
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/storeProduct/exportStoreProductList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="store_goodses_export",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        retry_kwargs = Dict(
-            {
-                "stop_max_attempt_number": timedelta(minutes=6).seconds,
-                "wait_fixed": timedelta(seconds=10).seconds * 1000,
-                **retry_kwargs,
-            }
+        return self.retry_export(
+            export_name="store_goodses_export",
+            requests_response_callable=requests_response_callable,
+            requests_request_args=requests_request_args,
+            requests_request_kwargs=requests_request_kwargs,
+            retry_args=retry_args,
+            retry_kwargs=retry_kwargs,
         )
 
-        @retry(*retry_args, **retry_kwargs)
-        def _retry_func(
-                requests_response_callable: Callable = RequestsResponseCallable.status_code_200_json_addict_status_100_data,
-                requests_request_args: Iterable = (),
-                requests_request_kwargs: dict = {},
-        ):
-            print(
-                f"{datetime.now()} exec store_goodses_export({requests_response_callable},{requests_request_args},{requests_request_kwargs})")
-            result = requests_request(
-                requests_response_callable=requests_response_callable,
-                requests_request_args=requests_request_args,
-                requests_request_kwargs=requests_request_kwargs
+    def download_file(
+            self,
+            url: str = "",
+            fp: str = "",
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress_callback: Callable = None,
+            progress_interval: float = 1.0,
+            resume: bool = True,
+            retries: int = 3,
+            expected_sha256: str = None,
+            connections: int = 1,
+            min_range_size: int = DOWNLOAD_MIN_RANGE_SIZE,
+    ) -> Dict:
+        """
+        使用连接池 session 流式下载文件 先写入 f"{fp}.part" 完成后原子重命名为 fp
+        :param url: 下载地址
+        :param fp: 文件路径
+        :param chunk_size: 每次读取字节数
+        :param progress_callback: progress_callback(progress) 参考 DownloadWriter
+        :param progress_interval: 进度回调间隔秒数
+        :param resume: 是否从已有的 f"{fp}.part" 断点续传 服务端不支持 Range 时从头下载
+        :param retries: 传输中断后的续传次数
+        :param expected_sha256: 期望的 sha256 None 不校验
+        :param connections: 大于 1 时按 Range 多连接分段下载 不支持 Range 时单连接下载 应不大于连接池 pool_maxsize
+        :param min_range_size: 多连接下载时每段最小字节数
+        :return: Dict(fp,bytes,total,offset,elapsed,bytes_per_second,done,sha256)
+        """
+        if connections > 1:
+            return parallel_download(
+                session=self.session,
+                url=url,
+                fp=fp,
+                connections=connections,
+                min_range_size=min_range_size,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                progress_interval=progress_interval,
+                resume=resume,
+                retries=retries,
+                expected_sha256=expected_sha256,
             )
-            if not isinstance(result, int):
-                raise Exception(
-                    f"{datetime.now()} exec store_goodses_export({requests_response_callable},{requests_request_args},{requests_request_kwargs}) error")
-            return result
-
-        return _retry_func(
-            requests_response_callable=requests_response_callable,
-            requests_request_args=requests_request_args,
-            requests_request_kwargs=requests_request_kwargs
+        return download(
+            session=self.session,
+            url=url,
+            fp=fp,
+            chunk_size=chunk_size,
+            progress_callback=progress_callback,
+            progress_interval=progress_interval,
+            resume=resume,
+            retries=retries,
+            expected_sha256=expected_sha256,
         )
 
     def download_export(
@@ -1878,9 +3105,13 @@ class AdminApi(object):
             requests_request_kwargs: dict = {},
             retry_args: Iterable = (),
             retry_kwargs: dict = {},
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress_callback: Callable = None,
+            resume: bool = True,
+            connections: int = 1,
     ):
         """
-        下载数据导出文件
+        下载数据导出文件 流式写入临时文件 完成后重命名为 export_fp 中断后重试时断点续传
         :param export_id:
         :param export_fp:
         :param requests_response_callable: RequestsResponseCallable.status_code_200_json_addict_status_100_data_result_list
@@ -1888,6 +3119,10 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :param retry_args:
         :param retry_kwargs:
+        :param chunk_size: 每次读取字节数
+        :param progress_callback: progress_callback(progress) 完成时 progress.sha256 为文件 sha256
+        :param resume: 下载中断后是否从已下载的部分续传
+        :param connections: 大于 1 时按 Range 多连接分段下载 不支持 Range 时单连接下载
         :return:
         """
         requests_request_kwargs = Dict(requests_request_kwargs)
@@ -1926,9 +3161,14 @@ class AdminApi(object):
                     if "".join(pathlib.Path(export.filePath).suffixes).lower() not in "".join(
                             pathlib.Path(export_fp).suffixes).lower():
                         export_fp = f"{export_fp}{''.join(pathlib.Path(export.filePath).suffixes)}"
-                    response = requests.get(export.filePath)
-                    with open(export_fp, "wb") as f:
-                        f.write(response.content)
+                    self.download_file(
+                        url=export.filePath,
+                        fp=export_fp,
+                        chunk_size=chunk_size,
+                        progress_callback=progress_callback,
+                        resume=resume,
+                        connections=connections,
+                    )
                     return export_fp
             raise Exception(
                 f"{datetime.now()} retry exec download_export({export_id},{export_fp},{requests_response_callable},{requests_request_args},{requests_request_kwargs}) {export}")
@@ -1955,27 +3195,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/device/DeviceList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_devices",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -1996,25 +3221,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/devicePatrol/detail",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "id": id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_device_patrol",
+            params={"id": id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -2035,27 +3247,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_params = Dict(requests_request_kwargs_params)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/newEnterpriseUserInfo/selectEnterpriseUserInfoList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "pageSize": 20,
-                    **requests_request_kwargs_params,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_enterprise_users",
+            params=requests_request_kwargs_params,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -2076,26 +3273,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_json = Dict(requests_request_kwargs_json)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/devicePatrol/patrol/save",
-                "method": "POST",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "json": {
-                    **requests_request_kwargs_json,
-                    **requests_request_kwargs.json,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_device_patrol_info",
+            json=requests_request_kwargs_json,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -2116,26 +3299,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_json = Dict(requests_request_kwargs_json)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/carParkApplication/completeTask",
-                "method": "POST",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "json": {
-                    **requests_request_kwargs_json,
-                    **requests_request_kwargs.json,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_parking_auth_audit_status",
+            json=requests_request_kwargs_json,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -2156,26 +3325,12 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs_json = Dict(requests_request_kwargs_json)
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/carParkApplication/carParkCard",
-                "method": "PUT",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "json": {
-                    **requests_request_kwargs_json,
-                    **requests_request_kwargs.json,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="update_parking_auth",
+            json=requests_request_kwargs_json,
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
@@ -2196,26 +3351,70 @@ class AdminApi(object):
         :param requests_request_kwargs: requests_request(requests_response_callable,requests_request_args,requests_request_kwargs)
         :return:
         """
-        requests_request_kwargs = Dict(requests_request_kwargs)
-        requests_request_kwargs = Dict(
-            {
-                "url": f"{self.base_url}/manage/productCategory/getProductCategoryList",
-                "method": "GET",
-                "headers": {
-                    "Token": Dict(self.token_data).token if isinstance(Dict(self.token_data).token, str) else "",
-                    "Companycode": Dict(self.token_data).companyCode if isinstance(Dict(self.token_data).companyCode,
-                                                                                   str) else "",
-                    **requests_request_kwargs.headers,
-                },
-                "params": {
-                    "busId": shop_id,
-                    **requests_request_kwargs.params,
-                },
-                **requests_request_kwargs,
-            }
+        requests_request_kwargs = self.build_requests_request_kwargs(
+            endpoint="query_shop_product_categories",
+            params={"busId": shop_id},
+            requests_request_kwargs=requests_request_kwargs,
         )
-        return requests_request(
+        return self.requests_request(
             requests_response_callable=requests_response_callable,
             requests_request_args=requests_request_args,
             requests_request_kwargs=requests_request_kwargs
         )
+
+    def iter_pages(
+            self,
+            method: Union[Callable, str] = None,
+            requests_request_kwargs_params: dict = {},
+            page_size: int = None,
+            prefetch: bool = False,
+            max_workers: int = 1,
+            ordered: bool = True,
+            as_records: bool = False,
+            **kwargs
+    ):
+        """
+        自动分页迭代 max_workers > 1 时使用 paginate_parallel 否则使用 paginate
+        :param method: 分页查询方法 self.query_communities or "query_communities"
+        :param requests_request_kwargs_params: method(requests_request_kwargs_params)
+        :param page_size: 每页数量 None 使用 resolve_page_size
+        :param prefetch: 是否在后台预取下一页
+        :param max_workers: >1 时首页返回总数后并发查询其余页
+        :param ordered: 并发查询时 True 按页码顺序返回 False 按完成顺序返回
+        :param as_records: True 时逐行返回 __slots__ Record
+        :param kwargs: method(**kwargs)
+        :return: generator
+        """
+        if max_workers > 1:
+            return self.paginate_parallel(
+                method=method,
+                requests_request_kwargs_params=requests_request_kwargs_params,
+                page_size=page_size,
+                max_workers=max_workers,
+                ordered=ordered,
+                as_records=as_records,
+                method_kwargs=kwargs,
+            )
+        return self.paginate(
+            method=method,
+            requests_request_kwargs_params=requests_request_kwargs_params,
+            page_size=page_size,
+            prefetch=prefetch,
+            as_records=as_records,
+            method_kwargs=kwargs,
+        )
+
+    iter_communities = paginated_iterator("query_communities", "项目列表")
+    iter_shops = paginated_iterator("query_shops", "商家信息")
+    iter_stores = paginated_iterator("query_stores", "门店列表")
+    iter_shop_products = paginated_iterator("query_shop_products", "商家产品列表")
+    iter_store_goodses = paginated_iterator("query_store_goodses", "门店商品列表")
+    iter_parking_auth_audits = paginated_iterator("query_parking_auth_audits", "停车授权审核列表")
+    iter_parking_auths = paginated_iterator("query_parking_auths", "停车授权列表")
+    iter_business_orders = paginated_iterator("query_business_orders", "商业订单列表")
+    iter_registered_owners = paginated_iterator("query_registered_owners", "注册业主列表")
+    iter_unregistered_owners = paginated_iterator("query_unregistered_owners", "未注册业主列表")
+    iter_service_orders = paginated_iterator("query_service_orders", "服务工单列表")
+    iter_exports = paginated_iterator("query_exports", "数据导出列表")
+    iter_devices = paginated_iterator("query_devices", "设备列表")
+    iter_enterprise_users = paginated_iterator("query_enterprise_users", "企业用户列表")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSession(requests.Session):
+    """
+    keep-alive 连接池 Session
+
+    同一实例可在多线程间共享,空闲超过 keep_alive_timeout 秒后清空连接池,避免复用已被服务端关闭的连接
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            keep_alive_timeout: float = 60.0,
+            max_retries: int = 0,
+    ):
+        """
+        构造函数
+        :param pool_connections: 缓存的 host 连接池数量
+        :param pool_maxsize: 每个 host 最大连接数
+        :param pool_block: 连接池耗尽时是否阻塞等待
+        :param keep_alive_timeout: 空闲连接保持秒数 None or <=0 不清理
+        :param max_retries: urllib3 连接重试次数
+        """
+        super().__init__()
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._keep_alive_timeout = keep_alive_timeout
+        self._lock = threading.Lock()
+        self._last_used_at = time.monotonic()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    @property
+    def pool_connections(self) -> int:
+        """
+        缓存的 host 连接池数量
+        :return:
+        """
+        return self._pool_connections
+
+    @property
+    def pool_maxsize(self) -> int:
+        """
+        每个 host 最大连接数
+        :return:
+        """
+        return self._pool_maxsize
+
+    @property
+    def pool_block(self) -> bool:
+        """
+        连接池耗尽时是否阻塞等待
+        :return:
+        """
+        return self._pool_block
+
+    @property
+    def keep_alive_timeout(self) -> float:
+        """
+        空闲连接保持秒数
+        :return:
+        """
+        return self._keep_alive_timeout
+
+    def evict_idle(self):
+        """
+        空闲超过 keep_alive_timeout 时清空连接池
+        :return:
+        """
+        if not self.keep_alive_timeout or self.keep_alive_timeout <= 0:
+            return
+        with self._lock:
+            if time.monotonic() - self._last_used_at <= self.keep_alive_timeout:
+                return
+            for adapter in self.adapters.values():
+                adapter.poolmanager.clear()
+            self._last_used_at = time.monotonic()
+
+    def request(self, method, url, *args, **kwargs):
+        self.evict_idle()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._last_used_at = time.monotonic()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import json
+import threading
+from typing import Callable, Hashable
+
+
+def request_key(
+        method: str = "GET",
+        url: str = "",
+        params: dict = None,
+        headers: dict = None,
+        response_callable: Callable = None,
+) -> tuple:
+    """
+    合并请求 key 接口 参数 Token Companycode 及响应解析完全相同的请求视为同一请求
+    :param method: 请求方法
+    :param url: 请求 url
+    :param params: query 参数
+    :param headers: 请求头
+    :param response_callable: 响应解析
+    :return:
+    """
+    headers = headers or {}
+    return (
+        str(method).upper(),
+        url,
+        json.dumps(params or {}, sort_keys=True, default=str),
+        headers.get("Token", ""),
+        headers.get("Companycode", ""),
+        response_callable,
+    )
+
+
+class _Call(object):
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    合并同一时刻的相同请求 只有第一个调用方执行 其他调用方等待并共享同一结果对象
+
+    共享的结果对象不应被调用方修改
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self._executed = 0
+        self._shared = 0
+
+    def stats(self) -> dict:
+        """
+        执行次数及共享次数
+        :return:
+        """
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "shared": self._shared,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+    def do(self, key: Hashable = None, func: Callable = None):
+        """
+        执行 func() 相同 key 的并发调用只执行一次
+        :param key: request_key()
+        :param func: func() -> result
+        :return: result
+        """
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                self._shared += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def async_do(self, key: Hashable = None, func: Callable = None):
+        """
+        执行 await func() 相同 key 的并发调用只执行一次
+
+        执行方被取消时 等待方不共享取消 第一个恢复的等待方重新执行 await func() 其他等待方等待其结果
+        :param key: request_key()
+        :param func: async func() -> result
+        :return: result
+        """
+        future = self._async_calls.get(key, None)
+        while future is not None:
+            with self._lock:
+                self._shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or getattr(task, "cancelling", lambda: 0)():
+                    # 等待方自身被取消
+                    raise
+            future = self._async_calls.get(key, None)
+        future = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        with self._lock:
+            self._executed += 1
+        try:
+            result = await func()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # 没有其他等待方时避免 "Future exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._async_calls[key]
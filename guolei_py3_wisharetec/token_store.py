@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Union, Iterable
+
+import diskcache
+import redis
+
+# token data 默认缓存时间
+TOKEN_DATA_EXPIRE: float = timedelta(days=90).total_seconds()
+
+# 进程内一级缓存默认缓存时间
+L1_EXPIRE: float = 60.0
+
+# 登录锁 最长持有秒数 持有者异常退出后自动释放
+LOCK_EXPIRE: float = 60.0
+
+# 登录锁 最长等待秒数 超时后不再等待直接登录
+LOCK_TIMEOUT: float = 60.0
+
+
+def token_store_key(base_url: str = "", uid: str = "") -> tuple:
+    """
+    token store key
+    :param base_url: base url
+    :param uid: 用户名
+    :return: (base_url, uid)
+    """
+    base_url = base_url or ""
+    return base_url[:-1] if base_url.endswith("/") else base_url, uid or ""
+
+
+def token_store_name(key: tuple = ("", ""), field: str = "token_data") -> str:
+    """
+    二级缓存 key
+    :param key: token_store_key(base_url, uid)
+    :param field: token_data or validated_at
+    :return:
+    """
+    base_url, uid = key
+    return "_".join([
+        "guolei_py3_wisharetec",
+        "token_store",
+        f"{field}",
+        f"{hashlib.md5(base_url.encode('utf-8')).hexdigest()}",
+        f"{uid}",
+    ])
+
+
+def legacy_token_store_name(key: tuple = ("", ""), backend: str = "diskcache") -> str:
+    """
+    AdminApi.login_with_diskcache / login_with_strict_redis 此前使用的 token data key 读取不到新 key 时兼容读取
+    :param key: token_store_key(base_url, uid)
+    :param backend: diskcache or redis
+    :return:
+    """
+    base_url, uid = key
+    return "_".join([
+        "guolei_py3_wisharetec",
+        "scaasp",
+        "AdminApi",
+        f"{backend}",
+        "token_data",
+        f"{hashlib.md5(base_url.encode('utf-8')).hexdigest()}",
+        f"{uid}",
+    ])
+
+
+def expire_seconds(expire: Union[int, float, timedelta] = None):
+    """
+    统一为秒
+    :param expire:
+    :return: float or None
+    """
+    if isinstance(expire, timedelta):
+        return expire.total_seconds()
+    if isinstance(expire, (int, float)) and expire > 0:
+        return float(expire)
+    return None
+
+
+class TokenStoreLock(object):
+    """
+    登录锁 支持 with 与 async with
+
+    由多个 (try_acquire, release) 依次组成 全部获取成功才算持有 等待超时后 acquired 为 False 调用方自行决定是否继续
+    """
+
+    def __init__(self, primitives: Iterable = (), timeout: float = LOCK_TIMEOUT, interval: float = 0.01):
+        """
+        构造函数
+        :param primitives: [(try_acquire, release)] try_acquire() 非阻塞 返回 bool
+        :param timeout: 最长等待秒数
+        :param interval: 重试间隔秒数
+        """
+        self._primitives = list(primitives)
+        self._timeout = timeout
+        self._interval = interval
+        self._released = []
+        self.acquired = False
+
+    def try_acquire(self) -> bool:
+        """
+        非阻塞获取 未全部获取时释放已获取的部分
+        :return:
+        """
+        for try_acquire, release in self._primitives:
+            if not try_acquire():
+                self.release()
+                return False
+            self._released.append(release)
+        self.acquired = True
+        return True
+
+    def release(self):
+        """
+        释放已获取的部分
+        :return:
+        """
+        while self._released:
+            self._released.pop()()
+        self.acquired = False
+
+    def __enter__(self):
+        deadline = time.monotonic() + self._timeout
+        while not self.try_acquire() and time.monotonic() < deadline:
+            time.sleep(self._interval)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    async def __aenter__(self):
+        deadline = time.monotonic() + self._timeout
+        while not self.try_acquire() and time.monotonic() < deadline:
+            await asyncio.sleep(self._interval)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class TokenStore(abc.ABC):
+    """
+    token 存储基类
+
+    key 为 token_store_key(base_url, uid) field 为 token_data or validated_at
+    """
+
+    @abc.abstractmethod
+    def get(self, key: tuple = None, field: str = "token_data", refresh: bool = False):
+        """
+        读取
+        :param key: token_store_key(base_url, uid)
+        :param field: token_data or validated_at
+        :param refresh: 是否跳过一级缓存
+        :return: value or None
+        """
+
+    @abc.abstractmethod
+    def set(self, key: tuple = None, value=None, expire: Union[int, float, timedelta] = None,
+            field: str = "token_data"):
+        """
+        写入
+        :param key: token_store_key(base_url, uid)
+        :param value: value
+        :param expire: 过期秒数 None 不过期
+        :param field: token_data or validated_at
+        :return:
+        """
+
+    @abc.abstractmethod
+    def delete(self, key: tuple = None, field: str = "token_data"):
+        """
+        删除
+        :param key: token_store_key(base_url, uid)
+        :param field: token_data or validated_at
+        :return:
+        """
+
+    def lock_primitives(self, key: tuple = None) -> list:
+        """
+        登录锁组成部分
+        :param key: token_store_key(base_url, uid)
+        :return: [(try_acquire, release)]
+        """
+        return []
+
+    def lock(self, key: tuple = None, timeout: float = LOCK_TIMEOUT) -> TokenStoreLock:
+        """
+        登录锁 同一 key 同时只有一个调用方登录
+        :param key: token_store_key(base_url, uid)
+        :param timeout: 最长等待秒数
+        :return:
+        """
+        return TokenStoreLock(primitives=self.lock_primitives(key=key), timeout=timeout)
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    进程内 token 存储 线程安全
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+        self._login_locks = {}
+
+    def get(self, key: tuple = None, field: str = "token_data", refresh: bool = False):
+        with self._lock:
+            value, expires_at = self._values.get((key, field), (None, None))
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._values.pop((key, field), None)
+                return None
+            return value
+
+    def set(self, key: tuple = None, value=None, expire: Union[int, float, timedelta] = None,
+            field: str = "token_data"):
+        expire = expire_seconds(expire)
+        with self._lock:
+            self._values[(key, field)] = (value, time.monotonic() + expire if expire else None)
+        return True
+
+    def delete(self, key: tuple = None, field: str = "token_data"):
+        with self._lock:
+            self._values.pop((key, field), None)
+        return True
+
+    def lock_primitives(self, key: tuple = None) -> list:
+        with self._lock:
+            login_lock = self._login_locks.setdefault(key, threading.Lock())
+        return [(lambda: login_lock.acquire(blocking=False), login_lock.release)]
+
+    def clear(self):
+        """
+        清空
+        :return:
+        """
+        with self._lock:
+            self._values.clear()
+
+    def after_fork_in_child(self):
+        """
+        fork 后子进程中重建锁 fork 时被其他线程持有的锁在子进程中永远不会释放
+        :return:
+        """
+        self._lock = threading.Lock()
+        self._login_locks = {}
+
+
+class DiskcacheTokenStore(TokenStore):
+    """
+    diskcache token 存储
+    """
+
+    def __init__(self, cache: diskcache.Cache = None):
+        """
+        构造函数
+        :param cache: diskcache.core.Cache
+        """
+        self._cache = cache
+
+    @property
+    def cache(self) -> diskcache.Cache:
+        return self._cache
+
+    def get(self, key: tuple = None, field: str = "token_data", refresh: bool = False):
+        value = self.cache.get(key=token_store_name(key, field), default=None)
+        if value is None and field == "token_data":
+            value = self.cache.get(key=legacy_token_store_name(key, "diskcache"), default=None) or None
+        return value
+
+    def set(self, key: tuple = None, value=None, expire: Union[int, float, timedelta] = None,
+            field: str = "token_data"):
+        return self.cache.set(key=token_store_name(key, field), value=value, expire=expire_seconds(expire))
+
+    def delete(self, key: tuple = None, field: str = "token_data"):
+        if field == "token_data":
+            self.cache.delete(key=legacy_token_store_name(key, "diskcache"))
+        return self.cache.delete(key=token_store_name(key, field))
+
+    def lock_primitives(self, key: tuple = None) -> list:
+        # 与 diskcache.Lock 相同 使用 add 实现 非阻塞 value 为持有者 token
+        name = token_store_name(key, "login_lock")
+        holder = uuid.uuid4().hex
+
+        def release():
+            # 持有超过 LOCK_EXPIRE 后锁可能已被其他调用方获取 只删除自己持有的锁
+            with self.cache.transact(retry=True):
+                if self.cache.get(key=name, default=None, retry=True) == holder:
+                    self.cache.delete(key=name, retry=True)
+
+        return [(lambda: self.cache.add(key=name, value=holder, expire=LOCK_EXPIRE, retry=True), release)]
+
+
+class RedisTokenStore(TokenStore):
+    """
+    redis token 存储 value 为 json
+    """
+
+    def __init__(self, strict_redis: Union[redis.Redis, redis.StrictRedis] = None):
+        """
+        构造函数
+        :param strict_redis: redis.StrictRedis
+        """
+        self._strict_redis = strict_redis
+
+    @property
+    def strict_redis(self) -> Union[redis.Redis, redis.StrictRedis]:
+        return self._strict_redis
+
+    def get(self, key: tuple = None, field: str = "token_data", refresh: bool = False):
+        value = self.strict_redis.get(token_store_name(key, field))
+        if value is None and field == "token_data":
+            value = self.strict_redis.get(legacy_token_store_name(key, "redis"))
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def set(self, key: tuple = None, value=None, expire: Union[int, float, timedelta] = None,
+            field: str = "token_data"):
+        expire = expire_seconds(expire)
+        return self.strict_redis.set(
+            token_store_name(key, field),
+            json.dumps(value),
+            px=int(expire * 1000) if expire else None,
+        )
+
+    def delete(self, key: tuple = None, field: str = "token_data"):
+        if field == "token_data":
+            self.strict_redis.delete(legacy_token_store_name(key, "redis"))
+        return self.strict_redis.delete(token_store_name(key, field))
+
+    def lock_primitives(self, key: tuple = None) -> list:
+        login_lock = self.strict_redis.lock(
+            name=token_store_name(key, "login_lock"),
+            timeout=LOCK_EXPIRE,
+            thread_local=False,
+        )
+
+        def release():
+            try:
+                login_lock.release()
+            except redis.exceptions.LockError:
+                # 持有超过 LOCK_EXPIRE 已自动释放
+                pass
+
+        return [(lambda: login_lock.acquire(blocking=False), release)]
+
+
+# 进程内一级缓存 所有 TwoTierTokenStore 共享
+L1_TOKEN_STORE = MemoryTokenStore()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=L1_TOKEN_STORE.after_fork_in_child)
+
+
+class TwoTierTokenStore(TokenStore):
+    """
+    二级 token 存储
+
+    一级为进程内 MemoryTokenStore 同一进程内的多个客户端实例共享 二级为 diskcache or redis
+    """
+
+    def __init__(self, l2: TokenStore = None, l1: TokenStore = None, l1_expire: float = L1_EXPIRE):
+        """
+        构造函数
+        :param l2: 二级存储 None 时只使用一级
+        :param l1: 一级存储 if None usage L1_TOKEN_STORE
+        :param l1_expire: 一级缓存秒数 不超过写入时的 expire
+        """
+        self._l2 = l2
+        self._l1 = l1 if isinstance(l1, TokenStore) else L1_TOKEN_STORE
+        self._l1_expire = l1_expire
+
+    @property
+    def l1(self) -> TokenStore:
+        return self._l1
+
+    @property
+    def l2(self) -> TokenStore:
+        return self._l2
+
+    def l1_expire_seconds(self, expire: Union[int, float, timedelta] = None):
+        expire = expire_seconds(expire)
+        l1_expire = expire_seconds(self._l1_expire)
+        if expire is None or l1_expire is None:
+            return expire or l1_expire
+        return min(expire, l1_expire)
+
+    def get(self, key: tuple = None, field: str = "token_data", refresh: bool = False):
+        if not isinstance(self.l2, TokenStore):
+            return self.l1.get(key=key, field=field)
+        if not refresh:
+            value = self.l1.get(key=key, field=field)
+            if value is not None:
+                return value
+        value = self.l2.get(key=key, field=field)
+        if value is not None:
+            self.l1.set(key=key, value=value, expire=self.l1_expire_seconds(), field=field)
+        return value
+
+    def set(self, key: tuple = None, value=None, expire: Union[int, float, timedelta] = None,
+            field: str = "token_data"):
+        self.l1.set(key=key, value=value, expire=self.l1_expire_seconds(expire), field=field)
+        if isinstance(self.l2, TokenStore):
+            return self.l2.set(key=key, value=value, expire=expire, field=field)
+        return True
+
+    def delete(self, key: tuple = None, field: str = "token_data"):
+        self.l1.delete(key=key, field=field)
+        if isinstance(self.l2, TokenStore):
+            return self.l2.delete(key=key, field=field)
+        return True
+
+    def lock_primitives(self, key: tuple = None) -> list:
+        # 先获取进程内锁 同一进程只有一个线程竞争二级锁
+        primitives = self.l1.lock_primitives(key=key)
+        if isinstance(self.l2, TokenStore):
+            primitives += self.l2.lock_primitives(key=key)
+        return primitives
+
+
+def token_store(cache: Union[diskcache.Cache, redis.Redis, redis.StrictRedis, TokenStore] = None,
+                l1_expire: float = L1_EXPIRE) -> TokenStore:
+    """
+    按缓存实例生成 TwoTierTokenStore
+    :param cache: diskcache.Cache or redis.StrictRedis or TokenStore
+    :param l1_expire: 一级缓存秒数
+    :return:
+    """
+    if isinstance(cache, TokenStore):
+        return cache
+    if isinstance(cache, diskcache.Cache):
+        return TwoTierTokenStore(l2=DiskcacheTokenStore(cache=cache), l1_expire=l1_expire)
+    if isinstance(cache, (redis.Redis, redis.StrictRedis)):
+        return TwoTierTokenStore(l2=RedisTokenStore(strict_redis=cache), l1_expire=l1_expire)
+    return TwoTierTokenStore(l1_expire=l1_expire)
@@ -26,6 +26,10 @@ setup(
         "retrying",
         "jsonschema",
     ],
+    extras_require={
+        "async": ["httpx"],
+        "speedups": ["orjson"],
+    },
     python_requires=">=3.0",
     zip_safe=False
 )
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import json
+import threading
+from urllib.parse import urlsplit
+
+import pytest
+from addict import Dict
+from requests import Response
+
+from guolei_py3_wisharetec.scaasp import AdminApi
+
+BASE_URL = "http://wisharetec.test"
+
+
+def json_response(json_object=None, status_code: int = 200, url: str = "") -> Response:
+    """
+    构造 requests.Response
+    :param json_object: 响应 json
+    :param status_code: 状态码
+    :param url: 请求 url
+    :return:
+    """
+    response = Response()
+    response.status_code = status_code
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(json_object).encode("utf-8")
+    return response
+
+
+class FakeSession(object):
+    """
+    代替 PooledSession handler(method, path, params) 返回 (status_code, json) calls 记录所有请求
+    """
+
+    def __init__(self, handler=None):
+        self.handler = handler
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str = "GET", url: str = "", params: dict = None, **kwargs) -> Response:
+        path = urlsplit(url).path
+        with self._lock:
+            self.calls.append((method, path, dict(params or {})))
+        status_code, json_object = self.handler(method, path, dict(params or {}))
+        return json_response(json_object, status_code=status_code, url=url)
+
+    def paths(self) -> list:
+        return [path for _, path, _ in self.calls]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_api():
+    """
+    使用 FakeSession 且持有已信任 token 的 AdminApi 不请求 checkSession
+    """
+    apis = []
+
+    def fake_api(handler=None, **kwargs):
+        api = AdminApi(base_url=BASE_URL, uid="u", pwd="p", **kwargs)
+        api._session = FakeSession(handler)
+        api._token_data = Dict({"token": "t1", "companyCode": "c1"})
+        api.trust_token()
+        apis.append(api)
+        return api
+
+    yield fake_api
+    for api in apis:
+        api.close()
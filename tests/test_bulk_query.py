@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import time
+
+import requests
+
+from guolei_py3_wisharetec.response_cache import ResponseCache
+
+
+def house_handler(method, path, params):
+    """
+    房屋详情 id 越小响应越慢 id 为 bad 时连接失败
+    """
+    if params.get("id") == "bad":
+        raise requests.exceptions.ConnectionError("connection reset")
+    time.sleep(0.01 * (10 - int(params.get("id"))))
+    return 200, {"status": 100, "data": {"id": params.get("id")}}
+
+
+def test_results_follow_ids_order(fake_api):
+    api = fake_api(house_handler)
+    ids = [1, 7, 3, 9, 2]
+    results = api.bulk_query("query_house", ids, max_workers=5)
+    assert [result.id for result in results] == ids
+    assert [result.data.id for result in results] == ids
+    assert all(result.error is None for result in results)
+
+
+def test_failed_id_does_not_abort_others(fake_api):
+    api = fake_api(house_handler)
+    results = api.bulk_query(api.query_house, [1, "bad", 2], max_workers=2)
+    assert [result.id for result in results] == [1, "bad", 2]
+    assert isinstance(results[1].error, requests.exceptions.ConnectionError) and results[1].data is None
+    assert [results[0].data.id, results[2].data.id] == [1, 2]
+    assert results[0].error is None and results[2].error is None
+
+
+def test_cache_false_bypasses_response_cache(fake_api):
+    api = fake_api(house_handler, response_cache=ResponseCache(ttls={"query_house": 60}))
+    api.bulk_query("query_house", [1, 2], cache=False)
+    assert len(api.session.calls) == 2 and api.response_cache.stats()["size"] == 0
+    api.bulk_query("query_house", [1, 2])
+    api.bulk_query("query_house", [1, 2])
+    assert len(api.session.calls) == 4 and api.response_cache.stats()["size"] == 2
+    results = api.bulk_query("query_house", [1, 2], cache=False)
+    assert len(api.session.calls) == 6
+    assert [result.data.id for result in results] == [1, 2]
+    # 单次调用不受 bulk_query 的 cache=False 影响
+    api.query_house(id=1)
+    assert len(api.session.calls) == 6
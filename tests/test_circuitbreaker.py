@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import time
+
+import pytest
+
+from guolei_py3_wisharetec.circuitbreaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from guolei_py3_wisharetec.scaasp import UrlSetting
+
+URL = "http://a/manage/x?id=1"
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    for failed in (True, True, False, True, True):
+        breaker.before_request(URL)
+        breaker.on_result(URL, failed=failed)
+    assert breaker.state(URL) == CLOSED
+    breaker.on_result(URL, failed=True)
+    assert breaker.state(URL) == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_request(URL)
+    assert error.value.endpoint == "http://a/manage/x"
+    assert 59 < error.value.retry_after <= 60
+    # 其他接口不受影响
+    breaker.before_request("http://a/manage/y")
+    assert breaker.states() == {
+        "http://a/manage/x": {"state": OPEN, "failures": 3},
+        "http://a/manage/y": {"state": CLOSED, "failures": 0},
+    }
+
+
+def test_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05, half_open_max_calls=1)
+    breaker.on_result(URL, failed=True)
+    time.sleep(0.06)
+    assert breaker.state(URL) == HALF_OPEN
+    breaker.before_request(URL)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
+    # 无法判断结果时只释放探测名额
+    breaker.on_result(URL, failed=None)
+    breaker.before_request(URL)
+    breaker.on_result(URL, failed=True)
+    assert breaker.state(URL) == OPEN
+    time.sleep(0.06)
+    breaker.before_request(URL)
+    breaker.on_result(URL, failed=False)
+    assert breaker.state(URL) == CLOSED
+    breaker.on_result(URL, failed=True)
+    breaker.reset(URL)
+    assert breaker.states() == {}
+
+
+def test_admin_api_short_circuits_overloaded_endpoint(fake_api):
+    def handler(method, path, params):
+        if path == UrlSetting.QUERY_BUSINESS_ORDER_BY_PAGINATOR:
+            return 503, {}
+        return 200, {"status": 100, "data": {"resultList": [], "total": 0}}
+
+    api = fake_api(handler, circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60))
+    for _ in range(2):
+        assert not api.query_business_orders()
+    with pytest.raises(CircuitOpenError):
+        api.query_business_orders()
+    assert api.session.paths().count(UrlSetting.QUERY_BUSINESS_ORDER_BY_PAGINATOR) == 2
+    assert api.query_communities().total == 0
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from guolei_py3_wisharetec.concurrency import AimdConcurrencyLimit, ConcurrencySlot
+
+
+def test_additive_increase():
+    limit = AimdConcurrencyLimit(initial_limit=4, max_limit=32, latency_tolerance=None)
+    limits = []
+    for _ in range(20):
+        limit.on_response(latency=0.01)
+        limits.append(limit.limit)
+    # 每累计 limit 个成功响应加 1
+    assert limits[3] == 4 and limits[4] == 5
+    assert limits == sorted(limits) and limits[-1] == 7
+    assert limit.stats()["successes"] == 20 and limit.stats()["decreases"] == 0
+
+
+def test_failures_do_not_increase():
+    limit = AimdConcurrencyLimit(initial_limit=4)
+    for _ in range(10):
+        limit.on_response(latency=0.01, failed=True)
+    assert limit.limit == 4 and limit.stats()["errors"] == 10
+
+
+def test_multiplicative_decrease_on_overload():
+    limit = AimdConcurrencyLimit(initial_limit=16, min_limit=3, latency_tolerance=None)
+    limit.on_response(latency=0.05)
+    limit.on_response(overloaded=True)
+    assert limit.limit == 8
+    # 同一往返时间内只收缩一次
+    limit.on_response(overloaded=True)
+    assert limit.limit == 8 and limit.stats()["overloads"] == 2
+    for expected in (4, 3, 3):
+        time.sleep(0.06)
+        limit.on_response(overloaded=True)
+        assert limit.limit == expected
+    assert limit.stats()["decreases"] == 4
+
+
+def test_multiplicative_decrease_on_latency():
+    limit = AimdConcurrencyLimit(initial_limit=8, latency_tolerance=2.0)
+    for _ in range(5):
+        limit.on_response(latency=0.01)
+    assert limit.limit == 8
+    limit.on_response(latency=1.0)
+    assert limit.limit == 4 and limit.stats()["decreases"] == 1
+    assert limit.latency > limit.baseline_latency * 2
+
+
+def test_bounds():
+    limit = AimdConcurrencyLimit(initial_limit=100, min_limit=2, max_limit=5, latency_tolerance=None)
+    assert limit.limit == 5
+    for _ in range(50):
+        limit.on_response(latency=0.01)
+    assert limit.limit == 5
+    assert AimdConcurrencyLimit(initial_limit=0, min_limit=0).limit == 1
+    assert AimdConcurrencyLimit(min_limit=8, max_limit=4).max_limit == 8
+
+
+def test_slot_waits_for_limit():
+    limit = AimdConcurrencyLimit(initial_limit=1)
+    with limit.slot() as slot:
+        assert slot.acquired and limit.in_flight == 1
+        assert not limit.try_acquire()
+        assert not limit.slot(timeout=0.01).__enter__().acquired
+    assert limit.in_flight == 0
+    with ConcurrencySlot() as slot:
+        assert not slot.acquired
+
+
+def test_holds_slot():
+    limit, other = AimdConcurrencyLimit(initial_limit=2), AimdConcurrencyLimit()
+    assert not limit.holds_slot()
+    with limit.slot():
+        assert limit.holds_slot() and not other.holds_slot()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # 并发槽只属于持有它的线程
+            assert not executor.submit(limit.holds_slot).result()
+    assert not limit.holds_slot()
+
+
+def test_async_slot():
+    limit = AimdConcurrencyLimit(initial_limit=2)
+    in_flight = []
+
+    async def work():
+        async with limit.slot():
+            in_flight.append(limit.in_flight)
+            assert limit.holds_slot()
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*[work() for _ in range(6)])
+
+    asyncio.run(main())
+    assert max(in_flight) == 2 and limit.in_flight == 0
+
+
+def test_only_requests_in_slot_are_observed(fake_api):
+    def handler(method, path, params):
+        return 503, {"status": 503}
+
+    limit = AimdConcurrencyLimit(initial_limit=8)
+    api = fake_api(handler, concurrency_limit=limit)
+    for _ in range(3):
+        api.query_house(id=1)
+    # 单次调用不计入 AIMD
+    assert limit.limit == 8 and limit.stats()["overloads"] == 0
+    api.bulk_query("query_house", [1, 2], max_workers=2)
+    assert limit.limit < 8 and limit.stats()["overloads"] == 2
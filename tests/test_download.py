@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import hashlib
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import httpx
+import pytest
+
+from guolei_py3_wisharetec.download import (
+    DOWNLOAD_RETRY_EXCEPTIONS,
+    IncompleteDownloadError,
+    async_download,
+    async_parallel_download,
+    download,
+    parallel_download,
+    write_part_meta,
+)
+
+DATA = os.urandom(600_000)
+
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+class FileServer(ThreadingHTTPServer):
+    """
+    模拟下载服务 ranges=False 不支持 Range If-Range 与 etag 不同或 if_range=False 时返回完整文件 cuts 次响应只发送一半后断开
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FileHandler)
+        self.ranges = True
+        self.if_range = True
+        self.etag = '"v1"'
+        self.cuts = 0
+        self.requests = []
+        self.validators = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/file"
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        requested = self.headers.get("Range", None)
+        validator = self.headers.get("If-Range", None)
+        server.requests.append(requested)
+        server.validators.append(validator)
+        start, end, status_code = 0, len(DATA) - 1, 200
+        if requested and server.ranges and (validator is None or server.if_range and validator == server.etag):
+            first, last = requested.split("=")[1].split("-")
+            start, end, status_code = int(first), min(int(last or end), end), 206
+        if start >= len(DATA):
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.send_header("Content-Range", f"bytes */{len(DATA)}")
+            self.end_headers()
+            return
+        body = DATA[start:end + 1]
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        if status_code == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        self.end_headers()
+        with server.lock:
+            cut = server.cuts > 0 and len(body) > 1
+            server.cuts -= cut
+        if cut:
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = FileServer()
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_streams_to_file(server, tmp_path):
+    fp, progress = tmp_path / "d" / "s.bin", []
+    result = download(url=server.url, fp=str(fp), chunk_size=65536, progress_callback=progress.append,
+                      progress_interval=0, expected_sha256=SHA256)
+    assert fp.read_bytes() == DATA
+    assert (result.bytes, result.total, result.offset, result.done, result.sha256) == (len(DATA), len(DATA), 0,
+                                                                                      True, SHA256)
+    assert progress[-1].done and len(progress) > 2
+    assert os.listdir(tmp_path / "d") == ["s.bin"]
+
+
+def test_download_sha256_mismatch_removes_part(server, tmp_path):
+    with pytest.raises(IOError):
+        download(url=server.url, fp=str(tmp_path / "s.bin"), expected_sha256="0" * 64)
+    assert os.listdir(tmp_path) == []
+
+
+def test_async_download_streams_to_file(server, tmp_path):
+    async def fetch(fp):
+        async with httpx.AsyncClient() as async_client:
+            return await async_download(async_client=async_client, url=server.url, fp=str(fp))
+
+    assert asyncio.run(fetch(tmp_path / "a.bin")).sha256 == SHA256
+    assert os.listdir(tmp_path) == ["a.bin"]
+
+
+def test_download_resumes_existing_part(server, tmp_path):
+    fp = tmp_path / "r.bin"
+    (tmp_path / "r.bin.part").write_bytes(DATA[:100_000])
+    write_part_meta(str(fp), url=server.url, validator='"v1"')
+    result = download(url=server.url, fp=str(fp))
+    assert (result.offset, result.bytes, result.sha256) == (100_000, len(DATA), SHA256)
+    assert server.requests == ["bytes=100000-"] and server.validators == ['"v1"']
+    assert os.listdir(tmp_path) == ["r.bin"]
+
+
+def test_download_restarts_stale_part(server, tmp_path):
+    # 临时文件来自旧版本文件 服务端按 If-Range 返回完整文件
+    fp = tmp_path / "r.bin"
+    (tmp_path / "r.bin.part").write_bytes(os.urandom(100_000))
+    write_part_meta(str(fp), url=server.url, validator='"v0"')
+    result = download(url=server.url, fp=str(fp))
+    assert (result.offset, result.bytes, result.sha256) == (0, len(DATA), SHA256)
+    assert server.requests == ["bytes=100000-"] and server.validators == ['"v0"']
+    assert fp.read_bytes() == DATA and os.listdir(tmp_path) == ["r.bin"]
+
+
+@pytest.mark.parametrize("meta", [None, {"url": "http://127.0.0.1:1/other", "validator": '"v1"'},
+                                  {"validator": None}])
+def test_download_restarts_part_without_matching_meta(server, tmp_path, meta):
+    fp = tmp_path / "r.bin"
+    (tmp_path / "r.bin.part").write_bytes(DATA[:100_000])
+    if meta is not None:
+        write_part_meta(str(fp), **{"url": server.url, **meta})
+    result = download(url=server.url, fp=str(fp))
+    assert (result.offset, result.sha256) == (0, SHA256)
+    assert server.requests == [None]
+
+
+def test_async_download_restarts_stale_part(server, tmp_path):
+    async def fetch(fp):
+        async with httpx.AsyncClient() as async_client:
+            return await async_download(async_client=async_client, url=server.url, fp=str(fp))
+
+    fp = tmp_path / "r.bin"
+    (tmp_path / "r.bin.part").write_bytes(os.urandom(100_000))
+    write_part_meta(str(fp), url=server.url, validator='"v0"')
+    result = asyncio.run(fetch(fp))
+    assert (result.offset, result.sha256) == (0, SHA256)
+    assert server.validators == ['"v0"'] and os.listdir(tmp_path) == ["r.bin"]
+
+
+def test_download_resumes_after_cut(server, tmp_path):
+    server.cuts = 1
+    result = download(url=server.url, fp=str(tmp_path / "c.bin"), chunk_size=65536)
+    assert result.sha256 == SHA256
+    assert server.requests[0] is None and 0 < int(server.requests[1][6:-1]) <= len(DATA) // 2
+    assert server.validators == [None, '"v1"']
+
+
+def test_download_complete_part(server, tmp_path):
+    (tmp_path / "f.bin.part").write_bytes(DATA)
+    write_part_meta(str(tmp_path / "f.bin"), url=server.url, validator='"v1"')
+    assert download(url=server.url, fp=str(tmp_path / "f.bin")).sha256 == SHA256
+    assert server.requests == [f"bytes={len(DATA)}-"]
+
+
+def test_download_restarts_when_range_unsupported(server, tmp_path):
+    server.ranges = False
+    (tmp_path / "n.bin.part").write_bytes(b"x" * 1000)
+    write_part_meta(str(tmp_path / "n.bin"), url=server.url, validator='"v1"')
+    result = download(url=server.url, fp=str(tmp_path / "n.bin"))
+    assert (result.offset, result.sha256) == (0, SHA256)
+
+
+def test_download_without_resume(server, tmp_path):
+    server.cuts = 1
+    with pytest.raises(DOWNLOAD_RETRY_EXCEPTIONS + (IncompleteDownloadError,)):
+        download(url=server.url, fp=str(tmp_path / "x.bin"), resume=False)
+    assert os.listdir(tmp_path) == []
+
+
+def test_async_download_resumes_after_cut(server, tmp_path):
+    async def fetch(fp):
+        async with httpx.AsyncClient() as async_client:
+            return await async_download(async_client=async_client, url=server.url, fp=str(fp),
+                                        chunk_size=65536)
+
+    server.cuts = 1
+    assert asyncio.run(fetch(tmp_path / "a.bin")).sha256 == SHA256
+    assert server.requests[0] is None and 0 < int(server.requests[1][6:-1]) <= len(DATA) // 2
+
+
+def test_parallel_download(server, tmp_path):
+    fp = tmp_path / "p.bin"
+    result = parallel_download(url=server.url, fp=str(fp), connections=3, min_range_size=100_000)
+    assert result.sha256 == SHA256 and fp.read_bytes() == DATA
+    assert sorted(server.requests) == ["bytes=0-0", "bytes=0-199999", "bytes=200000-399999", "bytes=400000-599999"]
+    assert os.listdir(tmp_path) == ["p.bin"]
+
+
+def test_parallel_download_retries_cut_range(server, tmp_path):
+    server.cuts = 2
+    fp = tmp_path / "c.bin"
+    result = parallel_download(url=server.url, fp=str(fp), connections=3, min_range_size=100_000, retry_backoff=0.01)
+    assert result.sha256 == SHA256
+    assert len(server.requests) == 6
+
+
+def test_parallel_download_gives_up_after_retries(server, tmp_path):
+    server.cuts = 100
+    with pytest.raises(DOWNLOAD_RETRY_EXCEPTIONS + (IncompleteDownloadError,)):
+        parallel_download(url=server.url, fp=str(tmp_path / "x.bin"), connections=3, min_range_size=100_000,
+                          retries=1, retry_backoff=0.01)
+    assert os.listdir(tmp_path) == []
+
+
+def test_parallel_download_without_ranges(server, tmp_path):
+    server.ranges = False
+    result = parallel_download(url=server.url, fp=str(tmp_path / "n.bin"), connections=3, min_range_size=100_000)
+    assert result.sha256 == SHA256
+    assert server.requests == ["bytes=0-0", None]
+
+
+def test_parallel_download_falls_back_when_range_ignored(server, tmp_path):
+    # 探测支持 Range 分段请求带 If-Range 时返回完整文件
+    server.if_range = False
+    fp = tmp_path / "f.bin"
+    result = parallel_download(url=server.url, fp=str(fp), connections=3, min_range_size=100_000)
+    assert result.sha256 == SHA256 and fp.read_bytes() == DATA
+    assert server.requests[-1] is None
+    assert os.listdir(tmp_path) == ["f.bin"]
+
+
+def test_async_parallel_download(server, tmp_path):
+    async def fetch(fp):
+        async with httpx.AsyncClient() as async_client:
+            return await async_parallel_download(async_client=async_client, url=server.url, fp=str(fp),
+                                                 connections=3, min_range_size=100_000, retry_backoff=0.01)
+
+    server.cuts = 1
+    assert asyncio.run(fetch(tmp_path / "a.bin")).sha256 == SHA256
+    server.if_range = False
+    assert asyncio.run(fetch(tmp_path / "b.bin")).sha256 == SHA256
+    assert sorted(os.listdir(tmp_path)) == ["a.bin", "b.bin"]
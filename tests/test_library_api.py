@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import diskcache
+
+from guolei_py3_wisharetec.library.scaasp.admin.api import Api
+from guolei_py3_wisharetec.token_store import DiskcacheTokenStore
+
+STALE_TOKEN_DATA = {"token": "stale", "companyCode": "c1"}
+
+
+def api_with_stale_token(login_result=None):
+    api = Api(base_url="http://127.0.0.1:1", username="u", password="p", validate_schema=False)
+    api.token_store.set(key=api.token_store_key, value=STALE_TOKEN_DATA)
+    api.check_login = lambda: False
+    api.post = lambda **kwargs: login_result
+    return api
+
+
+def test_refresh_token_reports_failed_login():
+    api = api_with_stale_token(login_result=None)
+    assert api.refresh_token() is False
+    assert api.token_data.token == "stale"
+
+
+def test_refresh_token_reports_new_token():
+    api = api_with_stale_token(login_result={"token": "fresh", "companyCode": "c1"})
+    assert api.refresh_token(force_login=True) is True
+    assert api.token_data.token == "fresh"
+    assert api.token_store.get(key=api.token_store_key, refresh=True)["token"] == "fresh"
+
+
+def test_put_token_data_to_cache_writes_cache_instance(tmp_path):
+    with diskcache.Cache(directory=str(tmp_path)) as cache:
+        api = Api(base_url="http://127.0.0.1:1", username="u", password="p", cache_instance=cache)
+        api.token_data = {"token": "t1", "companyCode": "c1"}
+        assert api.put_token_data_to_cache()
+        assert DiskcacheTokenStore(cache=cache).get(key=api.token_store_key) == {"token": "t1", "companyCode": "c1"}
+        assert api.put_token_data_to_cache(name="token", token_data={"token": "t2", "companyCode": "c1"})
+        assert cache.get("token") == {"token": "t2", "companyCode": "c1"}
+        assert not api.put_token_data_to_cache(token_data={"token": ""})
+
+
+def test_request_headers_follow_token():
+    api = Api(base_url="http://wisharetec.test", username="u", password="p")
+    api.send = lambda on_response_callback=None, **kwargs: kwargs
+    api.token_data = {"token": "t1", "companyCode": "c1"}
+    kwargs = api.post(path="/login", json={"id": 1})
+    assert kwargs == {
+        "method": "POST",
+        "url": "http://wisharetec.test/login",
+        "json": {"id": 1},
+        "headers": {"Token": "t1", "Companycode": "c1"},
+    }
+    assert type(kwargs["headers"]) is dict
+    headers = api.headers
+    assert api.get(path="/a")["headers"] == headers and api.headers is headers
+    # 调用方 headers 优先 不修改缓存的请求头
+    assert api.put(path="/a", headers={"Token": "t0", "X": "1"})["headers"] == {
+        "Token": "t0", "Companycode": "c1", "X": "1"}
+    assert api.headers == {"Token": "t1", "Companycode": "c1"}
+    api.token_data = {"token": "t2", "companyCode": "c1"}
+    assert api.request(method="GET", path="/a")["headers"]["Token"] == "t2"
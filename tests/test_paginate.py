@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+
+import pytest
+from addict import Dict
+
+from guolei_py3_wisharetec.async_scaasp import AsyncAdminApi
+from guolei_py3_wisharetec.scaasp import AdminApi
+
+
+def query_rows(total: int = 95, cap: int = None, calls: list = None):
+    """
+    模拟分页接口 cap 为服务端限制的最大 pageSize
+    """
+
+    def query_rows(requests_request_kwargs_params: dict = {}, **kwargs):
+        size = int(requests_request_kwargs_params["pageSize"])
+        page = int(requests_request_kwargs_params["curPage"])
+        if cap:
+            size = min(size, cap)
+        if calls is not None:
+            calls.append((page, int(requests_request_kwargs_params["pageSize"])))
+        start = (page - 1) * size
+        return Dict({"resultList": [{"id": i} for i in range(start, min(start + size, total))], "total": total})
+
+    return query_rows
+
+
+def async_query_rows(total: int = 95, cap: int = None, calls: list = None):
+    method = query_rows(total=total, cap=cap, calls=calls)
+
+    async def query_rows_async(**kwargs):
+        return method(**kwargs)
+
+    query_rows_async.__name__ = "query_rows"
+    return query_rows_async
+
+
+def ids(rows) -> list:
+    return [row["id"] for row in rows]
+
+
+def test_paginate_serial():
+    api = AdminApi(adaptive_page_size=False)
+    assert ids(api.paginate(query_rows(), page_size=20)) == list(range(95))
+    assert ids(api.paginate(query_rows(), page_size=20, cur_page=5)) == list(range(80, 95))
+    assert ids(api.paginate(query_rows(), page_size=20, prefetch=True)) == list(range(95))
+
+
+@pytest.mark.parametrize("cur_page,expected", [(1, list(range(95))), (3, list(range(40, 95))), (5, list(range(80, 95)))])
+def test_paginate_parallel_from_page(cur_page, expected):
+    api = AdminApi(adaptive_page_size=False)
+    assert ids(api.paginate_parallel(query_rows(), page_size=20, cur_page=cur_page)) == expected
+
+
+def test_paginate_parallel_unordered():
+    api = AdminApi(adaptive_page_size=False)
+    assert sorted(ids(api.paginate_parallel(query_rows(), page_size=20, ordered=False))) == list(range(95))
+
+
+def test_paginate_parallel_capped_page_size():
+    calls = []
+    api = AdminApi(adaptive_page_size=False)
+    assert ids(api.paginate_parallel(query_rows(cap=15, calls=calls), page_size=50)) == list(range(95))
+    assert calls[0] == (1, 50)
+    assert {size for _, size in calls[1:]} == {15}
+
+
+def test_async_paginate_parallel_from_page():
+    async def collect(**kwargs):
+        api = AsyncAdminApi(adaptive_page_size=False)
+        try:
+            return [row async for row in api.paginate_parallel(**kwargs)]
+        finally:
+            await api.aclose()
+
+    rows = asyncio.run(collect(method=async_query_rows(), page_size=20, cur_page=5))
+    assert ids(rows) == list(range(80, 95))
+    rows = asyncio.run(collect(method=async_query_rows(cap=15), page_size=50))
+    assert ids(rows) == list(range(95))
+
+
+def test_paginate_reuses_probe_page():
+    calls = []
+    api = AdminApi(adaptive_page_size=True, max_page_size=50)
+    assert ids(api.paginate_parallel(query_rows(cap=15, calls=calls))) == list(range(95))
+    assert calls[0] == (1, 50)
+    assert [page for page, _ in calls].count(1) == 1
+    assert api.get_page_size("query_rows") == 15
+    calls.clear()
+    assert ids(api.paginate(query_rows(calls=calls), prefetch=True)) == list(range(95))
+    assert calls[0] == (1, 15)
+
+
+def test_probe_caches_fallback_page_size():
+    calls = []
+    api = AdminApi(adaptive_page_size=True, max_page_size=50)
+
+    def query_rows_without_total(**kwargs):
+        result = query_rows(total=30, calls=calls)(**kwargs)
+        del result["total"]
+        return result
+
+    assert ids(api.paginate(query_rows_without_total)) == list(range(30))
+    assert calls == [(1, 50), (2, 50)]
+    assert api.get_page_size("query_rows_without_total") == 50
+    calls.clear()
+    assert ids(api.paginate(query_rows_without_total)) == list(range(30))
+    assert calls == [(1, 50), (2, 50)]
+
+
+def test_async_paginate_reuses_probe_page():
+    calls = []
+
+    async def collect():
+        api = AsyncAdminApi(adaptive_page_size=True, max_page_size=50)
+        try:
+            return [row async for row in api.paginate(async_query_rows(cap=15, calls=calls), prefetch=True)]
+        finally:
+            await api.aclose()
+
+    assert ids(asyncio.run(collect())) == list(range(95))
+    assert [page for page, _ in calls].count(1) == 1
+
+
+def test_iter_methods_paginate_query_methods():
+    api = AdminApi(adaptive_page_size=False)
+    api.query_registered_owners = query_rows()
+    assert AdminApi.iter_registered_owners.__name__ == "iter_registered_owners"
+    assert ids(api.iter_registered_owners(page_size=20)) == list(range(95))
+    assert ids(api.iter_registered_owners(page_size=20, max_workers=4)) == list(range(95))
+    assert [row.id for row in api.iter_registered_owners(page_size=20, as_records=True)] == list(range(95))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+
+import fakeredis
+import pytest
+
+from guolei_py3_wisharetec.ratelimit import (
+    RateLimiter,
+    MemoryRateLimiter,
+    RedisRateLimiter,
+    rate_limit_keys,
+    rate_limiter,
+    request_url,
+)
+
+
+def test_rate_limiter_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimiter()
+
+
+def test_rate_limit_keys():
+    assert rate_limit_keys("https://sq.wisharetec.com/manage/a?x=1") == (
+        "https://sq.wisharetec.com",
+        "https://sq.wisharetec.com/manage/a",
+        "/manage/a",
+    )
+    assert request_url(("GET", "http://a/b")) == "http://a/b"
+    assert request_url((), {"url": "http://a/c"}) == "http://a/c"
+
+
+def test_rate_limiter_factory():
+    assert isinstance(rate_limiter(None), MemoryRateLimiter)
+    assert isinstance(rate_limiter(fakeredis.FakeStrictRedis()), RedisRateLimiter)
+
+
+@pytest.mark.parametrize("limiter", [
+    lambda **kwargs: MemoryRateLimiter(**kwargs),
+    lambda **kwargs: RedisRateLimiter(strict_redis=fakeredis.FakeStrictRedis(), **kwargs),
+])
+def test_reserve_burst_then_delay(limiter):
+    limiter = limiter(rate=10, burst=2)
+    assert limiter.reserve("http://a/x") == 0
+    assert limiter.reserve("http://a/x") == 0
+    assert limiter.reserve("http://a/x") == pytest.approx(0.1, abs=0.02)
+    assert limiter.reserve("http://a/x") == pytest.approx(0.2, abs=0.02)
+    # 每个接口一个桶
+    assert limiter.reserve("http://a/y") == 0
+
+
+def test_reserve_path_rate_and_base_url_rate():
+    limiter = MemoryRateLimiter(rate=None, rates={"/slow": (1, 1)}, base_url_rate=100, base_url_burst=3)
+    assert limiter.reserve("http://a/fast") == 0
+    assert limiter.reserve("http://a/slow") == 0
+    assert limiter.reserve("http://a/slow") == pytest.approx(1.0, abs=0.02)
+    # base_url 总速率
+    assert limiter.reserve("http://a/other") == pytest.approx(0.01, abs=0.005)
+    assert limiter.reserve("http://b/other") == 0
+
+
+def test_wait_sleeps_reserved_delay():
+    limiter = MemoryRateLimiter(rate=10, burst=1)
+    assert limiter.wait("http://a/x") == 0
+    assert limiter.wait("http://a/x") == pytest.approx(0.1, abs=0.02)
+    assert asyncio.run(limiter.async_wait("http://a/x")) == pytest.approx(0.1, abs=0.05)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import pytest
+
+from guolei_py3_wisharetec.records import Record, RecordFactory, record_type, to_records
+from guolei_py3_wisharetec.scaasp import AdminApi
+
+
+def test_record_slots_and_access():
+    record = record_type("query_houses", ("id", "roomName", "class", "get", "2nd"))(
+        {"id": 1, "roomName": "1-101", "class": "A", "get": "g", "2nd": 2})
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+    assert (record.id, record.roomName) == (1, "1-101")
+    # 关键字 Record 方法名 非标识符字段只能按 key 访问
+    assert (record["class"], record["get"], record["2nd"]) == ("A", "g", 2)
+    assert record.get("missing", 0) == 0 and "id" in record and "missing" not in record
+    with pytest.raises(KeyError):
+        record["missing"]
+    assert list(record) == ["id", "roomName", "class", "get", "2nd"] and len(record) == 5
+    assert record == {"id": 1, "roomName": "1-101", "class": "A", "get": "g", "2nd": 2}
+    assert type(record).__name__ == "QueryHouses"
+    assert record_type("query_houses", ("id", "roomName", "class", "get", "2nd")) is type(record)
+
+
+def test_factory_missing_and_extra_keys():
+    factory = RecordFactory(name="rows")
+    first = factory({"id": 1, "name": "a"})
+    missing = factory({"id": 2})
+    assert factory.record_type is type(first) is type(missing)
+    assert missing.to_dict() == {"id": 2, "name": None}
+    extra = factory({"id": 3, "age": 30})
+    assert type(extra) is not type(first)
+    assert extra.to_dict() == {"id": 3, "name": None, "age": 30}
+    # 之前生成的记录不受影响 后续行沿用扩展后的字段
+    assert first.to_dict() == {"id": 1, "name": "a"}
+    assert type(factory({"name": "d"})) is type(extra)
+    assert factory(None) is None
+
+
+def test_to_records_is_lazy():
+    def rows():
+        yield {"id": 1}
+        raise AssertionError("to_records read ahead")
+
+    records = to_records(rows())
+    assert next(records).id == 1
+
+
+def test_paginate_as_records():
+    def query_rows(requests_request_kwargs_params: dict = {}, requests_response_callable=None, **kwargs):
+        page = int(requests_request_kwargs_params["curPage"])
+        size = int(requests_request_kwargs_params["pageSize"])
+        rows = [{"id": i, "name": f"n{i}"} if i % 2 else {"id": i} for i in range(25)]
+        # as_records 时以 plain dict 解析
+        assert requests_response_callable is not None
+        return {"resultList": rows[(page - 1) * size:page * size], "total": 25}
+
+    api = AdminApi(adaptive_page_size=False)
+    records = list(api.paginate(query_rows, page_size=10, as_records=True))
+    assert [record.id for record in records] == list(range(25))
+    assert all(isinstance(record, Record) for record in records)
+    assert records[0].to_dict() == {"id": 0}
+    assert records[1].name == "n1" and records[2].to_dict() == {"id": 2, "name": None}
+    assert type(records[0]).__name__ == "QueryRows"
+    parallel = list(api.paginate_parallel(query_rows, page_size=10, as_records=True))
+    assert parallel == records
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pytest
+
+from guolei_py3_wisharetec.scaasp import UrlSetting
+from guolei_py3_wisharetec.token_store import MemoryTokenStore
+from conftest import FakeSession, json_response
+
+EXPIRED_401 = (401, {"status": 401, "message": "token expired"})
+
+EXPIRED_NON_100 = (200, {"status": 500, "message": "token expired"})
+
+
+class TokenServer(object):
+    """
+    按 Token 请求头响应 Token 与服务端当前 token 不一致时返回 expired 登录后生成新 token
+    """
+
+    def __init__(self, token: str = "t2", expired: tuple = EXPIRED_401, delay: float = 0.0):
+        self.token = token
+        self.expired = expired
+        self.delay = delay
+        self.logins = 0
+        self.tokens = []
+        self.before_response = None
+        self._lock = threading.Lock()
+
+    def __call__(self, method, path, params, token=None):
+        with self._lock:
+            self.tokens.append(token)
+        if path == UrlSetting.LOGIN:
+            with self._lock:
+                self.logins += 1
+                self.token = f"login{self.logins}"
+            return 200, {"status": 100, "data": {"token": self.token, "companyCode": "c1"}}
+        time.sleep(self.delay)
+        if callable(self.before_response):
+            self.before_response(method, path, token)
+        if path == UrlSetting.QUERY_LOGIN_STATE:
+            return (200, None) if token == self.token else (200, {"status": 401})
+        if token != self.token:
+            return self.expired
+        return 200, {"status": 100, "data": {"id": params.get("id"), "token": token}}
+
+
+class TokenSession(FakeSession):
+    """
+    将 Token 请求头传给 TokenServer
+    """
+
+    def request(self, method: str = "GET", url: str = "", params: dict = None, headers: dict = None, **kwargs):
+        path = urlsplit(url).path
+        with self._lock:
+            self.calls.append((method, path, dict(params or {})))
+        status_code, json_object = self.handler(method, path, dict(params or {}), token=(headers or {}).get("Token"))
+        return json_response(json_object, status_code=status_code, url=url)
+
+
+@pytest.fixture
+def token_api(fake_api):
+    """
+    持有已信任 token t1 服务端当前 token 为 server.token
+    """
+
+    def token_api(server: TokenServer = None, **kwargs):
+        api = fake_api(token_store=MemoryTokenStore(), **kwargs)
+        api._session = TokenSession(server)
+        return api
+
+    return token_api
+
+
+@pytest.mark.parametrize("method", ["GET", "PUT"])
+def test_replays_idempotent_request_after_login(token_api, method):
+    server = TokenServer()
+    api = token_api(server)
+    if method == "GET":
+        result = api.query_house(id=1)
+    else:
+        result = api.update_parking_auth(requests_request_kwargs_json={"id": 1})
+    assert result.token == "login1"
+    assert [call_method for call_method, _, _ in api.session.calls] == [method, "POST", method]
+    assert server.tokens == ["t1", None, "login1"]
+    assert server.logins == 1 and api.token_data.token == "login1"
+
+
+def test_does_not_replay_post(token_api):
+    server = TokenServer()
+    api = token_api(server)
+    assert not api.update_store_goods(requests_request_kwargs_json={"id": 1})
+    assert api.session.paths() == [UrlSetting.UPDATE_STORE_PRODUCT, UrlSetting.LOGIN]
+    # 重新登录后的请求使用新 token
+    assert server.logins == 1 and api.token_data.token == "login1"
+    assert api.query_house(id=1).token == "login1"
+
+
+def test_does_not_relogin_without_auto_relogin(token_api):
+    server = TokenServer()
+    api = token_api(server, auto_relogin=False)
+    assert not api.query_house(id=1)
+    assert server.logins == 0 and not api.token_trusted
+
+
+def test_concurrent_auth_failures_login_once(token_api):
+    server = TokenServer(delay=0.05)
+    api = token_api(server)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda id: api.query_house(id=id), range(8)))
+    assert [result.id for result in results] == list(range(8))
+    assert all(result.token == "login1" for result in results)
+    assert server.logins == 1
+
+
+def test_replays_with_token_updated_by_another_caller(token_api):
+    server = TokenServer(token="t1", expired=EXPIRED_NON_100)
+    api = token_api(server)
+
+    def rotate_token(method, path, token):
+        # 请求期间其他调用方已重新登录
+        if token == "t1":
+            server.token = "t2"
+            api._token_data = {"token": "t2", "companyCode": "c1"}
+
+    server.before_response = rotate_token
+    assert api.query_house(id=1).token == "t2"
+    assert server.tokens == ["t1", "t2"]
+    assert server.logins == 0
+
+
+def test_non_100_reply_with_trusted_token_is_a_result(token_api):
+    server = TokenServer(token="t1", expired=EXPIRED_NON_100)
+    api = token_api(server)
+    server.token = "t2"
+    assert not api.query_house(id=1)
+    # 信任期内不请求 checkSession 也不重新登录
+    assert api.session.paths() == [UrlSetting.QUERY_ROOM_DETAIL]
+    assert server.logins == 0
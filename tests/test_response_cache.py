@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import itertools
+import time
+
+import diskcache
+import fakeredis
+import pytest
+
+from guolei_py3_wisharetec.response_cache import ResponseCache, response_cache_enabled
+from guolei_py3_wisharetec.scaasp import UrlSetting
+
+ENTRY = (200, "application/json", b'{"status": 100, "data": {}}')
+
+
+def detail_handler(status: int = 100):
+    """
+    详情接口 每次请求返回递增的 version
+    """
+    versions = itertools.count(1)
+
+    def handler(method, path, params):
+        return 200, {"status": status, "data": {"id": params.get("id"), "version": next(versions)}}
+
+    return handler
+
+
+def test_set_get_and_expire():
+    cache = ResponseCache(ttls={"query_house": 0.05})
+    key = cache.cache_key("query_house", "1")
+    assert cache.get("query_house", key) is None
+    cache.set("query_house", key, ENTRY)
+    assert cache.get("query_house", key) == ENTRY
+    time.sleep(0.06)
+    assert cache.get("query_house", key) is None
+    assert not cache.cacheable("query_communities")
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_lru_eviction():
+    cache = ResponseCache(ttls={"query_house": 60}, maxsize=2)
+    keys = [cache.cache_key("query_house", str(i)) for i in range(3)]
+    cache.set("query_house", keys[0], ENTRY)
+    cache.set("query_house", keys[1], ENTRY)
+    cache.get("query_house", keys[0])
+    cache.set("query_house", keys[2], ENTRY)
+    assert cache.get("query_house", keys[1]) is None
+    assert cache.get("query_house", keys[0]) == ENTRY
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+
+
+def test_invalidate_changes_generation():
+    cache = ResponseCache(ttls={"query_house": 60, "query_shop": 60})
+    house_key, shop_key = cache.cache_key("query_house", "1"), cache.cache_key("query_shop", "1")
+    cache.set("query_house", house_key, ENTRY)
+    cache.set("query_shop", shop_key, ENTRY)
+    cache.invalidate("query_house")
+    assert cache.get("query_house", house_key) is None
+    assert cache.cache_key("query_house", "1") != house_key
+    assert cache.get("query_shop", shop_key) == ENTRY
+
+
+@pytest.mark.parametrize("backend", ["diskcache", "redis"])
+def test_second_level_shared_between_processes(backend, tmp_path):
+    shared = diskcache.Cache(directory=str(tmp_path)) if backend == "diskcache" else fakeredis.FakeStrictRedis()
+    first, second = ResponseCache(ttls={"query_house": 60}, cache=shared), ResponseCache(
+        ttls={"query_house": 60}, cache=shared)
+    first.set("query_house", first.cache_key("query_house", "1"), ENTRY)
+    assert second.get("query_house", second.cache_key("query_house", "1")) == ENTRY
+    second.invalidate("query_house")
+    assert first.get("query_house", first.cache_key("query_house", "1")) is None
+
+
+def test_admin_api_serves_detail_from_cache(fake_api):
+    api = fake_api(detail_handler(), response_cache=ResponseCache(ttls={"query_parking_auth": 60}))
+    assert api.query_parking_auth(id=1).version == 1
+    assert api.query_parking_auth(id=1).version == 1
+    assert api.query_parking_auth(id=2).version == 2
+    token = response_cache_enabled.set(False)
+    try:
+        assert api.query_parking_auth(id=1).version == 3
+    finally:
+        response_cache_enabled.reset(token)
+    # 写接口使详情缓存失效
+    api.update_parking_auth(requests_request_kwargs_json={"id": 1})
+    assert api.query_parking_auth(id=1).version == 5
+    assert [method for method, _, _ in api.session.calls] == ["GET", "GET", "GET", "PUT", "GET"]
+
+
+def test_admin_api_does_not_cache_failures(fake_api):
+    api = fake_api(detail_handler(status=500), response_cache=ResponseCache(ttls={"query_parking_auth": 60}))
+    api.query_parking_auth(id=1)
+    api.query_parking_auth(id=1)
+    assert len(api.session.calls) == 2
+
+
+def test_stale_while_revalidate_lookup():
+    cache = ResponseCache(ttls={"query_communities": 0.05}, stale_ttls={"query_communities": 60})
+    key = cache.cache_key("query_communities", "{}")
+    cache.set("query_communities", key, ENTRY)
+    assert cache.lookup("query_communities", key) == (ENTRY, False)
+    time.sleep(0.06)
+    # 只有第一个调用方负责刷新
+    assert cache.lookup("query_communities", key) == (ENTRY, True)
+    assert cache.lookup("query_communities", key) == (ENTRY, False)
+    cache.end_revalidate(key)
+    assert cache.lookup("query_communities", key) == (ENTRY, True)
+    assert cache.stats()["stale_hits"] == 3
+
+
+def test_admin_api_revalidates_stale_reference_data(fake_api):
+    api = fake_api(
+        detail_handler(),
+        response_cache=ResponseCache(ttls={"query_communities": 0.05}, stale_ttls={"query_communities": 60}),
+    )
+    assert api.query_communities().version == 1
+    time.sleep(0.06)
+    assert api.query_communities().version == 1
+    deadline = time.monotonic() + 5
+    while api.response_cache.stats()["revalidating"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert api.query_communities().version == 2
+    assert len(api.session.calls) == 2
+
+
+def not_found_handler(status: int = 100):
+    """
+    详情接口 id 为 missing 时返回"不存在"
+    """
+
+    def handler(method, path, params):
+        if params.get("id") != "missing":
+            return 200, {"status": 100, "data": {"id": params.get("id")}}
+        if status == 100:
+            return 200, {"status": 100, "data": None}
+        return 200, {"status": status, "message": "not found"}
+
+    return handler
+
+
+def test_not_found_entries_expire_and_are_replaced():
+    cache = ResponseCache(ttls={"query_house": 60}, not_found_ttls={"query_house": 0.05})
+    key = cache.cache_key("query_house", "1")
+    cache.set_not_found("query_house", key, ENTRY)
+    assert cache.get("query_house", key) == ENTRY
+    time.sleep(0.06)
+    assert cache.get("query_house", key) is None
+    cache.set_not_found("query_house", key, ENTRY)
+    cache.set("query_house", key, (200, "application/json", b"{}"))
+    assert cache.stats()["not_found_size"] == 0
+
+
+def test_admin_api_caches_null_data_as_not_found(fake_api):
+    api = fake_api(not_found_handler(), response_cache=ResponseCache(ttls={}, not_found_ttls={"query_house": 60}))
+    assert api.query_house(id="missing") is None
+    assert api.query_house(id="missing") is None
+    assert api.query_house(id="1").id == "1"
+    assert api.query_house(id="1").id == "1"
+    assert len(api.session.calls) == 3
+    assert api.response_cache.stats()["not_found_hits"] == 1
+
+
+def test_admin_api_caches_configured_not_found_status(fake_api):
+    api = fake_api(not_found_handler(status=500), response_cache=ResponseCache(not_found_ttls={"query_house": 60}))
+    api.query_house(id="missing")
+    api.query_house(id="missing")
+    # 未配置 not_found_statuses 时非 100 响应不缓存 信任期内也不请求 checkSession
+    assert api.session.paths() == [UrlSetting.QUERY_ROOM_DETAIL] * 2
+    api.not_found_statuses = (500,)
+    api.query_house(id="missing")
+    api.query_house(id="missing")
+    assert len(api.session.calls) == 3
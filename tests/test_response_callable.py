@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import json
+
+import pytest
+from addict import Dict
+
+from guolei_py3_wisharetec import scaasp
+from guolei_py3_wisharetec.scaasp import RequestsResponseCallable
+from conftest import json_response
+
+BODIES = [
+    {"status": 100, "data": {"id": 1, "resultList": [{"id": 1}, {"id": 2}], "total": 2}},
+    {"status": "100", "data": {"resultList": []}},
+    {"status": 100, "data": {"id": 1}},
+    {"status": 500, "message": "系统繁忙", "data": {"resultList": [{"id": 1}]}},
+    {"message": "no status"},
+]
+
+
+def baseline_json_addict(response=None) -> Dict:
+    """
+    单次解析前的实现 每次调用都重新解析 response.json()
+    """
+    if response.status_code != 200:
+        return Dict({})
+    return Dict(json.loads(response.content) or {})
+
+
+def baseline_status_100(response=None) -> bool:
+    json_addict = baseline_json_addict(response)
+    return json_addict.status == 100 or json_addict.status == "100"
+
+
+def baseline_status_100_data(response=None):
+    if baseline_status_100(response):
+        return baseline_json_addict(response).data
+    return Dict({})
+
+
+def baseline_status_100_data_result_list(response=None):
+    if baseline_status_100(response):
+        return baseline_json_addict(response).data.resultList
+    return Dict({})
+
+
+@pytest.fixture(params=["orjson", "json"])
+def decoder(request, monkeypatch):
+    """
+    分别使用 orjson 及标准库 json 解析
+    """
+    if request.param == "json":
+        monkeypatch.setattr(scaasp, "orjson", None)
+    elif scaasp.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("body", BODIES)
+@pytest.mark.parametrize("status_code", [200, 500])
+def test_addict_decoders_match_baseline(decoder, body, status_code):
+    response = json_response(body, status_code=status_code)
+    assert RequestsResponseCallable.status_code_200_json_addict_status_100(response) == baseline_status_100(response)
+    data = RequestsResponseCallable.status_code_200_json_addict_status_100_data(response)
+    assert isinstance(data, Dict) and data == baseline_status_100_data(response)
+    result_list = RequestsResponseCallable.status_code_200_json_addict_status_100_data_result_list(response)
+    assert result_list == baseline_status_100_data_result_list(response)
+    assert all(isinstance(row, Dict) for row in result_list)
+
+
+@pytest.mark.parametrize("body", BODIES)
+@pytest.mark.parametrize("status_code", [200, 500])
+def test_plain_decoders_match_baseline(decoder, body, status_code):
+    response = json_response(body, status_code=status_code)
+    data = RequestsResponseCallable.status_code_200_json_status_100_data(response)
+    assert not isinstance(data, Dict) and data == baseline_status_100_data(response)
+    result_list = RequestsResponseCallable.status_code_200_json_status_100_data_result_list(response)
+    assert isinstance(result_list, list) and result_list == (baseline_status_100_data_result_list(response) or [])
+    assert not any(isinstance(row, Dict) for row in result_list)
+
+
+def test_decoders_tolerate_non_json(decoder):
+    response = json_response(status_code=200)
+    response._content = b"<html></html>"
+    assert RequestsResponseCallable.status_code_200_json_once(response) is None
+    assert RequestsResponseCallable.status_code_200_json_addict_status_100(response) is False
+    assert RequestsResponseCallable.status_code_200_json_addict_status_100_data(response) == {}
+    assert RequestsResponseCallable.status_code_200_json_status_100_data_result_list(response) == []
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from guolei_py3_wisharetec.singleflight import SingleFlight, request_key
+
+
+def slow_call(result=None, error: BaseException = None, calls: list = None, delay: float = 0.2):
+    def func():
+        calls.append(1)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return func
+
+
+def test_request_key():
+    key = request_key("get", "http://a/x", {"b": 1, "a": 2}, {"Token": "t", "Companycode": "c", "X": "1"})
+    assert key == request_key("GET", "http://a/x", {"a": 2, "b": 1}, {"Token": "t", "Companycode": "c"})
+    assert key != request_key("GET", "http://a/x", {"a": 2, "b": 1}, {"Token": "t2", "Companycode": "c"})
+
+
+def test_do_shares_one_result():
+    single_flight, calls, result = SingleFlight(), [], object()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: single_flight.do("k", slow_call(result, calls=calls)), range(8)))
+    assert all(value is result for value in results)
+    assert len(calls) == 1
+    assert single_flight.stats() == {"executed": 1, "shared": 7, "in_flight": 0}
+    # 完成后相同 key 重新执行
+    single_flight.do("k", slow_call(result, calls=calls, delay=0))
+    assert len(calls) == 2
+
+
+def test_do_shares_error():
+    single_flight, calls = SingleFlight(), []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(single_flight.do, "k", slow_call(error=ValueError("x"), calls=calls))
+                   for _ in range(4)]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    assert len(calls) == 1
+
+
+def test_async_do_shares_one_result():
+    single_flight, calls = SingleFlight(), []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    async def main():
+        return await asyncio.gather(*[single_flight.async_do("k", func) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert all(result is results[0] for result in results)
+    assert len(calls) == 1
+    assert single_flight.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+
+def test_async_do_survives_leader_cancellation():
+    single_flight, calls = SingleFlight(), []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.ensure_future(single_flight.async_do("k", func))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.ensure_future(single_flight.async_do("k", func)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        # 等待方自身被取消时不影响其他等待方
+        followers[0].cancel()
+        results = await asyncio.gather(leader, *followers, return_exceptions=True)
+        return results
+
+    results = asyncio.run(main())
+    assert isinstance(results[0], asyncio.CancelledError) and isinstance(results[1], asyncio.CancelledError)
+    # 其中一个等待方重新执行 其他等待方共享其结果
+    assert results[2:] == [2, 2]
+    assert len(calls) == 2 and single_flight.stats()["in_flight"] == 0
+
+
+def test_admin_api_coalesces_identical_gets(fake_api):
+    def handler(method, path, params):
+        time.sleep(0.2)
+        return 200, {"status": 100, "data": {"id": params.get("id")}}
+
+    api = fake_api(handler, coalesce_requests=True)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda _: api.query_house(id=1), range(6)))
+        list(executor.map(lambda _: api.update_parking_auth(requests_request_kwargs_json={"id": 1}), range(2)))
+    assert all(result is results[0] for result in results)
+    assert [method for method, _, _ in api.session.calls] == ["GET", "PUT", "PUT"]
+    assert api.single_flight.stats()["shared"] == 5
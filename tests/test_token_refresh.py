@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import asyncio
+import json
+
+import httpx
+
+from guolei_py3_wisharetec.async_scaasp import AsyncAdminApi
+from guolei_py3_wisharetec.scaasp import UrlSetting
+from guolei_py3_wisharetec.token_store import MemoryTokenStore
+
+
+class RefreshServer(object):
+    """
+    checkSession 按 valid 响应 登录按 login_ok 响应 记录 checkSession 时 api 是否仍信任 token
+    """
+
+    def __init__(self, valid: bool = True, login_ok: bool = True):
+        self.valid = valid
+        self.login_ok = login_ok
+        self.api = None
+        self.trusted_during_check = []
+
+    def __call__(self, method, path, params):
+        if path == UrlSetting.QUERY_LOGIN_STATE:
+            self.trusted_during_check.append(self.api.token_trusted)
+            return (200, None) if self.valid else (200, {"status": 401})
+        if path == UrlSetting.LOGIN:
+            if not self.login_ok:
+                return 200, {"status": 500, "message": "login failed"}
+            return 200, {"status": 100, "data": {"token": "t2", "companyCode": "c1"}}
+        return 200, {"status": 100, "data": {}}
+
+
+def refresh_api(fake_api, server: RefreshServer):
+    api = fake_api(server, token_store=MemoryTokenStore(), token_trust_seconds=60)
+    api.save_token_to_store()
+    server.api = api
+    return api
+
+
+def stored_token(api) -> str:
+    return api.token_store.get(key=api.token_store_key)["token"]
+
+
+def test_token_stays_trusted_while_checking(fake_api):
+    server = RefreshServer()
+    api = refresh_api(fake_api, server)
+    assert api.refresh_token()
+    # 信任期内也请求 checkSession 校验期间其他调用方仍信任 token
+    assert server.trusted_during_check == [True]
+    assert api.token_trusted and api.token_data.token == "t1"
+
+
+def test_failed_login_keeps_token_and_store(fake_api):
+    server = RefreshServer(valid=False, login_ok=False)
+    api = refresh_api(fake_api, server)
+    assert not api.refresh_token()
+    assert api.session.paths() == [UrlSetting.QUERY_LOGIN_STATE, UrlSetting.LOGIN]
+    assert api.token_data.token == "t1" and stored_token(api) == "t1"
+    # 恢复后用原 token 重新校验
+    server.valid = True
+    assert api.refresh_token()
+    assert api.token_trusted and api.token_data.token == "t1"
+
+
+def test_failed_force_login_keeps_trust(fake_api):
+    server = RefreshServer(login_ok=False)
+    api = refresh_api(fake_api, server)
+    assert not api.refresh_token(force_login=True)
+    assert api.session.paths() == [UrlSetting.LOGIN]
+    assert api.token_trusted and api.token_data.token == "t1" and stored_token(api) == "t1"
+
+
+def test_login_replaces_token_and_store(fake_api):
+    server = RefreshServer(valid=False)
+    api = refresh_api(fake_api, server)
+    assert api.refresh_token()
+    assert api.token_trusted and api.token_data.token == "t2" and stored_token(api) == "t2"
+
+
+def test_async_failed_login_keeps_token_and_store():
+    server = RefreshServer(valid=False, login_ok=False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status_code, json_object = server("GET", request.url.path, dict(request.url.params))
+        return httpx.Response(status_code, content=json.dumps(json_object).encode())
+
+    async def refresh():
+        api = AsyncAdminApi(base_url="http://wisharetec.test", uid="u", pwd="p",
+                            token_store=MemoryTokenStore(), token_trust_seconds=60)
+        api._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        api._token_data = {"token": "t1", "companyCode": "c1"}
+        api.trust_token()
+        api.save_token_to_store()
+        server.api = api
+        try:
+            assert not await api.refresh_token()
+            assert api.token_data.token == "t1" and stored_token(api) == "t1"
+            server.valid = True
+            assert await api.refresh_token()
+            assert server.trusted_during_check == [True, False]
+            assert api.token_trusted
+        finally:
+            await api.aclose()
+
+    asyncio.run(refresh())
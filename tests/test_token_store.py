@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import json
+
+import diskcache
+import fakeredis
+import pytest
+
+from guolei_py3_wisharetec.library.scaasp.admin.api import Api
+from guolei_py3_wisharetec.token_store import (
+    TokenStore,
+    MemoryTokenStore,
+    DiskcacheTokenStore,
+    RedisTokenStore,
+    TwoTierTokenStore,
+    legacy_token_store_name,
+    token_store,
+    token_store_key,
+    token_store_name,
+)
+
+KEY = token_store_key(base_url="https://sq.wisharetec.com/", uid="u")
+
+TOKEN_DATA = {"token": "t1", "companyCode": "c1"}
+
+
+@pytest.fixture
+def diskcache_cache(tmp_path):
+    cache = diskcache.Cache(directory=str(tmp_path))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(params=["memory", "diskcache", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield TwoTierTokenStore(l1=MemoryTokenStore())
+    elif request.param == "diskcache":
+        cache = diskcache.Cache(directory=str(tmp_path))
+        yield token_store(cache)
+        cache.close()
+    else:
+        yield token_store(fakeredis.FakeStrictRedis())
+
+
+def test_token_store_is_abstract():
+    with pytest.raises(TypeError):
+        TokenStore()
+
+
+def test_get_set_delete(store):
+    assert store.get(key=KEY) is None
+    assert store.set(key=KEY, value=TOKEN_DATA, expire=60)
+    assert store.get(key=KEY) == TOKEN_DATA
+    assert store.get(key=KEY, refresh=True) == TOKEN_DATA
+    store.set(key=KEY, value=1.5, field="validated_at")
+    assert store.get(key=KEY, field="validated_at", refresh=True) == 1.5
+    store.delete(key=KEY)
+    assert store.get(key=KEY, refresh=True) is None
+    assert store.get(key=KEY, field="validated_at", refresh=True) == 1.5
+
+
+def test_diskcache_reads_legacy_key(diskcache_cache):
+    diskcache_cache.set(key=legacy_token_store_name(KEY, "diskcache"), value=TOKEN_DATA)
+    store = token_store(diskcache_cache)
+    assert store.l2.get(key=KEY) == TOKEN_DATA
+    store.l2.delete(key=KEY)
+    assert store.l2.get(key=KEY) is None
+
+
+def test_redis_reads_legacy_key():
+    strict_redis = fakeredis.FakeStrictRedis()
+    strict_redis.set(legacy_token_store_name(KEY, "redis"), json.dumps(TOKEN_DATA))
+    store = token_store(strict_redis)
+    assert store.l2.get(key=KEY) == TOKEN_DATA
+    store.l2.delete(key=KEY)
+    assert store.l2.get(key=KEY) is None
+
+
+@pytest.fixture(params=["memory", "diskcache", "redis"])
+def lock_store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryTokenStore()
+    elif request.param == "diskcache":
+        cache = diskcache.Cache(directory=str(tmp_path))
+        yield DiskcacheTokenStore(cache=cache)
+        cache.close()
+    else:
+        yield RedisTokenStore(strict_redis=fakeredis.FakeStrictRedis())
+
+
+def test_lock_excludes_other_holders(lock_store):
+    first = lock_store.lock(key=KEY)
+    second = lock_store.lock(key=KEY, timeout=0.05)
+    assert first.try_acquire()
+    with second:
+        assert not second.acquired
+    assert lock_store.lock(key=token_store_key(uid="other")).try_acquire()
+    first.release()
+    with second:
+        assert second.acquired
+
+
+def test_diskcache_lock_release_keeps_new_holder(diskcache_cache):
+    store = DiskcacheTokenStore(cache=diskcache_cache)
+    first = store.lock(key=KEY)
+    assert first.try_acquire()
+    # 模拟持有超过 LOCK_EXPIRE 后锁过期 被其他调用方获取
+    diskcache_cache.delete(key=token_store_name(KEY, "login_lock"))
+    second = store.lock(key=KEY)
+    assert second.try_acquire()
+    first.release()
+    assert not store.lock(key=KEY).try_acquire()
+    second.release()
+    assert store.lock(key=KEY).try_acquire()
+
+
+def test_two_tier_lock_takes_both_levels(diskcache_cache):
+    store = TwoTierTokenStore(l2=DiskcacheTokenStore(cache=diskcache_cache), l1=MemoryTokenStore())
+    other_process = DiskcacheTokenStore(cache=diskcache_cache).lock(key=KEY)
+    assert other_process.try_acquire()
+    lock = store.lock(key=KEY)
+    assert not lock.try_acquire()
+    # 二级锁获取失败时释放一级锁
+    l1_lock = store.l1.lock(key=KEY)
+    assert l1_lock.try_acquire()
+    l1_lock.release()
+    other_process.release()
+    assert lock.try_acquire()
+    lock.release()
+
+
+def test_refresh_token_rereads_store_after_lock_timeout():
+    store = TwoTierTokenStore(l1=MemoryTokenStore())
+    store.set(key=token_store_key(base_url="http://127.0.0.1:1", uid="u"), value=TOKEN_DATA)
+    api = Api(base_url="http://127.0.0.1:1", username="u", password="p", token_store=store)
+    lock = store.lock
+    store.lock = lambda key=None: lock(key=key, timeout=0.05)
+    holder = lock(key=api.token_store_key)
+    assert holder.try_acquire()
+
+    def check_login():
+        if api.token_data.get("token") == TOKEN_DATA["token"]:
+            # 持有锁的调用方在等待期间完成登录
+            store.set(key=api.token_store_key, value={**TOKEN_DATA, "token": "t2"})
+            return False
+        return api.token_data.get("token") == "t2"
+
+    def post(**kwargs):
+        raise AssertionError("login while another caller refreshed the token")
+
+    api.check_login = check_login
+    api.post = post
+    assert api.refresh_token() is True
+    assert api.token_data.token == "t2"
+    holder.release()
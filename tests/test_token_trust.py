@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+=================================================
+作者:[郭磊]
+手机:[5210720528]
+email:[174000902@qq.com]
+github:[https://github.com/guolei19850528/guolei_py3_wisharetec]
+=================================================
+"""
+import time
+
+import pytest
+
+from guolei_py3_wisharetec.scaasp import UrlSetting
+
+
+def check_session_handler(method, path, params):
+    """
+    checkSession 返回 null 为已登录
+    """
+    if path == UrlSetting.QUERY_LOGIN_STATE:
+        return 200, None
+    return 200, {"status": 100, "data": {}}
+
+
+def check_session_calls(api) -> int:
+    return api.session.paths().count(UrlSetting.QUERY_LOGIN_STATE)
+
+
+def test_no_check_session_within_trust_window(fake_api):
+    api = fake_api(check_session_handler, token_trust_seconds=60)
+    assert api.token_trusted
+    for _ in range(3):
+        assert api.check_login()
+    assert check_session_calls(api) == 0
+
+
+def test_revalidates_after_trust_window(fake_api):
+    api = fake_api(check_session_handler, token_trust_seconds=0.05)
+    assert api.check_login()
+    time.sleep(0.06)
+    assert not api.token_trusted
+    assert api.check_login()
+    assert check_session_calls(api) == 1
+    # 校验通过后重新进入信任期
+    assert api.token_trusted
+    assert api.check_login()
+    assert check_session_calls(api) == 1
+
+
+@pytest.mark.parametrize("token_trust_seconds", [0, -1, None])
+def test_non_positive_trust_validates_every_time(fake_api, token_trust_seconds):
+    api = fake_api(check_session_handler, token_trust_seconds=token_trust_seconds)
+    assert not api.token_trusted
+    for _ in range(3):
+        assert api.check_login()
+    assert check_session_calls(api) == 3
+
+
+def test_trust_follows_token(fake_api):
+    api = fake_api(check_session_handler, token_trust_seconds=60)
+    api._token_data = {"token": "t2", "companyCode": "c1"}
+    assert not api.token_trusted
+    assert api.check_login()
+    assert check_session_calls(api) == 1
+    api.distrust_token()
+    assert not api.token_trusted